@@ -0,0 +1,339 @@
+"""Local fixture server for offline benchmarks
+
+Serves a Maps-like search page (scrollable feed + click-to-open detail panel, using the
+selectors GoogleMapsScraper expects) and a set of restaurant websites with Kontakt and
+Impressum pages. Everything is generated from a seed, so runs are repeatable.
+
+Run standalone to browse the fixtures:  python benchmarks/fixture_server.py --places 40
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+STREETS = ['Hauptstraße', 'Bahnhofstraße', 'Gubener Str.', 'Kastanienallee', 'Oranienstraße', 'Bergmannstraße']
+CUISINES = ['Italienisch', 'Vietnamesisch', 'Deutsch', 'Türkisch', 'Indisch', 'Griechisch', 'Café']
+NAMES = ['Trattoria', 'Bistro', 'Imbiss', 'Café', 'Restaurant', 'Pho', 'Taverna', 'Curry']
+SUFFIXES = ['Roma', 'Mitte', 'am Park', 'Sonne', 'Linde', 'Saigon', 'Olympia', 'Express']
+
+# Email placement per website (site index % len): where the scanners have to look
+EMAIL_LAYOUTS = ['homepage', 'impressum_mailto', 'kontakt_text', 'none', 'impressum_entity', 'js_rendered']
+# Web agency credited on the Impressum of the 'none' sites
+AGENCY_EMAIL = 'hello@agency-example.net'
+
+
+class FixtureData:
+    """Deterministic places and websites"""
+
+    def __init__(self, places=40, sites=24, seed=7):
+        rng = random.Random(seed)
+        self.sites = []
+        for i in range(sites):
+            self.sites.append({
+                'id': i,
+                'name': f"{rng.choice(NAMES)} {rng.choice(SUFFIXES)} {i}",
+                'layout': EMAIL_LAYOUTS[i % len(EMAIL_LAYOUTS)],
+                # Free-mail addresses: the sites are served from 127.0.0.1, so an own-domain
+                # address could not be told apart from a web agency's
+                'email': f"restaurant{i}@gmx.de"
+            })
+
+        self.places = []
+        for i in range(places):
+            site = self.sites[i % sites] if sites and i % 5 != 4 else None  # Every fifth place has no website
+            reviews = rng.randint(3, 4000)
+            self.places.append({
+                'id': f"0x47a8{i:012x}:0x{rng.getrandbits(48):012x}",
+                'name': site['name'] if site else f"{rng.choice(NAMES)} {rng.choice(SUFFIXES)} #{i}",
+                'cuisine': rng.choice(CUISINES),
+                'address': f"{rng.choice(STREETS)} {rng.randint(1, 120)}, 10{rng.randint(100, 999)} Berlin",
+                'phone': f"030 {rng.randint(1000000, 9999999)}",
+                'rating': f"{rng.randint(30, 50) / 10:.1f}".replace('.', ','),
+                'reviews': f"{reviews:,}".replace(',', '.'),
+                'site': site['id'] if site else None
+            })
+
+
+def render_card(place, website):
+    name = html.escape(place['name'])
+    website_link = f'<a data-value="Website" aria-label="Website" href="{website}"></a>' if website else ''
+    return (
+        f'<div><div class="Nv2PK">'
+        f'<a class="hfpxzc" aria-label="{name}" data-place="{place["id"]}" '
+        f'href="/maps/place/{name.replace(" ", "+")}/data=!4m7!3m6!1s{place["id"]}!8m2"></a>'
+        f'<div class="qBF1Pd">{name}</div>'
+        f'<span class="MW4etd">{place["rating"]}</span><span class="UY7F9">({place["reviews"]})</span>'
+        f'<div class="W4Efsd">{place["cuisine"]} · € · {html.escape(place["address"].split(",")[0])}</div>'
+        f'<div class="W4Efsd">Geöffnet · Schließt um 22:00</div>'
+        f'<span class="UsdlK">{place["phone"]}</span>{website_link}'
+        f'</div></div>'
+    )
+
+
+MAPS_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(query)s - Maps fixture</title>
+<style>
+  body { margin: 0; font-family: sans-serif; display: flex; }
+  div[role='feed'] { width: 400px; height: 700px; overflow-y: auto; }
+  .Nv2PK { height: 110px; border-bottom: 1px solid #ddd; position: relative; }
+  .hfpxzc { position: absolute; inset: 0; }
+  #panel { padding: 16px; }
+</style></head>
+<body>
+<div role="feed" aria-label="Results for %(query)s">%(cards)s</div>
+<div id="panel"></div>
+<script>
+const batches = %(batches)s;
+const batchDelay = %(batch_delay)d;
+const detailDelay = %(detail_delay)d;
+const feed = document.querySelector("div[role='feed']");
+let next = 0;
+let loading = false;
+
+function appendBatch() {
+    if (next >= batches.length) {
+        if (!feed.querySelector('span.HlvSq')) {
+            feed.insertAdjacentHTML('beforeend', '<div><span class="HlvSq">You\\'ve reached the end of the list.</span></div>');
+        }
+        return;
+    }
+    loading = true;
+    setTimeout(function () {
+        feed.insertAdjacentHTML('beforeend', batches[next]);
+        next += 1;
+        loading = false;
+    }, batchDelay);
+}
+
+feed.addEventListener('scroll', function () {
+    if (!loading && feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 50) {
+        appendBatch();
+    }
+});
+
+feed.addEventListener('click', function (event) {
+    const anchor = event.target.closest('a.hfpxzc');
+    if (!anchor) { return; }
+    event.preventDefault();
+    fetch('/maps/api/place/' + encodeURIComponent(anchor.dataset.place))
+        .then(function (response) { return response.json(); })
+        .then(function (place) {
+            setTimeout(function () {
+                document.getElementById('panel').innerHTML = place.html;
+            }, detailDelay);
+        });
+});
+</script>
+</body></html>
+"""
+
+
+def render_panel(place, website):
+    name = html.escape(place['name'])
+    address = html.escape(place['address'])
+    phone_digits = place['phone'].replace(' ', '')
+    website_link = f'<a data-item-id="authority" href="{website}">Website</a>' if website else ''
+    return (
+        f'<h1 class="DUwDvf">{name}</h1>'
+        f'<div class="F7nice"><span aria-hidden="true">{place["rating"]}</span>'
+        f'<span aria-label="{place["reviews"]} reviews">({place["reviews"]})</span></div>'
+        f'<button data-item-id="address" aria-label="Address: {address}">{address}</button>'
+        f'<button data-item-id="phone:tel:{phone_digits}" aria-label="Phone: {place["phone"]}">{place["phone"]}</button>'
+        f'{website_link}'
+    )
+
+
+SITE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(title)s</title>
+<link rel="stylesheet" href="/static/site.css">
+<script src="/static/analytics.js"></script></head>
+<body>
+<nav><a href="/">Start</a> <a href="/speisekarte">Speisekarte</a> <a href="/kontakt">Kontakt</a> <a href="/impressum">Impressum</a></nav>
+<main>%(body)s</main>
+<img src="/static/hero.jpg" alt="">
+</body></html>
+"""
+
+JS_SITE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(title)s</title></head>
+<body><div id="root"></div>
+<script>
+document.getElementById('root').innerHTML = %(body)s;
+</script></body></html>
+"""
+
+
+def render_site_page(site, path):
+    """HTML for one page of a restaurant website, or None for unknown paths"""
+    name = html.escape(site['name'])
+    email = site['email']
+    layout = site['layout']
+    filler = '<p>' + ' '.join(['Frische Küche mit regionalen Zutaten.'] * 20) + '</p>'
+
+    if path == '/':
+        body = f'<h1>{name}</h1>{filler}'
+        if layout == 'homepage':
+            body += f'<p>Reservierung: {email}</p>'
+    elif path == '/speisekarte':
+        body = f'<h1>Speisekarte</h1>{filler}'
+    elif path == '/kontakt':
+        body = '<h1>Kontakt</h1><p>Telefon: 030 1234567</p>'
+        if layout in ('kontakt_text', 'js_rendered'):
+            body += f'<p>Schreiben Sie uns: {email}</p>'
+    elif path == '/impressum':
+        body = f'<h1>Impressum</h1><p>{name}<br>Inhaber: Max Mustermann</p>'
+        if layout == 'impressum_mailto':
+            body += f'<p><a href="mailto:{email}">E-Mail schreiben</a></p>'
+        elif layout == 'impressum_entity':
+            body += f'<p>E-Mail: {email.replace("@", "&#64;")}</p>'
+        elif layout == 'none':
+            body += f'<p>Webdesign: {AGENCY_EMAIL}</p>'  # Not the restaurant's, only a low-confidence fallback
+    else:
+        return None
+
+    if layout == 'js_rendered':
+        return JS_SITE_PAGE % {'title': name, 'body': json.dumps(body)}
+    return SITE_PAGE % {'title': name, 'body': body}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, body, content_type='text/html; charset=utf-8', status=200):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        fixtures = self.server.fixtures
+        time.sleep(fixtures.latency)
+        path = urlparse(self.path).path
+
+        if self.server.site is not None:
+            return self.serve_site(self.server.site, path)
+
+        if path.startswith('/maps/search/'):
+            return self.serve_search(unquote(path[len('/maps/search/'):]).replace('+', ' '))
+        if path.startswith('/maps/api/place/'):
+            return self.serve_place(unquote(path[len('/maps/api/place/'):]))
+        self.send_body('Not found', 'text/plain', 404)
+
+    def serve_search(self, query):
+        fixtures = self.server.fixtures
+        cards = [render_card(place, fixtures.website(place)) for place in fixtures.data.places]
+        size = fixtures.batch_size
+        batches = [''.join(cards[i:i + size]) for i in range(size, len(cards), size)]
+        self.send_body(MAPS_PAGE % {
+            'query': html.escape(query),
+            'cards': ''.join(cards[:size]),
+            'batches': json.dumps(batches),
+            'batch_delay': fixtures.batch_delay_ms,
+            'detail_delay': fixtures.detail_delay_ms
+        })
+
+    def serve_place(self, place_id):
+        fixtures = self.server.fixtures
+        place = fixtures.places_by_id.get(place_id)
+        if place is None:
+            return self.send_body('{}', 'application/json', 404)
+        self.send_body(json.dumps({'html': render_panel(place, fixtures.website(place))}), 'application/json')
+
+    def serve_site(self, site, path):
+        if path.startswith('/static/'):
+            # Heavy assets, so lean mode has something to block
+            size = {'.jpg': 200000, '.css': 20000, '.js': 40000}.get(path[path.rfind('.'):], 1000)
+            content_type = {'.jpg': 'image/jpeg', '.css': 'text/css', '.js': 'application/javascript'}.get(
+                path[path.rfind('.'):], 'application/octet-stream')
+            data = b'/' * size if content_type != 'image/jpeg' else b'\xff' * size
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        page = render_site_page(site, path)
+        if page is None:
+            return self.send_body('Not found', 'text/plain', 404)
+        self.send_body(page)
+
+
+class FixtureServer:
+    """Maps fixture on one port and every restaurant website on its own port
+
+    Separate ports make every website a separate domain for the email cache and the
+    per-domain politeness budget.
+    """
+
+    def __init__(self, places=40, sites=24, seed=7, latency=0.02, batch_size=10, batch_delay_ms=150,
+                 detail_delay_ms=80, host='127.0.0.1'):
+        self.data = FixtureData(places, sites, seed)
+        self.places_by_id = {place['id']: place for place in self.data.places}
+        self.latency = latency
+        self.batch_size = batch_size
+        self.batch_delay_ms = batch_delay_ms
+        self.detail_delay_ms = detail_delay_ms
+        self.host = host
+        self.servers = []
+        self.maps_server = self._serve(None)
+        self.site_servers = [self._serve(site) for site in self.data.sites]
+
+    def _serve(self, site):
+        server = ThreadingHTTPServer((self.host, 0), FixtureHandler)
+        server.daemon_threads = True
+        server.fixtures = self
+        server.site = site
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return server
+
+    @property
+    def maps_url(self):
+        return f'http://{self.host}:{self.maps_server.server_address[1]}/maps'
+
+    def site_url(self, site_id):
+        return f'http://{self.host}:{self.site_servers[site_id].server_address[1]}/'
+
+    def website(self, place):
+        return self.site_url(place['site']) if place['site'] is not None else None
+
+    def websites(self):
+        """(name, website) for every restaurant website"""
+        return [(site['name'], self.site_url(site['id'])) for site in self.data.sites]
+
+    def expected_emails(self):
+        """website -> email a perfect scanner finds (the agency's address as fallback if nothing else)"""
+        return {self.site_url(site['id']): site['email'] if site['layout'] != 'none' else AGENCY_EMAIL
+                for site in self.data.sites}
+
+    def close(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=40)
+    parser.add_argument('--sites', type=int, default=24)
+    args = parser.parse_args()
+
+    fixtures = FixtureServer(args.places, args.sites)
+    print(f"Maps fixture: {fixtures.maps_url}/search/restaurant+in+Berlin")
+    for name, website in fixtures.websites()[:5]:
+        print(f"Website: {website} ({name})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fixtures.close()
@@ -0,0 +1,265 @@
+"""Offline throughput benchmark for GoogleMapsScraper and email_scraper.process_csv
+
+Everything runs against the local fixture server, so results are repeatable and can be
+compared between commits or modes:
+
+    python benchmarks/run_benchmark.py --modes script,fast_list --email-modes http,browser --workers 1,4
+    python benchmarks/run_benchmark.py --json after.json --compare before.json
+
+Reports places (or rows) per minute, p50/p95 latency per place and peak RSS of the
+process tree (Chrome included when psutil is installed).
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+from fixture_server import FixtureServer
+
+# GoogleMapsScraper settings per benchmark mode
+MAPS_MODES = {
+    'legacy': {'scraper': {'script_extraction': False, 'event_waits': False}, 'fast_list': False},
+    'events': {'scraper': {'script_extraction': False, 'event_waits': True}, 'fast_list': False},
+    'script': {'scraper': {'script_extraction': True, 'event_waits': True}, 'fast_list': False},
+    'fast_list': {'scraper': {'script_extraction': True, 'event_waits': True}, 'fast_list': True}
+}
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class PeakRss:
+    """Samples the RSS of this process and its children (Chrome, chromedriver) in the background"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        try:
+            import psutil
+            self.process = psutil.Process()
+        except ImportError:
+            self.process = None
+
+    def _sample(self):
+        total = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except Exception:
+                pass
+        self.peak = max(self.peak, total)
+
+    def start(self):
+        if self.process:
+            def loop():
+                while not self._stop.is_set():
+                    self._sample()
+                    self._stop.wait(self.interval)
+            self._thread = threading.Thread(target=loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Peak RSS in MB and how it was measured"""
+        if self.process:
+            self._stop.set()
+            self._thread.join()
+            return round(self.peak / 1024 / 1024, 1), 'psutil process tree'
+        # Without psutil only this process is visible (lifetime peak, not per run)
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1), 'rusage self'
+
+
+class TimedSink:
+    """Sink for scrape_city that only records when each place was finished"""
+
+    def __init__(self):
+        self.times = []
+
+    @property
+    def count(self):
+        return len(self.times)
+
+    def write(self, record):
+        self.times.append(time.time())
+
+    def close(self):
+        pass
+
+
+def summarize(kind, mode, items, started, finished, first_started, rss, extra=None):
+    """Common result record: throughput, per-item latency percentiles and peak RSS"""
+    elapsed = finished - started
+    # Per-item latency is the gap between consecutive results; the first gap includes page setup
+    gaps = [later - earlier for earlier, later in zip(items, items[1:])]
+    result = {
+        'kind': kind,
+        'mode': mode,
+        'items': len(items),
+        'elapsed_s': round(elapsed, 2),
+        'per_minute': round(len(items) / elapsed * 60, 1) if elapsed else None,
+        'first_item_s': round(items[0] - first_started, 2) if items else None,
+        'p50_s': round(percentile(gaps, 50), 3) if gaps else None,
+        'p95_s': round(percentile(gaps, 95), 3) if gaps else None,
+        'peak_rss_mb': rss[0],
+        'rss_source': rss[1]
+    }
+    result.update(extra or {})
+    return result
+
+
+def bench_maps(fixtures, mode, places, headless=True, lean=False, min_interval=0.2):
+    """Scrape the fixture feed with one GoogleMapsScraper configuration"""
+    from scraper import GoogleMapsScraper
+
+    settings = MAPS_MODES[mode]
+    sampler = PeakRss().start()
+    started = time.time()
+    scraper = GoogleMapsScraper(headless=headless, maps_url=fixtures.maps_url, min_interval=min_interval,
+                                lean=lean, **settings['scraper'])
+    startup = time.time() - started
+
+    sink = TimedSink()
+    try:
+        scrape_started = time.time()
+        scraper.scrape_city('Berlin', ['restaurant'], max_results=places, fast_list=settings['fast_list'], sink=sink)
+        finished = time.time()
+    finally:
+        scraper.close()
+
+    return summarize('maps', mode + ('+lean' if lean else ''), sink.times, scrape_started, finished,
+                     scrape_started, sampler.stop(), {'startup_s': round(startup, 2)})
+
+
+def bench_email(fixtures, mode, workers=1, concurrency=20, verbose=False):
+    """Run process_csv over the fixture websites (places sharing a website included)"""
+    import email_scraper
+    from task_queue import TaskQueue
+
+    expected = fixtures.expected_emails()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'places.csv')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'website'])
+            for place in fixtures.data.places:
+                writer.writerow([place['name'], fixtures.website(place) or ''])
+
+        times = []
+        sampler = PeakRss().start()
+        started = time.time()
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        task_queue = TaskQueue(os.path.join(tmp, 'tasks.db')) if mode == 'queue' else None
+        with output:
+            email_scraper.process_csv(csv_path, mode=mode, concurrency=concurrency, workers=workers,
+                                      progress=lambda row: times.append(time.time()), task_queue=task_queue)
+        finished = time.time()
+        if task_queue:
+            task_queue.close()
+
+        with open(csv_path.replace('.csv', '_with_emails.csv'), encoding='utf-8') as f:
+            rows = [row for row in csv.DictReader(f) if row['website']]
+        correct = sum(1 for row in rows if row['email'] == expected.get(row['website'], ''))
+
+    return summarize('email', f'{mode} x{workers}', times, started, finished, started, sampler.stop(),
+                     {'accuracy': round(correct / len(rows), 3) if rows else None})
+
+
+def print_table(results):
+    columns = ['kind', 'mode', 'items', 'elapsed_s', 'per_minute', 'p50_s', 'p95_s', 'peak_rss_mb', 'accuracy']
+    widths = {column: max(len(column), *(len(str(result.get(column, ''))) for result in results)) for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for result in results:
+        print('  '.join(str(result.get(column, '')).ljust(widths[column]) for column in columns))
+
+
+def compare(results, baseline_path):
+    """Throughput change against an earlier --json run"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['kind'], r['mode']): r for r in json.load(f)['results']}
+
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        before = baseline.get((result['kind'], result['mode']))
+        if before and before.get('per_minute') and result.get('per_minute'):
+            change = result['per_minute'] / before['per_minute'] - 1
+            print(f"  {result['kind']} {result['mode']}: {before['per_minute']} -> {result['per_minute']}/min "
+                  f"({change:+.0%}), p95 {before.get('p95_s')} -> {result.get('p95_s')}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark against local fixtures')
+    parser.add_argument('--places', type=int, default=40, help='places in the fixture feed')
+    parser.add_argument('--sites', type=int, default=24, help='restaurant websites')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds added to every fixture response')
+    parser.add_argument('--modes', default='script,fast_list',
+                        help=f"Maps modes ({', '.join(MAPS_MODES)}); empty to skip")
+    parser.add_argument('--lean', action='store_true', help='run the Maps modes in lean mode')
+    parser.add_argument('--min-interval', type=float, default=0.2, help='politeness interval for event waits')
+    parser.add_argument('--email-modes', default='http', help='process_csv modes (http, browser, queue); empty to skip')
+    parser.add_argument('--workers', default='1', help='browser worker counts for process_csv, e.g. 1,4')
+    parser.add_argument('--concurrency', type=int, default=20, help='HTTP concurrency for process_csv')
+    parser.add_argument('--show-browser', action='store_true', help='run Chrome with a window')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--compare', help='earlier --json results to compare with')
+    parser.add_argument('--verbose', action='store_true', help='keep scraper logging and output')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    fixtures = FixtureServer(places=args.places, sites=args.sites, seed=args.seed, latency=args.latency)
+    results = []
+    try:
+        for mode in filter(None, args.modes.split(',')):
+            print(f"Maps benchmark: {mode}...")
+            results.append(bench_maps(fixtures, mode, args.places, headless=not args.show_browser,
+                                      lean=args.lean, min_interval=args.min_interval))
+
+        for mode in filter(None, args.email_modes.split(',')):
+            for workers in [int(w) for w in args.workers.split(',')]:
+                print(f"Email benchmark: {mode} with {workers} worker(s)...")
+                results.append(bench_email(fixtures, mode, workers, args.concurrency, args.verbose))
+    finally:
+        fixtures.close()
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'args': vars(args),
+                'results': results
+            }, f, indent=2)
+        print(f"\nSaved results to {args.json}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+
+class CheckpointJournal:
+    """SQLite journal of finished work so an interrupted run can resume where it stopped"""
+
+    def __init__(self, path='scraper_checkpoint.db'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS places (
+                city TEXT NOT NULL,
+                query TEXT NOT NULL,
+                place_key TEXT NOT NULL,
+                record TEXT,
+                finished_at TEXT NOT NULL,
+                PRIMARY KEY (city, query, place_key)
+            );
+            CREATE TABLE IF NOT EXISTS duplicates (
+                city TEXT NOT NULL,
+                query TEXT NOT NULL,
+                place_key TEXT NOT NULL,
+                PRIMARY KEY (city, query, place_key)
+            );
+            CREATE TABLE IF NOT EXISTS queries (
+                city TEXT NOT NULL,
+                query TEXT NOT NULL,
+                finished_at TEXT NOT NULL,
+                feed_size INTEGER,
+                PRIMARY KEY (city, query)
+            );
+            CREATE TABLE IF NOT EXISTS websites (
+                url TEXT PRIMARY KEY,
+                email TEXT NOT NULL,
+                finished_at TEXT NOT NULL
+            );
+        ''')
+        # Journals written before feed sizes were recorded
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(queries)')]
+        if 'feed_size' not in columns:
+            self.conn.execute('ALTER TABLE queries ADD COLUMN feed_size INTEGER')
+        self.conn.commit()
+
+    def _now(self):
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def _write(self, sql, params):
+        with self.lock:
+            self.conn.execute(sql, params)
+            self.conn.commit()
+
+    def _read(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # --- Maps units -------------------------------------------------------
+
+    def is_query_done(self, city, query):
+        """Check whether every place of a (city, query) pair was processed"""
+        return bool(self._read('SELECT 1 FROM queries WHERE city = ? AND query = ?', (city, query)))
+
+    def mark_query_done(self, city, query, feed_size=None):
+        """Record that a (city, query) pair is finished, with the number of places its feed listed"""
+        self._write('INSERT OR REPLACE INTO queries (city, query, finished_at, feed_size) VALUES (?, ?, ?, ?)',
+                    (city, query, self._now(), feed_size))
+
+    def feed_size(self, city, query):
+        """Return the feed size recorded for a finished (city, query) pair, or None"""
+        rows = self._read('SELECT feed_size FROM queries WHERE city = ? AND query = ?', (city, query))
+        return rows[0][0] if rows else None
+
+    def record_place(self, city, query, place_key, record):
+        """Record a finished place (record=None marks a place that yielded no data)"""
+        payload = json.dumps(record, ensure_ascii=False) if record is not None else None
+        self._write('INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?, ?)',
+                    (city, query, place_key, payload, self._now()))
+
+    def place_records(self, city, query):
+        """Return {place_key: record} for every finished place of a (city, query) pair"""
+        rows = self._read('SELECT place_key, record FROM places WHERE city = ? AND query = ? ORDER BY rowid',
+                          (city, query))
+        return {key: json.loads(record) if record else None for key, record in rows}
+
+    def record_duplicate(self, city, query, place_key):
+        """Record a place a (city, query) pair skipped because another query already found it"""
+        self._write('INSERT OR IGNORE INTO duplicates VALUES (?, ?, ?)', (city, query, place_key))
+
+    def duplicates(self, city, query):
+        """Return the place keys a (city, query) pair skipped as duplicates"""
+        rows = self._read('SELECT place_key FROM duplicates WHERE city = ? AND query = ? ORDER BY rowid',
+                          (city, query))
+        return [key for (key,) in rows]
+
+    def records(self, city=None):
+        """Return all journaled records, optionally for one city"""
+        if city is None:
+            rows = self._read('SELECT record FROM places WHERE record IS NOT NULL ORDER BY rowid')
+        else:
+            rows = self._read('SELECT record FROM places WHERE record IS NOT NULL AND city = ? ORDER BY rowid',
+                              (city,))
+        return [json.loads(record) for (record,) in rows]
+
+    # --- Email enrichment -------------------------------------------------
+
+    def get_email(self, url):
+        """Return the journaled email for a website ('' if none was found), or None if not processed"""
+        rows = self._read('SELECT email FROM websites WHERE url = ?', (url,))
+        return rows[0][0] if rows else None
+
+    def record_email(self, url, email):
+        """Record the enrichment result of a website"""
+        self._write('INSERT OR REPLACE INTO websites VALUES (?, ?, ?)', (url, email or '', self._now()))
+
+    # --- Lifecycle --------------------------------------------------------
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.conn.close()
+
+    def reset(self):
+        """Delete the journal after a run completed successfully"""
+        self.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        logging.info(f"Checkpoint journal {self.path} cleared")
@@ -0,0 +1,181 @@
+"""Command line entry point: scrape the city x query grid from config.py or flags
+
+    python cli.py                                        # config.CITIES x config.SEARCH_QUERIES
+    python cli.py --cities Berlin,Hamburg --queries restaurant,cafe --headless
+    python cli.py --shard 2/3 --proxy                    # this machine's share of a 3-way split
+    python cli.py --shard 2/3 --dry-run                  # only list the units of shard 2
+    python cli.py --queue crawl.db --workers 2           # claim units from a shared task queue
+    python cli.py --cities Berlin --tile-zoom 14         # search Berlin map tile by map tile
+    python cli.py --refresh                              # only re-scrape new, changed or stale places
+    python cli.py --queue email_tasks.db --email-worker  # help with the websites of email_scraper.py
+
+Every machine given the same grid and the same N computes the same assignment, so a crawl
+can be split across machines without coordination and without overlap. With --queue the
+units are leased from a shared SQLite queue instead: processes can join or leave at any time
+and the units of a crashed worker are picked up by the others.
+"""
+import argparse
+import hashlib
+import logging
+
+import config
+from log_setup import configure_logging
+
+
+def work_grid(cities, queries):
+    """Every (city, query) unit, city by city"""
+    return [(city, query) for city in cities for query in queries]
+
+
+def shard_of(city, query, count):
+    """Shard number (1..count) of a work unit
+
+    Based on a hash of the unit itself, so it does not depend on the order of the grid,
+    the machine or Python's per-process hash seed.
+    """
+    key = f'{city.strip().lower()}|{query.strip().lower()}'.encode('utf-8')
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], 'big') % count + 1
+
+
+def select_shard(units, index, count):
+    """Units assigned to shard index of count (in grid order)"""
+    return [(city, query) for city, query in units if shard_of(city, query, count) == index]
+
+
+def parse_shard(value):
+    """'2/3' -> (2, 3); shards are numbered from 1"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got '{value}'")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and N, got '{value}'")
+    return index, count
+
+
+def parse_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Scrape Google Maps for a city x query grid')
+    parser.add_argument('--cities', type=parse_list, default=config.CITIES,
+                        help='comma-separated cities (default: config.CITIES)')
+    parser.add_argument('--queries', type=parse_list, default=config.SEARCH_QUERIES,
+                        help='comma-separated search queries (default: config.SEARCH_QUERIES)')
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help='only scrape the units of shard i out of N (numbered from 1)')
+    parser.add_argument('--queue', metavar='PATH',
+                        help='shared task queue file: add the units to it and work on it with the other processes')
+    parser.add_argument('--email-worker', action='store_true',
+                        help='only look up emails for the website tasks of --queue (see email_scraper.py MODE "queue")')
+    parser.add_argument('--tile-zoom', type=int, default=config.TILE_ZOOM, metavar='Z',
+                        help='search each city tile by tile at zoom Z, bounds from config.CITY_BOUNDS '
+                             '(default: config.TILE_ZOOM)')
+    parser.add_argument('--refresh', action='store_true',
+                        help='reuse places of the previous dataset whose card is unchanged and whose record is '
+                             'younger than --refresh-ttl days')
+    parser.add_argument('--refresh-from', metavar='CSV',
+                        help='previous results CSV for --refresh (default: the columnar dataset in OUTPUT_DIR)')
+    parser.add_argument('--refresh-ttl', type=float, default=config.REFRESH_TTL_DAYS, metavar='DAYS',
+                        help='re-scrape unchanged places older than this (default: config.REFRESH_TTL_DAYS)')
+    parser.add_argument('--max-results', type=int, default=config.MAX_RESULTS_PER_QUERY,
+                        help='places per query (default: config.MAX_RESULTS_PER_QUERY)')
+    parser.add_argument('--workers', type=int, default=1, help='parallel browser workers')
+    parser.add_argument('--headless', action=argparse.BooleanOptionalAction, default=config.HEADLESS_MODE,
+                        help='run Chrome without a window, --no-headless with one (default: config.HEADLESS_MODE)')
+    parser.add_argument('--proxy', action='store_true', help='rotate free proxies (main_scraper_proxy)')
+    parser.add_argument('--fast-list', action='store_true',
+                        help='build records from feed cards, click only for missing phone/website')
+    parser.add_argument('--fixed-delays', action='store_true',
+                        help='random 2-5s sleeps instead of readiness waits')
+    parser.add_argument('--no-lean', action='store_true', help='load images, fonts and media')
+    parser.add_argument('--no-standby', action='store_true', help='do not keep a spare Chrome warmed up')
+    parser.add_argument('--no-emails', action='store_true', help='skip email enrichment')
+    parser.add_argument('--no-normalize', action='store_true', help='skip the normalized CSV')
+    parser.add_argument('--dry-run', action='store_true', help='print the work units and exit')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.email_worker and not args.queue:
+        parser.error('--email-worker needs --queue')
+    if args.tile_zoom:
+        from tiling import city_bounds
+        for city in args.cities:
+            try:
+                city_bounds(city)
+            except ValueError as e:
+                parser.error(str(e))
+
+    units = work_grid(args.cities, args.queries)
+    run_tag = ''
+    if args.shard:
+        index, count = args.shard
+        total = len(units)
+        units = select_shard(units, index, count)
+        run_tag = f'_shard{index}of{count}'
+        logging.info(f"Shard {index}/{count}: {len(units)} of {total} work units")
+
+    if args.dry_run:
+        if args.tile_zoom:
+            from tiling import tile_units
+            for city, query, tile in tile_units(units, args.tile_zoom):
+                print(f"{city}\t{query}\t{tile.key}")
+        else:
+            for city, query in units:
+                print(f"{city}\t{query}")
+        return
+
+    if args.email_worker:
+        from email_scraper import work_email_queue
+        from task_queue import TaskQueue
+        task_queue = TaskQueue(args.queue, lease_seconds=config.QUEUE_LEASE_SECONDS,
+                               max_attempts=config.QUEUE_MAX_ATTEMPTS)
+        try:
+            work_email_queue(task_queue)
+        finally:
+            task_queue.close()
+        return
+
+    if not units:
+        logging.warning("No work units for this shard")
+        return
+
+    refresh = None
+    if args.refresh or args.refresh_from:
+        from refresh import RefreshIndex
+        refresh = RefreshIndex.load(csv_path=args.refresh_from, cities={city for city, _ in units},
+                                    ttl_days=args.refresh_ttl)
+
+    task_queue = None
+    if args.queue:
+        from task_queue import TaskQueue, worker_name
+        task_queue = TaskQueue(args.queue, lease_seconds=config.QUEUE_LEASE_SECONDS,
+                               max_attempts=config.QUEUE_MAX_ATTEMPTS, expire_after=config.QUEUE_EXPIRE_HOURS * 3600)
+        run_tag += f'_{worker_name()}'  # Every process writes its own output files
+
+    # Imported here so --dry-run works without Selenium installed
+    if args.proxy:
+        from main_scraper_proxy import run_scraper
+        scraper_kwargs = {'use_proxy': True}
+    else:
+        from scraper import run_scraper
+        scraper_kwargs = {}
+
+    try:
+        run_scraper(units, max_results=args.max_results, workers=args.workers, fast_list=args.fast_list,
+                    enrich_emails=not args.no_emails, normalize_output=not args.no_normalize, run_tag=run_tag,
+                    task_queue=task_queue, tile_zoom=args.tile_zoom, refresh=refresh, headless=args.headless,
+                    event_waits=not args.fixed_delays, lean=not args.no_lean, standby=not args.no_standby,
+                    **scraper_kwargs)
+    finally:
+        if task_queue:
+            task_queue.close()
+
+
+if __name__ == '__main__':
+    configure_logging()  # Before the scraper modules are imported, with the same log file and console output
+    main()
@@ -47,11 +47,42 @@ USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15'
 ]
 
+# Tiling settings (large cities are searched map tile by map tile, see tiling.py)
+TILE_ZOOM = None  # e.g. 14: split every city into map tiles at this zoom level (None = one search per city)
+TILE_MAX_ZOOM = 17  # Tiles whose feed reaches MAX_RESULTS_PER_QUERY are split down to this zoom level
+
+# Bounding boxes (south, west, north, east) of the cities, needed for tiling
+CITY_BOUNDS = {
+    'Berlin': (52.338, 13.088, 52.675, 13.761),
+    'Leipzig': (51.238, 12.237, 51.448, 12.543),
+    'Hamburg': (53.395, 9.730, 53.740, 10.325),
+    'Munich': (48.062, 11.361, 48.248, 11.723),
+    'Cologne': (50.830, 6.772, 51.085, 7.162),
+    'Frankfurt': (50.015, 8.472, 50.227, 8.800),
+    'Dresden': (50.975, 13.579, 51.177, 13.966)
+}
+
+# Refresh settings (cli.py --refresh)
+REFRESH_TTL_DAYS = 30  # Places unchanged since the previous run are re-scraped once their record is this old
+
+# Task queue settings (cli.py --queue)
+QUEUE_LEASE_SECONDS = 300  # A unit not renewed for this long (crashed worker) goes to another worker
+QUEUE_MAX_ATTEMPTS = 3  # Attempts per unit before it is marked failed
+QUEUE_EXPIRE_HOURS = 12  # Finished units are scraped again when a run adds them after this long
+
+# Email lookup settings (email_scraper.py, email_enricher.py)
+EMAIL_PAGE_TIMEOUT = 10  # Timeout in seconds for loading or fetching a website page
+
 # Output settings
 OUTPUT_DIR = 'output'  # Directory for output files
+# Columns of a scraped record, in output order (the fixed header of the result CSVs)
+RECORD_COLUMNS = ['name', 'address', 'phone', 'website', 'email', 'rating', 'reviews_count',
+                  'city', 'category', 'scraped_at', 'place_id']
 SAVE_CSV = True  # Save as CSV
 SAVE_EXCEL = True  # Save as Excel
-SAVE_JSON = False  # Save as JSON
+SAVE_JSON = False  # Save as JSON Lines (streamed while scraping)
+COLUMNAR_FORMAT = 'parquet'  # Columnar dataset partitioned by city and run date: 'parquet', 'arrow' (IPC) or None
+COLUMNAR_COMPRESSION = 'zstd'  # 'zstd', 'lz4' (Arrow and Parquet) or 'snappy' (Parquet only)
 
 # Logging settings
 LOG_LEVEL = 'INFO'  # Options: DEBUG, INFO, WARNING, ERROR, CRITICAL
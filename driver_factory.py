@@ -0,0 +1,83 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DriverFactory:
+    """Builds configured drivers and keeps one pre-started spare warming in the background
+
+    build is a callable returning a fully set up driver. acquire() hands out the spare
+    (or builds one if there is none) and immediately starts warming the next.
+    """
+
+    def __init__(self, build, standby=True):
+        self.build = build
+        self.standby = standby
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='driver-standby')
+        self.spare = None  # Future of the warming driver
+        self.startup_times = []  # Seconds per driver start (foreground and background)
+        self.handover_times = []  # Seconds the caller was blocked per acquire()
+
+    def _timed_build(self):
+        started = time.time()
+        driver = self.build()
+        with self.lock:
+            self.startup_times.append(time.time() - started)
+        return driver
+
+    def _warm(self):
+        if self.standby:
+            self.spare = self.executor.submit(self._timed_build)
+
+    def acquire(self):
+        """Return a ready driver: the warmed spare if there is one, otherwise a fresh start"""
+        started = time.time()
+        spare, self.spare = self.spare, None
+        driver = None
+
+        if spare is not None:
+            try:
+                driver = spare.result()  # Usually already finished, else waits for the rest of its start
+            except Exception as e:
+                logging.warning(f"Standby driver failed to start: {e}")
+
+        if driver is None:
+            driver = self._timed_build()
+
+        handover = time.time() - started
+        with self.lock:
+            self.handover_times.append(handover)
+        self._warm()
+        return driver
+
+    def discard_spare(self):
+        """Throw away the warming spare (e.g. it was configured for a proxy that is no longer used)
+
+        Waits until the spare has quit, so the next driver can start on its profile right away.
+        """
+        spare, self.spare = self.spare, None
+        if spare is None:
+            return
+        try:
+            spare.result().quit()
+        except Exception as e:
+            logging.warning(f"Standby driver could not be discarded: {e}")
+
+    @staticmethod
+    def _stats(values):
+        if not values:
+            return 'n/a'
+        ordered = sorted(values)
+        return (f"{len(ordered)} x, mean {sum(ordered) / len(ordered):.2f}s, "
+                f"p50 {ordered[len(ordered) // 2]:.2f}s, max {ordered[-1]:.2f}s")
+
+    def latency_summary(self):
+        with self.lock:
+            return (f"Driver startup: {self._stats(self.startup_times)}; "
+                    f"handover: {self._stats(self.handover_times)}")
+
+    def close(self):
+        self.discard_spare()
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,158 @@
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, unquote, urlencode, urlparse, urlunparse
+
+# Public suffixes with two labels, so "example.co.uk" is kept whole
+MULTI_PART_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'me.uk', 'ltd.uk', 'plc.uk',
+    'co.at', 'or.at', 'ac.at', 'gv.at',
+    'com.au', 'net.au', 'org.au',
+    'co.nz', 'co.jp', 'co.za', 'com.br', 'com.tr', 'com.cn', 'com.pl',
+    'co.il', 'co.in', 'com.mx', 'com.ar', 'com.es', 'com.gr'
+}
+
+# Tracking parameters that do not change the page
+TRACKING_PARAMS = ('utm_', 'gclid', 'fbclid', 'mc_', 'yclid', 'msclkid')
+
+# Platforms and shared hosts where many businesses have a page on the same host; their pages
+# are told apart by path, and the platform's own addresses are not a business's contact
+PLATFORM_DOMAINS = {
+    'facebook.com', 'instagram.com', 'linktr.ee', 'tiktok.com', 'x.com', 'twitter.com',
+    'eatbu.com', 'speisekartenweb.de', 'lieferando.de', 'wolt.com', 'ubereats.com', 'tripadvisor.de',
+    'tripadvisor.com', 'yelp.de', 'yelp.com', 'business.site', 'wixsite.com', 'jimdosite.com',
+    'jimdofree.com', 'site123.me', 'webador.de', 'google.com', 'goo.gl', 'g.page'
+}
+
+
+def canonical_url(url):
+    """Clean a website URL for fetching: lowercase host, no tracking params, no fragment"""
+    url = url.strip()
+    if '://' not in url:
+        url = 'http://' + url
+    parts = urlparse(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith(TRACKING_PARAMS)]
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', '', urlencode(query), ''))
+
+
+def canonical_domain(url):
+    """Registered domain of a website, e.g. 'https://www.melia.com/de/...' -> 'melia.com'"""
+    if '://' not in url:
+        url = 'http://' + url.strip()
+    host = (urlparse(url).hostname or '').lower().rstrip('.')
+    labels = [label for label in host.split('.') if label]
+
+    # IP addresses and local hosts are kept as they are (including the port)
+    if len(labels) < 2 or host.replace('.', '').isdigit():
+        return urlparse(url).netloc.lower()
+
+    if '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES and len(labels) >= 3:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def is_platform(url):
+    """Check whether a website or email domain belongs to a platform in PLATFORM_DOMAINS"""
+    return canonical_domain(url) in PLATFORM_DOMAINS
+
+
+def site_key(url):
+    """Key of the business behind a website: its host, plus the path on platform hosts
+
+    'https://www.melia.com/de/hotels' -> 'melia.com',
+    'https://speisekartenweb.de/restaurants/berlin/elefant-60615?utm_source=x' ->
+    'speisekartenweb.de/restaurants/berlin/elefant-60615'. Lookups are deduplicated,
+    cached and queued under this key.
+    """
+    if '://' not in url:
+        url = 'http://' + url.strip()
+    parts = urlparse(url.strip())
+    host = parts.netloc.lower().rpartition('@')[2].rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    if is_platform(host):
+        path = unquote(parts.path).rstrip('/')
+        return host + path.lower()
+    return host
+
+
+class EmailCache:
+    """Disk-backed cache of email lookups per site (see site_key), with TTL and LRU size limit"""
+
+    def __init__(self, path='email_cache.db', ttl_days=30, negative_ttl_days=7, max_entries=50000):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.negative_ttl = negative_ttl_days * 86400  # "No email found" is re-checked sooner
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS emails (
+                domain TEXT PRIMARY KEY,
+                email TEXT NOT NULL,
+                checked_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS emails_last_used ON emails (last_used)')
+        self.conn.commit()
+
+    def get(self, domain):
+        """Return the cached email ('' for a cached negative result), or None on a miss"""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute('SELECT email, checked_at FROM emails WHERE domain = ?', (domain,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            email, checked_at = row
+            if now - checked_at > (self.ttl if email else self.negative_ttl):
+                self.conn.execute('DELETE FROM emails WHERE domain = ?', (domain,))
+                self.conn.commit()
+                self.misses += 1
+                return None
+
+            self.conn.execute('UPDATE emails SET last_used = ? WHERE domain = ?', (now, domain))
+            self.conn.commit()
+            self.hits += 1
+            return email
+
+    def put(self, domain, email):
+        """Store the lookup result for a domain (empty email = negative result)"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO emails VALUES (?, ?, ?, ?)', (domain, email or '', now, now))
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop the least recently used entries above max_entries"""
+        (count,) = self.conn.execute('SELECT COUNT(*) FROM emails').fetchone()
+        if count > self.max_entries:
+            self.conn.execute(
+                'DELETE FROM emails WHERE domain IN (SELECT domain FROM emails ORDER BY last_used LIMIT ?)',
+                (count - self.max_entries,)
+            )
+
+    def purge_expired(self):
+        """Remove all expired entries"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM emails WHERE (email != '' AND checked_at < ?) OR (email = '' AND checked_at < ?)",
+                (now - self.ttl, now - self.negative_ttl)
+            )
+            self.conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return f"{self.hits} hits / {self.misses} misses ({self.hits / total:.0%} hit rate)" if total else "no lookups"
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
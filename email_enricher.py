@@ -0,0 +1,200 @@
+import asyncio
+import re
+from contextlib import nullcontext
+from html.parser import HTMLParser
+
+import aiohttp
+
+import config
+from email_scan import CONTACT_KEYWORDS, best_email, rank_contact_links, scan_markup
+
+# Maximum number of websites fetched at the same time
+DEFAULT_CONCURRENCY = 20
+
+# Maximum number of contact pages checked per website
+MAX_CONTACT_PAGES = 5
+
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8'
+}
+
+# Markers of pages that only render their content with JavaScript
+JS_APP_MARKERS = [
+    '<div id="root"></div>', '<div id="app"></div>', '<div id="__next"></div>',
+    'enable javascript', 'javascript aktivieren', 'javascript is required',
+    'wix-thunderbolt', 'data-reactroot=""'
+]
+
+
+class LinkParser(HTMLParser):
+    """Collect anchors (href + text) and visible text from raw HTML"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.text_parts = []
+        self.script_count = 0
+        self._skip_depth = 0
+        self._current_href = None
+        self._current_text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style', 'noscript'):
+            self._skip_depth += 1
+            if tag == 'script':
+                self.script_count += 1
+        elif tag == 'a':
+            self._current_href = dict(attrs).get('href')
+            self._current_text = []
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style', 'noscript'):
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'a' and self._current_href is not None:
+            self.links.append((self._current_href, ' '.join(self._current_text).strip()))
+            self._current_href = None
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        self.text_parts.append(data)
+        if self._current_href is not None:
+            self._current_text.append(data.strip())
+
+    @property
+    def visible_text(self):
+        return re.sub(r'\s+', ' ', ' '.join(self.text_parts)).strip()
+
+
+def parse_page(markup):
+    """Parse raw HTML into a LinkParser"""
+    parser = LinkParser()
+    try:
+        parser.feed(markup)
+        parser.close()
+    except Exception:
+        pass
+    return parser
+
+
+def looks_js_rendered(markup, parsed=None):
+    """Guess whether a page needs a real browser to show its content"""
+    parsed = parsed or parse_page(markup)
+    lowered = markup.lower()
+
+    if any(marker in lowered for marker in JS_APP_MARKERS):
+        return True
+
+    # Scripts but almost no text: content is built client-side
+    return parsed.script_count > 0 and len(parsed.visible_text) < 200
+
+
+async def get_page(session, url, **kwargs):
+    async with session.get(url, allow_redirects=True, **kwargs) as response:
+        content_type = response.headers.get('Content-Type', '')
+        if response.status >= 400:
+            return url, None, f'HTTP {response.status}'
+        if 'html' not in content_type and 'text' not in content_type:
+            return url, None, None
+        return str(response.url), await response.text(errors='replace'), None
+
+
+async def fetch_page(session, url):
+    """Fetch a page and return (final_url, html, error)
+
+    html is None if the page is not usable HTML; error then says why the fetch failed
+    ('HTTP 503', 'timeout', ...), or is None for a page that is simply not HTML.
+    Certificates are verified; only a site whose certificate fails verification (expired,
+    self-signed, wrong host) is fetched once more without it, to read its contact details.
+    """
+    try:
+        try:
+            return await get_page(session, url)
+        except aiohttp.ClientConnectorCertificateError:
+            return await get_page(session, url, ssl=False)
+    except asyncio.TimeoutError:
+        return url, None, 'timeout'
+    except (aiohttp.ClientError, UnicodeDecodeError, ValueError) as e:
+        return url, None, type(e).__name__
+
+
+async def scan_website(session, url):
+    """Scan a website's homepage and contact pages (Impressum first) for an email address
+
+    Stops at the first confident hit (mailto link or address on the site's own domain);
+    otherwise the best fallback address found is kept. A homepage that could not be fetched
+    (timeout, HTTP error, bot block) sets result['error'] and needs_browser: that is not the
+    same as a site without an email, and must not be stored as one.
+    """
+    result = {'email': '', 'needs_browser': False, 'pages': 0, 'error': None}
+
+    final_url, markup, error = await fetch_page(session, url)
+    if markup is None:
+        result['error'] = error
+        result['needs_browser'] = error is not None
+        return result
+
+    result['pages'] += 1
+    parsed = parse_page(markup)
+    # Candidates of every page read, so the fallback is ranked over the whole site
+    candidates = scan_markup(markup)
+    email, confident = best_email(candidates, url)
+    result['email'] = email
+    if confident:
+        return result
+
+    js_rendered = looks_js_rendered(markup, parsed)
+
+    for contact_url in rank_contact_links(parsed.links, final_url, CONTACT_KEYWORDS, MAX_CONTACT_PAGES):
+        if contact_url in (url, final_url):
+            continue
+        _, contact_markup, _ = await fetch_page(session, contact_url)
+        if contact_markup is None:
+            continue
+
+        result['pages'] += 1
+        candidates += scan_markup(contact_markup)
+        result['email'], confident = best_email(candidates, url)
+        if confident:
+            return result
+
+    # JS-rendered sites only go to the browser if markup yielded nothing at all
+    result['needs_browser'] = js_rendered and not result['email']
+    return result
+
+
+def open_session(concurrency=DEFAULT_CONCURRENCY):
+    """HTTP session shared by all website scans (must be created inside the event loop)"""
+    timeout = aiohttp.ClientTimeout(total=config.EMAIL_PAGE_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    return aiohttp.ClientSession(headers=HTTP_HEADERS, timeout=timeout, connector=connector)
+
+
+async def enrich_websites_async(websites, concurrency=DEFAULT_CONCURRENCY, on_result=None, metrics=None):
+    """Scan many websites concurrently; returns {website: result}
+
+    on_result(website, result) is called as soon as each website is finished.
+    Each scan is timed as the 'scan_website' stage when metrics is given.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with open_session(concurrency) as session:
+
+        async def bounded_scan(website):
+            async with semaphore:
+                with metrics.stage('scan_website') if metrics else nullcontext():
+                    result = await scan_website(session, website)
+            if on_result:
+                on_result(website, result)
+            return website, result
+
+        results = await asyncio.gather(*(bounded_scan(website) for website in set(websites)))
+
+    return dict(results)
+
+
+def enrich_websites(websites, concurrency=DEFAULT_CONCURRENCY, on_result=None, metrics=None):
+    """Synchronous wrapper around enrich_websites_async"""
+    return asyncio.run(enrich_websites_async(websites, concurrency, on_result, metrics))
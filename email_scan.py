@@ -0,0 +1,185 @@
+import html
+import re
+from urllib.parse import unquote, urljoin, urlparse
+
+from email_cache import canonical_domain, is_platform
+
+# Email regex pattern
+EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+EMAIL_REGEX = re.compile(EMAIL_PATTERN)
+MAILTO_REGEX = re.compile(r'''href\s*=\s*["']?mailto:([^"'\s>]+)''', re.IGNORECASE)
+
+# Matches that are file names or placeholders rather than contact addresses
+IGNORED_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.js', '.css')
+# Whole local parts and domains, so real addresses like vorname@ or ...@email.de are kept
+IGNORED_LOCAL_PARTS = {'your', 'name', 'yourname', 'your.name', 'youremail', 'vorname.nachname',
+                       'firstname.lastname', 'max.mustermann', 'user', 'username'}
+IGNORED_DOMAINS = {'sentry.io', 'wixpress.com', 'sentry-next.wixpress.com'}
+PLACEHOLDER_DOMAIN_LABELS = {'example', 'domain', 'yourdomain', 'beispiel', 'musterfirma', '2x'}
+
+# Keywords for finding contact/about pages (English and German), in the order pages are visited
+CONTACT_KEYWORDS = [
+    'impressum', 'imprint', 'kontakt', 'contact', 'kontaktieren', 'contact us',
+    'über uns', 'ueber uns', 'about us', 'about'
+]
+
+# Free-mail providers: an address there in the page text is usually the business's own,
+# unlike other foreign domains (web agency, hosting provider, footer widgets)
+FREEMAIL_DOMAINS = {
+    'gmail.com', 'googlemail.com', 'web.de', 'gmx.de', 'gmx.net', 'gmx.at', 'gmx.ch', 't-online.de',
+    'freenet.de', 'email.de', 'mail.de', 'posteo.de', 'arcor.de', 'online.de', 'yahoo.com', 'yahoo.de',
+    'hotmail.com', 'hotmail.de', 'outlook.com', 'outlook.de', 'live.com', 'live.de', 'icloud.com',
+    'me.com', 'aol.com', 'aol.de', 'protonmail.com', 'proton.me'
+}
+
+# Shared in-page scanner: mailto targets plus text nodes containing '@'.
+# Reads textContent only (no layout like innerText) and skips scripts and styles.
+SCAN_EMAILS_JS = r"""
+function scanEmails(root) {
+    const pattern = /[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}/g;
+    const found = [];
+    const seen = new Set();
+
+    function add(email, source) {
+        const key = email.toLowerCase();
+        if (!seen.has(key)) {
+            seen.add(key);
+            found.push([email, source]);
+        }
+    }
+
+    if (!root) {
+        return found;
+    }
+
+    for (const link of root.querySelectorAll('a[href^="mailto:" i]')) {
+        let target = link.getAttribute('href').slice(7).split('?')[0];
+        try {
+            target = decodeURIComponent(target);
+        } catch (e) {}
+        for (const email of target.match(pattern) || []) {
+            add(email, 'mailto');
+        }
+    }
+
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT, {
+        acceptNode: node => /^(SCRIPT|STYLE|NOSCRIPT|TEMPLATE)$/.test(node.parentNode.nodeName)
+            ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT
+    });
+    while (walker.nextNode()) {
+        const value = walker.currentNode.nodeValue;
+        if (value.indexOf('@') === -1) {
+            continue;
+        }
+        for (const email of value.match(pattern) || []) {
+            add(email, 'text');
+        }
+    }
+    return found;
+}
+"""
+
+# Emails plus the page's contact-like links, in one round trip
+EMAIL_SCAN_SCRIPT = SCAN_EMAILS_JS + r"""
+const keywords = arguments[0] || [];
+const links = [];
+if (keywords.length) {
+    for (const link of document.links) {
+        const text = (link.textContent || '').trim().toLowerCase().slice(0, 100);
+        const href = link.href || '';
+        if (keywords.some(keyword => text.includes(keyword) || href.toLowerCase().includes(keyword))) {
+            links.push([href, text]);
+        }
+    }
+}
+return {emails: scanEmails(document.body || document.documentElement), links: links};
+"""
+
+
+def is_placeholder(email):
+    """Check whether an address is a placeholder or a tool's address rather than a contact"""
+    local, _, domain = email.lower().rpartition('@')
+    registered = canonical_domain(domain)
+    return (local in IGNORED_LOCAL_PARTS or registered in IGNORED_DOMAINS
+            or registered.split('.')[0] in PLACEHOLDER_DOMAIN_LABELS)
+
+
+def clean_candidates(pairs):
+    """Deduplicate (email, source) pairs and drop file names and placeholders; mailto targets come first"""
+    candidates = []
+    seen = set()
+    for email, source in sorted(pairs, key=lambda pair: pair[1] != 'mailto'):
+        email = email.strip().strip('.')
+        lowered = email.lower()
+        if lowered in seen or lowered.endswith(IGNORED_SUFFIXES) or is_placeholder(lowered):
+            continue
+        seen.add(lowered)
+        candidates.append((email, source))
+    return candidates
+
+
+def scan_markup(markup):
+    """Email candidates from raw HTML: mailto targets, then entity- or percent-encoded addresses in the markup"""
+    pairs = []
+    for target in MAILTO_REGEX.findall(markup):
+        target = unquote(html.unescape(target)).split('?')[0]
+        pairs.extend((email, 'mailto') for email in EMAIL_REGEX.findall(target))
+
+    decoded = html.unescape(markup).replace('%40', '@')
+    pairs.extend((email, 'text') for email in EMAIL_REGEX.findall(decoded))
+    return clean_candidates(pairs)
+
+
+def scan_page(driver, keywords=()):
+    """Email candidates and contact-like links (href, text) of the page open in the driver"""
+    raw = driver.execute_script(EMAIL_SCAN_SCRIPT, list(keywords)) or {}
+    return clean_candidates(raw.get('emails') or []), raw.get('links') or []
+
+
+def best_email(candidates, site_url=None):
+    """Pick the most likely contact address; returns (email, confident)
+
+    mailto targets and addresses on the website's own domain are confident hits. Otherwise a
+    free-mail address (FREEMAIL_DOMAINS) is preferred, then the first other address: a foreign
+    address in the text may be the web agency's, but also the business's own mail domain, so it
+    is kept with low confidence. Addresses of platforms (PLATFORM_DOMAINS, e.g. a menu portal's
+    imprint) are not the business's and are skipped.
+    """
+    candidates = [candidate for candidate in candidates if not is_platform(candidate[0].split('@')[1])]
+    if not candidates:
+        return '', False
+
+    site_domain = canonical_domain(site_url) if site_url else None
+
+    def score(candidate):
+        email, source = candidate
+        same_site = site_domain is not None and canonical_domain(email.split('@')[1]) == site_domain
+        return (source == 'mailto') + 2 * same_site
+
+    best = max(candidates, key=score)  # First in document order among equals
+    if score(best) > 0:
+        return best[0], True
+    for email, _ in candidates:
+        if canonical_domain(email.split('@')[1]) in FREEMAIL_DOMAINS:
+            return email, False
+    return candidates[0][0], False
+
+
+def rank_contact_links(links, base_url, keywords, limit=5):
+    """Same-site links matching keywords, ordered by keyword priority (earlier keywords first)"""
+    base_netloc = urlparse(base_url).netloc
+    ranked = {}
+
+    for href, text in links:
+        if not href or href.startswith(('mailto:', 'tel:', 'javascript:', '#')):
+            continue
+        full_url = urljoin(base_url, href).split('#')[0]
+        if urlparse(full_url).netloc != base_netloc:
+            continue
+
+        text = (text or '').lower()
+        priorities = [i for i, keyword in enumerate(keywords) if keyword in text or keyword in href.lower()]
+        if priorities:
+            ranked[full_url] = min(priorities + [ranked.get(full_url, len(keywords))])
+
+    return sorted(ranked, key=ranked.get)[:limit]
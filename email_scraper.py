@@ -1,30 +1,43 @@
 import csv
+import queue
 import re
+import threading
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from urllib.parse import urljoin, urlparse
+from checkpoint import CheckpointJournal
+from sinks import CsvSink, OrderedSink
+from email_cache import EmailCache, canonical_domain, canonical_url, site_key
+from lean import LeanMode
+from email_scan import CONTACT_KEYWORDS, EMAIL_PATTERN, best_email, rank_contact_links, scan_page
+import config
+from waits import PolitenessBudget
+from metrics import Metrics
+from task_queue import POLL_SECONDS, TaskQueue, worker_name
 
 # Configuration
 CSV_PATH = "berlin_results.csv"  # Change this to your CSV file path
-TIMEOUT = 10  # Timeout in seconds for page loads
+TIMEOUT = config.EMAIL_PAGE_TIMEOUT  # Timeout in seconds for page loads (shared with the HTTP engine)
+MODE = "http"  # "http" (fast, falls back to Chrome for JS sites), "browser" or "queue" (shared with other processes)
+CONCURRENCY = 20  # Maximum number of websites fetched at once in "http" mode
+CHECKPOINT_PATH = "email_checkpoint.db"  # Journal used to resume an interrupted run
+QUEUE_PATH = "email_tasks.db"  # Task queue for MODE "queue"; more workers join with: python cli.py --queue email_tasks.db --email-worker
+CACHE_PATH = "email_cache.db"  # Per-site email cache shared by all runs
+CACHE_TTL_DAYS = 30  # Found emails are trusted this long
+CACHE_NEGATIVE_TTL_DAYS = 7  # "No email found" is re-checked after this long
+CACHE_MAX_ENTRIES = 50000  # Least recently used sites are evicted above this
+LEAN_MODE = True  # Chrome skips images, fonts, media and trackers (only page text is read)
+WORKERS = 4  # Parallel headless browsers for the Chrome pass
+HOST_INTERVAL = 2.0  # Minimum seconds between page loads on the same domain (shared by all workers)
+RENDER_WAIT = 1.5  # Extra wait for client-rendered pages that show nothing right after loading
+BROWSER_ATTEMPTS = 2  # Lookups cut short by a browser crash are tried this often in a new browser
 
-# Keywords for finding contact/about pages (English and German)
-CONTACT_KEYWORDS = [
-    'kontakt', 'contact', 'impressum', 'about', 'über uns', 
-    'ueber uns', 'about us', 'contact us', 'kontaktieren'
-]
-
-# Email regex pattern
-EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-
-def setup_driver():
-    """Initialize Chrome WebDriver with options"""
+def setup_driver(lean=None):
+    """Initialize Chrome WebDriver with options (lean: optional LeanMode to block resources)"""
     chrome_options = Options()
     chrome_options.add_argument('--headless')  # Run in background
     chrome_options.add_argument('--no-sandbox')
@@ -32,9 +45,13 @@ def setup_driver():
     chrome_options.add_argument('--disable-gpu')
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+    if lean:
+        lean.configure_options(chrome_options)
     
     driver = webdriver.Chrome(options=chrome_options)
     driver.set_page_load_timeout(TIMEOUT)
+    if lean:
+        lean.apply(driver)
     return driver
 
 def extract_emails_from_text(text):
@@ -47,88 +64,411 @@ def extract_emails_from_text(text):
     ]
     return list(set(filtered_emails))  # Remove duplicates
 
-def find_contact_links(driver, base_url):
-    """Find links that might lead to contact/about pages"""
-    contact_links = []
+def driver_alive(driver):
+    """Check whether the browser still responds (a crashed one makes every website look empty)"""
     try:
-        links = driver.find_elements(By.TAG_NAME, 'a')
-        for link in links:
-            try:
-                href = link.get_attribute('href')
-                text = link.text.lower()
-                
-                if href and any(keyword in text or keyword in href.lower() for keyword in CONTACT_KEYWORDS):
-                    full_url = urljoin(base_url, href)
-                    if urlparse(full_url).netloc == urlparse(base_url).netloc:
-                        contact_links.append(full_url)
-            except:
-                continue
-    except:
-        pass
+        driver.current_window_handle
+        return True
+    except WebDriverException:
+        return False
+
+def load_and_scan(driver, url, keywords=(), politeness=None):
+    """Load a page (respecting the per-domain interval) and scan it for emails and contact links"""
+    if politeness:
+        politeness.wait(canonical_domain(url))
+    driver.get(url)
     
-    return list(set(contact_links))[:5]  # Limit to 5 most relevant links
+    candidates, links = scan_page(driver, keywords)
+    if not candidates and not links:
+        time.sleep(RENDER_WAIT)  # Client-rendered page: give its scripts a moment
+        candidates, links = scan_page(driver, keywords)
+    return candidates, links
 
-def extract_email_from_website(driver, url):
-    """Extract email from a website by checking homepage and contact pages"""
-    emails = []
-    visited_urls = set()
+def extract_email_from_website(driver, url, politeness=None):
+    """Extract email from a website: homepage first, then contact pages (Impressum first) until a confident hit"""
+    fallback = ""
+    seen = []  # Candidates of every page, so the fallback is ranked over the whole site
     
     try:
         # Visit main page
         print(f"  Visiting: {url}")
-        driver.get(url)
-        time.sleep(2)  # Wait for page to load
-        
-        # Extract emails from homepage
-        page_text = driver.find_element(By.TAG_NAME, 'body').text
-        emails.extend(extract_emails_from_text(page_text))
-        
-        if emails:
-            print(f"  ✓ Found email(s) on homepage: {emails[0]}")
-            return emails[0]
         
-        visited_urls.add(url)
+        # One in-page scan returns the email candidates and the contact links
+        candidates, links = load_and_scan(driver, url, CONTACT_KEYWORDS, politeness)
+        seen.extend(candidates)
+        email, confident = best_email(candidates, url)
+        if confident:
+            print(f"  ✓ Found email on homepage: {email}")
+            return email
+        fallback = email
         
-        # Find and visit contact pages
-        contact_links = find_contact_links(driver, url)
+        visited_urls = {url, driver.current_url}
+        contact_links = rank_contact_links(links, driver.current_url, CONTACT_KEYWORDS)
         print(f"  Found {len(contact_links)} potential contact page(s)")
         
         for contact_url in contact_links:
             if contact_url in visited_urls:
                 continue
+            visited_urls.add(contact_url)
                 
             try:
                 print(f"  Visiting contact page: {contact_url}")
-                driver.get(contact_url)
-                time.sleep(2)
-                
-                page_text = driver.find_element(By.TAG_NAME, 'body').text
-                emails.extend(extract_emails_from_text(page_text))
-                
-                if emails:
-                    print(f"  ✓ Found email(s) on contact page: {emails[0]}")
-                    return emails[0]
-                
-                visited_urls.add(contact_url)
+                candidates, _ = load_and_scan(driver, contact_url, politeness=politeness)
+                seen.extend(candidates)
+                email, confident = best_email(seen, url)
+                if confident:
+                    print(f"  ✓ Found email on contact page: {email}")
+                    return email
+                fallback = email
             except Exception as e:
                 print(f"  Error visiting {contact_url}: {str(e)}")
                 continue
         
+        if fallback:
+            print(f"  ✓ Found email (not on the site's own domain): {fallback}")
+            return fallback
+        
         print("  ✗ No email found")
         return ""
         
     except TimeoutException:
         print(f"  ✗ Timeout loading {url}")
-        return ""
+        return fallback
     except WebDriverException as e:
         print(f"  ✗ Error loading {url}: {str(e)}")
-        return ""
+        return fallback
     except Exception as e:
         print(f"  ✗ Unexpected error: {str(e)}")
-        return ""
+        return fallback
+
+def enrich_rows_browser(rows, driver=None, journal=None, emit=None, cache=None, workers=1, politeness=None,
+                        metrics=None):
+    """Fill in row['email'] by loading each website in headless Chrome (emit(row) is called per finished row)
+
+    workers > 1 runs that many browsers in parallel; politeness (shared by all of them) keeps a
+    minimum interval between page loads on the same domain.
+    """
+    politeness = politeness or PolitenessBudget(HOST_INTERVAL)
+    metrics = metrics or Metrics(prefix='email')
+    
+    # Each site (see site_key) is only loaded once per run
+    rows_by_domain = {}
+    websites = {}
+    for i, row in enumerate(rows, 1):
+        website = row.get('website', '').strip()
+        
+        if not website:
+            print(f"[{i}/{len(rows)}] No website provided, skipping...")
+            row['email'] = ""
+            if emit:
+                emit(row)
+            continue
+        
+        domain = site_key(website)
+        rows_by_domain.setdefault(domain, []).append(row)
+        websites.setdefault(domain, website)
+    
+    def finish_domain(domain, email):
+        for row in rows_by_domain[domain]:
+            row['email'] = email
+            if emit:
+                emit(row)
+    
+    # Resume / cache: domains finished by an earlier run are not loaded again
+    pending = queue.Queue()
+    for domain, website in websites.items():
+        known = journal.get_email(domain) if journal else None
+        if known is None and cache:
+            known = cache.get(domain)
+        if known is not None:
+            finish_domain(domain, known)
+        else:
+            pending.put(domain)
+    
+    total = pending.qsize()
+    counter = iter(range(1, total + 1))
+    counter_lock = threading.Lock()
+    crashes = {}  # domain -> lookups cut short by a browser crash
+    
+    def work(worker_driver, lean, restart=None):
+        """Look up pending domains; restart() replaces a crashed browser (without it the worker stops)"""
+        while True:
+            try:
+                domain = pending.get_nowait()
+            except queue.Empty:
+                return
+            with counter_lock:
+                number = f"{next(counter)}/{total}" if domain not in crashes else "retry"
+            
+            website = websites[domain]
+            print(f"\n[{number}] Processing: {website}")
+            email = ""
+            finished = True
+            try:
+                with metrics.stage('extract_email_from_website'):
+                    email = extract_email_from_website(worker_driver, website, politeness)
+                
+                if not driver_alive(worker_driver):
+                    # The empty result says nothing about the site: look it up again in a new browser
+                    with counter_lock:
+                        crashes[domain] = crashes.get(domain, 0) + 1
+                        finished = crashes[domain] >= BROWSER_ATTEMPTS
+                    if not finished:
+                        pending.put(domain)
+                    if restart is None:
+                        return
+                    print("  Browser crashed, starting a new one...")
+                    worker_driver = restart()
+                    continue
+                
+                if lean:
+                    report = lean.page_report(worker_driver)
+                    if report:
+                        print(f"  Network ({domain}): {lean.format(report)}")
+                
+                if journal:
+                    journal.record_email(domain, email)
+                if cache:
+                    cache.put(domain, email)
+            finally:
+                # Always emitted, otherwise the ordered output would stall at this row
+                if finished:
+                    finish_domain(domain, email)
+    
+    def run_worker(worker_id):
+        lean = LeanMode() if LEAN_MODE else None
+        drivers = []
+        
+        def close():
+            for worker_driver in drivers:
+                try:
+                    worker_driver.quit()
+                except Exception:
+                    pass  # Already gone with its crashed browser
+            drivers.clear()
+        
+        def restart():
+            close()
+            drivers.append(setup_driver(lean=lean))
+            return drivers[0]
+        
+        try:
+            work(restart(), lean, restart)
+        except Exception as e:
+            print(f"Worker {worker_id} stopped: {str(e)}")
+        finally:
+            close()
+            if lean:
+                print(f"Worker {worker_id}: {lean.summary()}")
+    
+    if not total:
+        return
+    
+    if driver is not None:
+        # Caller-provided browser: single worker
+        work(driver, None)
+    else:
+        workers = max(1, min(workers, total))
+        print(f"Setting up {workers} Chrome WebDriver(s) for {total} website(s)...")
+        threads = [threading.Thread(target=run_worker, args=(worker_id,), name=f'email-worker-{worker_id}')
+                   for worker_id in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print("\n\nBrowsers closed.")
+    
+    # Domains left over by crashed workers are written without an email (and not cached)
+    while not pending.empty():
+        finish_domain(pending.get_nowait(), "")
+
+def enrich_rows_http(rows, concurrency=20, journal=None, emit=None, cache=None, workers=1, metrics=None):
+    """Fill in row['email'] over plain HTTP, using Chrome only for JS-rendered sites"""
+    from email_enricher import enrich_websites
+    
+    # Deduplicate: one crawl per site (see site_key), starting from its first (cleaned) URL
+    rows_by_domain = {}
+    start_urls = {}
+    for row in rows:
+        website = row.get('website', '').strip()
+        if website:
+            domain = site_key(website)
+            rows_by_domain.setdefault(domain, []).append(row)
+            start_urls.setdefault(domain, canonical_url(website))
+        else:
+            row['email'] = ""
+            if emit:
+                emit(row)
+    domain_of_url = {url: domain for domain, url in start_urls.items()}
+    
+    browser_rows = []
+    
+    def finish_domain(domain, result, record=True):
+        # A site that looks JS-rendered (or could not be fetched) is only finished after the Chrome retry;
+        # a failed fetch is never recorded as "no email"
+        needs_browser = not result['email'] and result['needs_browser']
+        if record and not needs_browser:
+            if journal:
+                journal.record_email(domain, result['email'])
+            if cache:
+                cache.put(domain, result['email'])
+        for row in rows_by_domain[domain]:
+            row['email'] = result['email']
+            if needs_browser:
+                browser_rows.append(row)
+            elif emit:
+                emit(row)
+    
+    # Resume / cache: domains finished by an earlier run are not fetched again
+    pending = []
+    for domain, url in start_urls.items():
+        known = journal.get_email(domain) if journal else None
+        if known is None and cache:
+            known = cache.get(domain)
+        if known is not None:
+            finish_domain(domain, {'email': known, 'needs_browser': False}, record=False)
+        else:
+            pending.append(url)
+    
+    print(f"{len(rows)} rows, {len(start_urls)} unique domains, {len(start_urls) - len(pending)} already known")
+    print(f"Fetching {len(pending)} websites over HTTP (concurrency {concurrency})...")
+    started = time.time()
+    enrich_websites(pending, concurrency=concurrency,
+                    on_result=lambda url, result: finish_domain(domain_of_url[url], result), metrics=metrics)
+    print(f"HTTP pass finished in {time.time() - started:.1f}s")
+    
+    # Fall back to Selenium only for sites that need JavaScript
+    if browser_rows:
+        print(f"\n{len(browser_rows)} website(s) look JS-rendered, retrying in Chrome...")
+        enrich_rows_browser(browser_rows, journal=journal, emit=emit, cache=cache, workers=workers, metrics=metrics)
+
+def work_email_queue(task_queue, concurrency=20, politeness=None, metrics=None, until=None):
+    """Claim website tasks ('email') from a shared TaskQueue and look up their emails until none are left
+
+    Each batch is fetched over HTTP; sites that look JS-rendered are retried in a headless Chrome.
+    until() is checked between batches and can stop the loop early. Results expire like cache
+    entries, so a later run looks the website up again once its email is no longer trusted.
+    """
+    from email_enricher import enrich_websites
+    
+    politeness = politeness or PolitenessBudget(HOST_INTERVAL)
+    metrics = metrics or Metrics(prefix='email')
+    name = worker_name()
+    ttl, negative_ttl = CACHE_TTL_DAYS * 86400, CACHE_NEGATIVE_TTL_DAYS * 86400
+    lean = None
+    driver = None
+    
+    try:
+        while not (until and until()):
+            tasks = task_queue.claim_batch('email', name, limit=concurrency)
+            if not tasks:
+                if task_queue.is_drained('email'):
+                    break
+                # Websites leased by other workers come back if their lease expires
+                time.sleep(POLL_SECONDS)
+                continue
+            
+            print(f"Claimed {len(tasks)} website(s) from {task_queue.path}")
+            with task_queue.keep_alive(tasks):
+                try:
+                    results = enrich_websites([task['payload']['url'] for task in tasks], concurrency=concurrency,
+                                              metrics=metrics)
+                except Exception as e:
+                    print(f"  ✗ HTTP batch failed: {str(e)}")
+                    for task in tasks:
+                        task_queue.fail(task, e, expire_after=negative_ttl)
+                    continue
+                
+                for task in tasks:
+                    url = task['payload']['url']
+                    email = results[url]['email']
+                    try:
+                        if not email and results[url]['needs_browser']:
+                            if driver is None:
+                                lean = LeanMode() if LEAN_MODE else None
+                                driver = setup_driver(lean=lean)
+                            with metrics.stage('extract_email_from_website'):
+                                email = extract_email_from_website(driver, url, politeness)
+                            if not driver_alive(driver):
+                                # Not a negative result: the task is retried, the next site gets a new browser
+                                crashed, driver = driver, None
+                                try:
+                                    crashed.quit()
+                                except Exception:
+                                    pass
+                                raise WebDriverException("browser crashed")
+                    except Exception as e:
+                        print(f"  ✗ Browser retry failed for {url}: {str(e)}")
+                        task_queue.fail(task, e, expire_after=negative_ttl)
+                        continue
+                    if not email and results[url].get('error'):
+                        # The site did not answer: retried later instead of stored as "no email"
+                        task_queue.fail(task, results[url]['error'], expire_after=negative_ttl)
+                        continue
+                    task_queue.complete(task, {'email': email}, expire_after=ttl if email else negative_ttl)
+    finally:
+        if driver:
+            driver.quit()
+            if lean:
+                print(f"Queue worker: {lean.summary()}")
+    print(f"Email queue {task_queue.path}: {task_queue.stats('email')}")
+
+def enrich_rows_queue(rows, task_queue, concurrency=20, emit=None, cache=None, metrics=None):
+    """Fill in row['email'] through a shared TaskQueue
+
+    Each domain becomes one task; this process works on the queue together with any other
+    email worker and fills in the rows as their domains are finished, by whichever worker.
+    """
+    rows_by_domain = {}
+    start_urls = {}
+    for row in rows:
+        website = row.get('website', '').strip()
+        if website:
+            domain = site_key(website)
+            rows_by_domain.setdefault(domain, []).append(row)
+            start_urls.setdefault(domain, canonical_url(website))
+        else:
+            row['email'] = ""
+            if emit:
+                emit(row)
+    
+    def finish_domain(domain, email):
+        for row in rows_by_domain[domain]:
+            row['email'] = email
+            if emit:
+                emit(row)
+    
+    waiting = set()
+    for domain in start_urls:
+        known = cache.get(domain) if cache else None
+        if known is not None:
+            finish_domain(domain, known)
+        else:
+            waiting.add(domain)
+    
+    added = task_queue.add('email', ((domain, {'url': start_urls[domain]}) for domain in sorted(waiting)))
+    print(f"{len(rows)} rows, {len(start_urls)} unique domains, {len(waiting)} queued ({added} new)")
+    
+    def collect():
+        # Domains finished by any worker (failed ones get no email)
+        for domain, result in task_queue.finished('email', waiting).items():
+            email = (result or {}).get('email', '')
+            if cache and result is not None:
+                cache.put(domain, email)
+            finish_domain(domain, email)
+            waiting.discard(domain)
+        return not waiting
+    
+    work_email_queue(task_queue, concurrency=concurrency, metrics=metrics, until=collect)
+    collect()
+
+def process_csv(csv_path, mode='http', concurrency=20, journal=None, cache=None, workers=1, progress=None,
+                metrics=None, task_queue=None):
+    """Process CSV file and extract emails from websites (progress(row) is called per finished row)
 
-def process_csv(csv_path):
-    """Process CSV file and extract emails from websites"""
+    mode 'queue' hands the websites to task_queue, so other processes can help with the lookups.
+    """
+    metrics = metrics or Metrics(prefix='email')
     # Read CSV
     rows = []
     with open(csv_path, 'r', encoding='utf-8') as f:
@@ -140,61 +480,79 @@ def process_csv(csv_path):
     if 'email' not in fieldnames:
         fieldnames = list(fieldnames) + ['email']
     
-    # Setup Selenium driver
-    print("Setting up Chrome WebDriver...")
-    driver = setup_driver()
+    # Rows are written as soon as they are finished, in input order
+    output_path = csv_path.replace('.csv', '_with_emails.csv')
+    sink = CsvSink(output_path, fieldnames=fieldnames, encoding='utf-8')
+    ordered = OrderedSink(sink)
+    row_index = {id(row): i for i, row in enumerate(rows)}
     
-    try:
-        # Process each row
-        for i, row in enumerate(rows, 1):
-            website = row.get('website', '').strip()
-            
-            if not website:
-                print(f"\n[{i}/{len(rows)}] No website provided, skipping...")
-                row['email'] = ""
-                continue
-            
-            print(f"\n[{i}/{len(rows)}] Processing: {website}")
-            
-            # Extract email
-            email = extract_email_from_website(driver, website)
-            row['email'] = email
-            
-            # Small delay between requests
-            time.sleep(1)
+    def emit(row):
+        # Called from several browser workers; OrderedSink restores the input order
+        ordered.write_at(row_index[id(row)], row)
+        if row.get('website', '').strip():
+            metrics.record_fields(row, fields=('email',))
+        if progress:
+            progress(row)
     
+    started = time.time()
+    try:
+        # 'http' fetches pages directly, 'browser' loads every page in Chrome
+        if mode == 'http':
+            enrich_rows_http(rows, concurrency=concurrency, journal=journal, emit=emit, cache=cache, workers=workers,
+                             metrics=metrics)
+        elif mode == 'queue':
+            # The queue records finished domains, so it also takes the journal's place
+            enrich_rows_queue(rows, task_queue, concurrency=concurrency, emit=emit, cache=cache, metrics=metrics)
+        else:
+            enrich_rows_browser(rows, journal=journal, emit=emit, cache=cache, workers=workers, metrics=metrics)
     finally:
-        driver.quit()
-        print("\n\nBrowser closed.")
-    
-    # Write results back to CSV
-    output_path = csv_path.replace('.csv', '_with_emails.csv')
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)  # Uses comma by default
-        writer.writeheader()
-        writer.writerows(rows)
+        sink.close()
+    emails_found = sum(1 for row in rows if row.get('email'))
     
     print(f"\n✓ Results saved to: {output_path}")
     
     # Print summary
-    emails_found = sum(1 for row in rows if row.get('email'))
     print(f"\nSummary:")
     print(f"  Total websites: {len(rows)}")
     print(f"  Emails found: {emails_found}")
     print(f"  Emails not found: {len(rows) - emails_found}")
+    print(f"  Time: {time.time() - started:.1f}s ({workers} browser worker(s))")
+    if cache:
+        print(f"  Email cache: {cache.stats()}")
+    print(f"  {metrics.summary()}")
+    
+    # Run report and Prometheus text file next to the output
+    report_path, prometheus_path = metrics.export(output_path.replace('.csv', '_metrics'))
+    print(f"  Metrics: {report_path}, {prometheus_path}")
 
 if __name__ == "__main__":
     print("=" * 60)
     print("Website Email Extractor")
     print("=" * 60)
     
+    journal = CheckpointJournal(CHECKPOINT_PATH)
+    cache = EmailCache(CACHE_PATH, ttl_days=CACHE_TTL_DAYS, negative_ttl_days=CACHE_NEGATIVE_TTL_DAYS,
+                       max_entries=CACHE_MAX_ENTRIES)
+    task_queue = TaskQueue(QUEUE_PATH) if MODE == "queue" else None
+    
     try:
-        process_csv(CSV_PATH)
+        process_csv(CSV_PATH, mode=MODE, concurrency=CONCURRENCY, journal=journal, cache=cache, workers=WORKERS,
+                    task_queue=task_queue)
+        
+        # Output is written, the next run starts from scratch
+        journal.reset()
+        journal = None
     except FileNotFoundError:
         print(f"\n✗ Error: CSV file not found at '{CSV_PATH}'")
         print("  Please update the CSV_PATH variable with the correct path.")
     except Exception as e:
         print(f"\n✗ Error: {str(e)}")
+    finally:
+        if journal:
+            journal.close()
+        if task_queue:
+            task_queue.close()
+        cache.close()
     
     print("\n" + "=" * 60)
     print("Done!")
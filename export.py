@@ -0,0 +1,140 @@
+import logging
+import os
+
+import pandas as pd
+
+import config
+from normalize import SCHEMA, normalize_records
+from sinks import csv_to_excel
+
+# Directory (inside OUTPUT_DIR) and file options per columnar format
+COLUMNAR_FORMATS = {
+    'parquet': {'directory': 'results.parquet', 'format': 'parquet', 'extension': 'parquet'},
+    'arrow': {'directory': 'results.arrow', 'format': 'ipc', 'extension': 'arrow'}
+}
+
+# Hive-style partitions: results.parquet/city=Berlin/run_date=2025-11-18/part-....parquet
+PARTITION_COLUMNS = ['city', 'run_date']
+
+# Partition of records without a city (a null partition key cannot be read back)
+UNKNOWN_CITY = 'unknown'
+
+
+def output_path(filename, output_dir=None):
+    """Path of an output file inside OUTPUT_DIR (created on first use)"""
+    output_dir = output_dir or config.OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, filename)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError:
+        raise ImportError("Columnar output requires pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.dataset
+
+
+def partition_schema():
+    """Partition keys: city (dictionary-encoded) and run_date (date)"""
+    pa, _ = _require_pyarrow()
+    return pa.schema([('city', pa.dictionary(pa.int32(), pa.string())), ('run_date', pa.date32())])
+
+
+def to_arrow_table(df, run_date):
+    """Normalized records as an Arrow table: dictionary-encoded city/category, typed timestamps, run_date column
+
+    Records without a city go to the UNKNOWN_CITY partition.
+    """
+    pa, _ = _require_pyarrow()
+    city = df['city'].astype('string').fillna(UNKNOWN_CITY).replace('', UNKNOWN_CITY).astype('category')
+    df = df.assign(city=city, run_date=pd.Timestamp(run_date).date())
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    fields = []
+    for field in table.schema:
+        if field.name in ('city', 'category'):
+            field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+        elif field.name == 'scraped_at':
+            field = field.with_type(pa.timestamp('ms'))
+        elif field.name == 'run_date':
+            field = field.with_type(pa.date32())
+        elif pa.types.is_large_string(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return table.cast(pa.schema(fields))
+
+
+def write_columnar(df, run_started, fmt='parquet', output_dir=None, compression='zstd'):
+    """Write normalized records as a dataset partitioned by city and run date; returns the dataset directory
+
+    Each run adds its own part files, so earlier runs of the same day are kept.
+    """
+    pa, ds = _require_pyarrow()
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format: {fmt} (use {', '.join(COLUMNAR_FORMATS)})")
+    spec = COLUMNAR_FORMATS[fmt]
+
+    table = to_arrow_table(df, run_started)
+    file_format = ds.ParquetFileFormat() if spec['format'] == 'parquet' else ds.IpcFileFormat()
+    if spec['format'] == 'parquet':
+        file_options = file_format.make_write_options(compression=compression)
+    else:
+        file_options = file_format.make_write_options(compression=pa.Codec(compression))
+
+    root = output_path(spec['directory'], output_dir)
+    ds.write_dataset(
+        table, root, format=file_format, file_options=file_options,
+        partitioning=ds.partitioning(partition_schema(), flavor='hive'),
+        basename_template=f"part-{run_started.strftime('%Y%m%d_%H%M%S')}-{{i}}.{spec['extension']}",
+        existing_data_behavior='overwrite_or_ignore'
+    )
+    logging.info(f"Saved {table.num_rows} records to {root} ({fmt}, partitioned by {' / '.join(PARTITION_COLUMNS)})")
+    return root
+
+
+def load_columnar(fmt='parquet', output_dir=None, **equals):
+    """Read the columnar dataset back as a DataFrame, e.g. load_columnar(city='Berlin')
+
+    Only the partitions matching equals are read.
+    """
+    _, ds = _require_pyarrow()
+    spec = COLUMNAR_FORMATS[fmt]
+    dataset = ds.dataset(os.path.join(output_dir or config.OUTPUT_DIR, spec['directory']), format=spec['format'],
+                         partitioning=ds.HivePartitioning.discover(infer_dictionary=True, schema=partition_schema()))
+
+    condition = None
+    for column, value in equals.items():
+        term = ds.field(column) == (pd.Timestamp(value).date() if column == 'run_date' else value)
+        condition = term if condition is None else condition & term
+    df = dataset.to_table(filter=condition).to_pandas()
+    return df.astype({column: dtype for column, dtype in SCHEMA.items() if column in df and column != 'scraped_at'})
+
+
+def export_results(csv_path, run_started, normalized=None):
+    """Write the output formats selected in config (SAVE_EXCEL, COLUMNAR_FORMAT, SAVE_CSV) from the combined CSV
+
+    normalized is the already normalized DataFrame of the same file, if there is one.
+    """
+    exported = False
+    if config.SAVE_EXCEL:
+        csv_to_excel(csv_path, os.path.splitext(csv_path)[0] + '.xlsx')
+        exported = True
+
+    if config.COLUMNAR_FORMAT:
+        if normalized is None:
+            normalized = normalize_records(pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str, keep_default_na=False))
+        if normalized.empty:
+            logging.warning("No data to save")
+        else:
+            write_columnar(normalized, run_started, config.COLUMNAR_FORMAT, compression=config.COLUMNAR_COMPRESSION)
+            exported = True
+
+    # The CSV is always streamed (it is what an interrupted run leaves behind); drop it if not wanted,
+    # unless no other format was written and it is the only copy of the results
+    if not config.SAVE_CSV:
+        if exported:
+            os.remove(csv_path)
+        else:
+            logging.warning(f"SAVE_CSV is off but no other output format was written, keeping {csv_path}")
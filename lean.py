@@ -0,0 +1,111 @@
+import json
+import logging
+from fnmatch import fnmatchcase
+
+# URL patterns (Network.setBlockedURLs wildcard syntax) per blockable resource type
+RESOURCE_PATTERNS = {
+    'Image': [
+        '*.png', '*.png?*', '*.jpg', '*.jpg?*', '*.jpeg', '*.jpeg?*', '*.gif', '*.gif?*',
+        '*.webp', '*.webp?*', '*.ico', '*.avif', '*.bmp',
+        '*googleusercontent.com/p/*',  # Place photos
+        '*streetviewpixels*', '*/maps/vt?*', '*/maps/vt/*', '*khms*.google.com*'  # Street View and map tiles
+    ],
+    'Font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*fonts.gstatic.com*'],
+    'Media': ['*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav', '*.m3u8', '*youtube.com/embed*'],
+    'Stylesheet': ['*.css', '*.css?*', '*fonts.googleapis.com*'],
+    'Tracker': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+        '*connect.facebook.net*', '*hotjar.com*', '*clarity.ms*', '*/gen_204*'
+    ]
+}
+
+# Stylesheets are kept by default: they are small and hiding rules affect element.text
+DEFAULT_BLOCK_TYPES = ('Image', 'Font', 'Media', 'Tracker')
+
+# Rough transfer size of a blocked request, used to estimate the bytes saved (Chrome never sees the real size)
+ESTIMATED_BYTES = {
+    'Image': 25000,
+    'Font': 35000,
+    'Media': 400000,
+    'Stylesheet': 15000,
+    'Script': 40000,
+    'Other': 5000
+}
+
+
+class LeanMode:
+    """Blocks resources the scrapers never read (images, fonts, media, trackers) via DevTools
+
+    allow entries (resource types or URL patterns) take precedence over block_types and deny.
+    """
+
+    def __init__(self, block_types=DEFAULT_BLOCK_TYPES, deny=(), allow=()):
+        self.block_types = [t for t in block_types if t not in allow]
+        self.deny = list(deny)
+        self.allow = list(allow)
+        self.totals = {'pages': 0, 'requests': 0, 'bytes': 0, 'blocked': 0, 'saved_bytes': 0}
+
+    def blocked_patterns(self):
+        """Final list of URL patterns handed to Chrome"""
+        patterns = []
+        for resource_type in self.block_types:
+            patterns.extend(RESOURCE_PATTERNS.get(resource_type, []))
+        patterns.extend(self.deny)
+
+        # An allowed pattern removes every blocked pattern it covers
+        allowed = [entry for entry in self.allow if entry not in RESOURCE_PATTERNS]
+        return [pattern for pattern in dict.fromkeys(patterns)
+                if not any(fnmatchcase(pattern, entry) for entry in allowed)]
+
+    def configure_options(self, options):
+        """Chrome options: no image decoding and a performance log for the savings report"""
+        if 'Image' in self.block_types:
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def apply(self, driver):
+        """Install the URL block list on a running driver (needed again after every restart)"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_patterns()})
+
+    def page_report(self, driver):
+        """Requests, bytes transferred and blocked requests since the last report"""
+        try:
+            entries = driver.get_log('performance')
+        except Exception as e:
+            logging.debug(f"Performance log unavailable: {e}")
+            return None
+
+        types = {}
+        report = {'requests': 0, 'bytes': 0, 'blocked': 0, 'saved_bytes': 0}
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Network.requestWillBeSent':
+                types[params.get('requestId')] = params.get('type', 'Other')
+                report['requests'] += 1
+            elif method == 'Network.loadingFinished':
+                report['bytes'] += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason') == 'inspector':
+                resource_type = params.get('type') or types.get(params.get('requestId'), 'Other')
+                report['blocked'] += 1
+                report['saved_bytes'] += ESTIMATED_BYTES.get(resource_type, ESTIMATED_BYTES['Other'])
+
+        self.totals['pages'] += 1
+        for key, value in report.items():
+            self.totals[key] += value
+        return report
+
+    @staticmethod
+    def format(report):
+        return (f"{report['requests']} requests, {report['bytes'] / 1024:.0f} KB transferred, "
+                f"{report['blocked']} blocked (~{report['saved_bytes'] / 1024:.0f} KB saved)")
+
+    def summary(self):
+        share = self.totals['saved_bytes'] / max(self.totals['saved_bytes'] + self.totals['bytes'], 1)
+        return f"Lean mode over {self.totals['pages']} pages: {self.format(self.totals)}, ~{share:.0%} of traffic"
@@ -0,0 +1,19 @@
+import logging
+
+import config
+
+
+def configure_logging():
+    """Log to config.LOG_FILE and the console at config.LOG_LEVEL
+
+    Every entry point (cli.py, scraper.py, main_scraper_proxy.py) calls this; only the first
+    call configures logging, so the log file gets its handler whichever module comes first.
+    """
+    logging.basicConfig(
+        level=config.LOG_LEVEL,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(config.LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
\ No newline at end of file
@@ -0,0 +1,273 @@
+import re
+
+from email_scan import SCAN_EMAILS_JS, best_email, clean_candidates
+
+# Injected scripts that read the Google Maps DOM in a single WebDriver round trip.
+# Selectors mirror the ones used by GoogleMapsScraper.extract_place_data.
+
+
+class DetailPanelTimeout(Exception):
+    """The detail panel still showed the previous place when the wait ran out"""
+
+
+PLACE_DETAILS_SCRIPT = SCAN_EMAILS_JS + r"""
+const timeoutMs = arguments[0];
+const previousName = arguments[1];
+const previousUrl = arguments[2];
+const expectedName = arguments[3];
+const done = arguments[arguments.length - 1];
+const started = Date.now();
+
+function attr(selector, name) {
+    const el = document.querySelector(selector);
+    return el ? el.getAttribute(name) : null;
+}
+
+function text(selector) {
+    const el = document.querySelector(selector);
+    return el ? el.innerText : null;
+}
+
+function collect() {
+    return {
+        name: text('h1.DUwDvf'),
+        address: attr("button[data-item-id='address']", 'aria-label'),
+        phone: attr("button[data-item-id^='phone:tel:']", 'aria-label'),
+        website: (document.querySelector("a[data-item-id='authority']") || {}).href || null,
+        rating: text("div.F7nice span[aria-hidden='true']"),
+        reviews: attr("div.F7nice span[aria-label*='reviews']", 'aria-label'),
+        emails: scanEmails(document.body)
+    };
+}
+
+function ready() {
+    // Same readiness condition as the WebDriverWait on h1.DUwDvf, plus (optionally) the panel
+    // title differing from the previously opened place. Maps changes the URL before it swaps the
+    // panel, so a changed URL alone is not enough: only when the clicked place has the previous
+    // title too, a new title node (the old one carries data-scraper-seen) or URL tells them apart.
+    const title = document.querySelector('h1.DUwDvf');
+    if (!title || !title.innerText) {
+        return false;
+    }
+    if (previousName === null || title.innerText.trim() !== previousName.trim()) {
+        return true;
+    }
+    return (expectedName === null || expectedName.trim() === previousName.trim())
+        && (!title.hasAttribute('data-scraper-seen') || window.location.href !== previousUrl);
+}
+
+(function poll() {
+    if (ready()) {
+        done(collect());
+    } else if (Date.now() - started > timeoutMs) {
+        done({timedOut: true});
+    } else {
+        setTimeout(poll, 100);
+    }
+})();
+"""
+
+
+def parse_place_details(raw):
+    """Turn the raw PLACE_DETAILS_SCRIPT result into extract_place_data fields"""
+    raw = raw or {}
+    data = {
+        'name': raw.get('name') or None,
+        'address': None,
+        'phone': None,
+        'website': raw.get('website') or None,
+        'email': best_email(clean_candidates(raw.get('emails') or []))[0] or None,
+        'rating': None,
+        'reviews_count': None
+    }
+
+    if raw.get('address'):
+        data['address'] = raw['address'].replace('Address: ', '')
+    if raw.get('phone'):
+        data['phone'] = raw['phone'].replace('Phone: ', '')
+
+    if raw.get('rating') is not None:
+        data['rating'] = raw['rating']
+        if raw.get('reviews'):
+            reviews_match = re.search(r'([\d,]+)', raw['reviews'])
+            if reviews_match:
+                data['reviews_count'] = reviews_match.group(1)
+
+    return data
+
+
+def read_place_details(driver, timeout=10, previous=None, expected_name=None):
+    """Collect all detail panel fields with one injected script evaluation
+
+    previous is the (title, URL) of the panel open before the click (see ReadinessWaiter.detail_state)
+    and expected_name the clicked card's name; the fields are read once the panel shows another
+    place. Returns None if it still showed the previous one after timeout seconds.
+    """
+    previous_name, previous_url = previous or (None, None)
+    raw = driver.execute_async_script(PLACE_DETAILS_SCRIPT, int(timeout * 1000), previous_name, previous_url,
+                                      expected_name)
+    if raw and raw.get('timedOut'):
+        return None
+    return parse_place_details(raw)
+
+
+FEED_CARDS_SCRIPT = r"""
+const cards = [];
+document.querySelectorAll("div[role='feed'] > div > div > a").forEach(function (anchor) {
+    const card = anchor.parentElement;
+    const pick = function (selector) {
+        const el = card.querySelector(selector);
+        return el ? el.innerText.trim() : null;
+    };
+    const website = card.querySelector("a[data-value='Website'], a[aria-label*='Website']");
+
+    // Info rows look like "Italienisch · € · Gubener Str. 48"
+    const rows = Array.from(card.querySelectorAll('.W4Efsd'))
+        .map(function (el) { return el.innerText.trim(); })
+        .filter(function (row) { return row.indexOf('·') !== -1; });
+
+    cards.push({
+        element: anchor,
+        href: anchor.href || null,
+        name: anchor.getAttribute('aria-label') || pick('.qBF1Pd'),
+        rating: pick('span.MW4etd'),
+        reviews: pick('span.UY7F9'),
+        phone: pick('span.UsdlK'),
+        website: website ? website.href : null,
+        info_rows: rows
+    });
+});
+return cards;
+"""
+
+
+# Opening-hours rows ("Geöffnet · Schließt um 22:00") are not address rows
+OPENING_HOURS_PATTERN = re.compile(
+    r'\b(Geöffnet|Geschlossen|Öffnet|Schließt|Open|Closed|Opens|Closes)\b|\d{1,2}:\d{2}', re.IGNORECASE
+)
+
+
+def parse_feed_card(raw):
+    """Turn one FEED_CARDS_SCRIPT card into (extract_place_data fields, Maps category)"""
+    data = {
+        'name': raw.get('name') or None,
+        'address': None,
+        'phone': raw.get('phone') or None,
+        'website': raw.get('website') or None,
+        'email': None,
+        'rating': raw.get('rating') or None,
+        'reviews_count': None
+    }
+
+    if raw.get('reviews'):
+        reviews_match = re.search(r'([\d.,]+)', raw['reviews'])
+        if reviews_match:
+            data['reviews_count'] = reviews_match.group(1)
+
+    # Card category and street address live in the "·"-separated info rows
+    category = None
+    for row in raw.get('info_rows') or []:
+        parts = [part.strip() for part in row.split('·') if part.strip()]
+        if not parts or OPENING_HOURS_PATTERN.search(row):
+            continue
+        if category is None and not re.match(r'^[\d,.]+', parts[0]):
+            category = parts[0]
+        if data['address'] is None and re.search(r'\d', parts[-1]) and len(parts) > 1:
+            data['address'] = parts[-1]
+
+    return data, category
+
+
+def harvest_feed_cards(driver):
+    """Snapshot every result card in the feed with one script evaluation"""
+    cards = []
+    for raw in driver.execute_script(FEED_CARDS_SCRIPT) or []:
+        data, category = parse_feed_card(raw)
+        cards.append({
+            'element': raw.get('element'),
+            'href': raw.get('href'),
+            'place_category': category,
+            'data': data
+        })
+    return cards
+
+
+FEED_SCROLL_SCRIPT = r"""
+const feed = arguments[0];
+const target = arguments[1];
+const maxScrolls = arguments[2];
+const stallMs = arguments[3];
+const minIntervalMs = arguments[4];
+const timeoutMs = arguments[5];
+const done = arguments[arguments.length - 1];
+const started = Date.now();
+let scrolls = 0;
+let lastScroll = 0;
+let stallTimer = null;
+let checkTimer = null;
+let finished = false;
+
+function uniqueCount() {
+    const hrefs = new Set();
+    feed.querySelectorAll(':scope > div > div > a').forEach(function (a) {
+        if (a.href) { hrefs.add(a.href); }
+    });
+    return hrefs.size;
+}
+
+function atEnd() {
+    // "You've reached the end of the list." / "Sie haben das Ende der Liste erreicht."
+    if (feed.querySelector('span.HlvSq')) { return true; }
+    const last = feed.lastElementChild;
+    return !!last && /end of the list|Ende der Liste/i.test(last.innerText || '');
+}
+
+function finish(reason) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(stallTimer);
+    clearTimeout(checkTimer);
+    done({count: uniqueCount(), scrolls: scrolls, reason: reason});
+}
+
+function check() {
+    if (target && uniqueCount() >= target) { return finish('target'); }
+    if (atEnd()) { return finish('end'); }
+    if (scrolls >= maxScrolls) { return finish('max_scrolls'); }
+    if (Date.now() - started > timeoutMs) { return finish('timeout'); }
+
+    scrolls += 1;
+    lastScroll = Date.now();
+    feed.scrollTop = feed.scrollHeight;
+    clearTimeout(stallTimer);
+    stallTimer = setTimeout(function () { finish('stalled'); }, stallMs);
+}
+
+// Every batch of new cards triggers the next check (debounced, and no faster than minIntervalMs)
+const observer = new MutationObserver(function () {
+    clearTimeout(stallTimer);
+    clearTimeout(checkTimer);
+    checkTimer = setTimeout(check, Math.max(50, minIntervalMs - (Date.now() - lastScroll)));
+});
+observer.observe(feed, {childList: true, subtree: true});
+check();
+"""
+
+
+def scroll_feed(driver, container, target_count=None, max_scrolls=25, stall_timeout=5,
+                min_interval=0.5, timeout=25):
+    """Scroll the results feed until target_count unique places are loaded or the list ends
+
+    Returns {'count': unique places loaded, 'scrolls': scrolls made, 'reason': why it stopped}.
+    """
+    # The whole loop runs in the page, so allow the script to outlive the default timeout
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(timeout + 5)
+    try:
+        return driver.execute_async_script(
+            FEED_SCROLL_SCRIPT, container, target_count or 0, max_scrolls,
+            int(stall_timeout * 1000), int(min_interval * 1000), int(timeout * 1000)
+        )
+    finally:
+        driver.set_script_timeout(previous_timeout)
@@ -0,0 +1,219 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Histogram bucket bounds in seconds (Prometheus-style upper bounds, +Inf is implicit)
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Record fields whose extraction success rate is reported
+RECORD_FIELDS = ('name', 'address', 'phone', 'website', 'email', 'rating', 'reviews_count')
+
+
+def label_string(labels):
+    """(('stage', 'search'),) -> '{stage="search"}' (Prometheus label syntax)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+class Histogram:
+    """Bucketed observations plus a window of recent values for percentiles"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=2048):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+        index = bisect_left(self.buckets, value)
+        if index < len(self.bucket_counts):
+            self.bucket_counts[index] += 1
+
+    def percentile(self, p):
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    def report(self):
+        return {
+            'count': self.count,
+            'total_s': round(self.sum, 3),
+            'mean_s': round(self.sum / self.count, 3) if self.count else None,
+            'p50_s': round(self.percentile(50), 3) if self.count else None,
+            'p95_s': round(self.percentile(95), 3) if self.count else None,
+            'max_s': round(self.max, 3)
+        }
+
+
+class Metrics:
+    """Counters, histograms and per-stage timings for one run (thread-safe, shareable between workers)
+
+    Stages are timed with `with metrics.stage('search_location'):` or the @timed decorator;
+    report() gives a JSON-friendly run report, prometheus() the text exposition format.
+    """
+
+    def __init__(self, prefix='scraper'):
+        self.prefix = prefix
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> Histogram
+        self.fields = {}  # Fields passed to record_fields, in first-seen order
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block as one call of stage name; exceptions are counted and re-raised"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc('stage_errors_total', stage=name)
+            raise
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - started, stage=name)
+
+    def record_fields(self, record, fields=RECORD_FIELDS):
+        """Count which fields of a scraped record were filled"""
+        with self.lock:
+            for field in fields:
+                self.fields.setdefault(field, None)
+        self.inc('records_total')
+        for field in fields:
+            if record.get(field):
+                self.inc('field_present_total', field=field)
+
+    def field_success(self):
+        """field -> share of records in which it was extracted"""
+        with self.lock:
+            records = self.counters.get(('records_total', ()), 0)
+            present = {dict(labels)['field']: value for (name, labels), value in self.counters.items()
+                       if name == 'field_present_total'}
+            fields = list(self.fields)
+        return {field: round(present.get(field, 0) / records, 3) if records else None for field in fields}
+
+    def stages(self):
+        """stage -> timing report, ordered by total time spent"""
+        with self.lock:
+            reports = {dict(labels)['stage']: histogram.report()
+                       for (name, labels), histogram in self.histograms.items() if name == 'stage_seconds'}
+            for stage, report in reports.items():
+                report['errors'] = self.counters.get(('stage_errors_total', (('stage', stage),)), 0)
+        return dict(sorted(reports.items(), key=lambda item: -item[1]['total_s']))
+
+    def report(self):
+        """Run report as a JSON-serialisable dict"""
+        with self.lock:
+            counters = {name + label_string(labels): value for (name, labels), value in sorted(self.counters.items())}
+            histograms = {name + label_string(labels): histogram.report()
+                          for (name, labels), histogram in sorted(self.histograms.items())}
+        return {
+            'started': datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S'),
+            'elapsed_s': round(time.time() - self.started, 1),
+            'stages': self.stages(),
+            'field_success': self.field_success(),
+            'counters': counters,
+            'histograms': histograms
+        }
+
+    def prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f'{self.prefix}_{name}'
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric}{label_string(labels)} {value}')
+
+        for (name, labels), histogram in histograms:
+            metric = f'{self.prefix}_{name}'
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f'# TYPE {metric} histogram')
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{label_string(labels + (("le", bound),))} {cumulative}')
+            lines.append(f'{metric}_bucket{label_string(labels + (("le", "+Inf"),))} {histogram.count}')
+            lines.append(f'{metric}_sum{label_string(labels)} {histogram.sum:.6f}')
+            lines.append(f'{metric}_count{label_string(labels)} {histogram.count}')
+
+        metric = f'{self.prefix}_field_success_ratio'
+        lines.append(f'# TYPE {metric} gauge')
+        for field, ratio in self.field_success().items():
+            if ratio is not None:
+                lines.append(f'{metric}{label_string((("field", field),))} {ratio}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.report(), indent=2))
+
+    def write_prometheus(self, path):
+        """Write a .prom file (atomically, so a node_exporter textfile collector never reads half of it)"""
+        _write_atomic(path, self.prometheus())
+
+    def export(self, basename):
+        """Write basename.json (run report) and basename.prom (Prometheus text file)"""
+        self.write_json(f'{basename}.json')
+        self.write_prometheus(f'{basename}.prom')
+        logging.info(f"Metrics written to {basename}.json and {basename}.prom")
+        return f'{basename}.json', f'{basename}.prom'
+
+    def summary(self):
+        """Short per-stage breakdown for the log"""
+        parts = [f"{stage} {report['count']}x {report['total_s']:.1f}s (p95 {report['p95_s']:.2f}s)"
+                 for stage, report in self.stages().items()]
+        fields = ', '.join(f'{field} {ratio:.0%}' for field, ratio in self.field_success().items() if ratio is not None)
+        return ('Stage timings: ' + (' | '.join(parts) if parts else 'n/a')
+                + (f'; field success: {fields}' if fields else ''))
+
+
+def timed(stage):
+    """Method decorator: time each call as a stage on self.metrics"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.stage(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _write_atomic(path, text):
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
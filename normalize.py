@@ -0,0 +1,139 @@
+import logging
+
+import pandas as pd
+
+# Patterns stay within the syntax shared by Python re and RE2 (pyarrow-backed string columns)
+
+# Localized labels Maps puts in front of aria-label values ("Adresse: ", "Telefon: ", "Phone: ", ...)
+LABEL_PATTERN = r'(?i)^(?:Adresse|Anschrift|Address|Telefonnummer|Telefon|Tel\.?|Phone|Webseite|Website)\s*:\s*'
+
+# Icon glyphs (private use area) that end up in element text
+ICON_PATTERN = '[\ue000-\uf8ff]'
+
+# Any run of whitespace, including non-breaking and narrow no-break spaces
+SPACE_PATTERN = '[\\s\u00a0\u202f]+'
+
+# "Friedrichstraße 103, 10117 Berlin" (optionally followed by ", Deutschland")
+ADDRESS_PATTERN = r'^(?P<street>.+?),\s*(?P<postal_code>\d{5})\s+(?P<locality>[^,]+?)(?:,\s*[^,]+)?$'
+
+# Country calling code for numbers written in national format (030 ...)
+DEFAULT_COUNTRY_CODE = '49'
+
+# Column -> dtype of a normalized dataset
+SCHEMA = {
+    'name': 'string',
+    'address': 'string',
+    'street': 'string',
+    'postal_code': 'string',
+    'locality': 'string',
+    'phone': 'string',
+    'website': 'string',
+    'email': 'string',
+    'rating': 'Float64',
+    'reviews_count': 'Int64',
+    'city': 'category',
+    'category': 'category',
+    'scraped_at': 'datetime64[ns]',
+    'place_id': 'string'
+}
+
+
+def clean_text(values):
+    """Strip field labels, icon glyphs and extra whitespace; empty strings become NA"""
+    text = (values.astype('string')
+            .str.replace(ICON_PATTERN, '', regex=True)
+            .str.replace(SPACE_PATTERN, ' ', regex=True)
+            .str.strip()
+            .str.replace(LABEL_PATTERN, '', regex=True)
+            .str.strip())
+    return text.mask(text == '')
+
+
+def to_e164(values, country_code=DEFAULT_COUNTRY_CODE):
+    """Phone numbers as E.164 (+493020607900); numbers that cannot be valid become NA"""
+    text = clean_text(values).str.replace(r'\(0\)', '', regex=True)  # +49 (0)30 ... trunk prefix
+    international = text.str.match(r'(\+|00)').fillna(False)
+    digits = text.str.replace(r'\D', '', regex=True)
+
+    # +49 30 ... / 0049 30 ... keep their country code; 030 ... gets the default one
+    e164 = ('+' + digits.str.replace(r'^00', '', regex=True)).where(
+        international, '+' + country_code + digits.str.replace(r'^0', '', regex=True))
+    return e164.where(e164.str.fullmatch(r'\+[1-9]\d{6,14}').fillna(False))
+
+
+def to_rating(values):
+    """Ratings like "4,4" or "4.4" as Float64 in 1.0-5.0"""
+    if pd.api.types.is_numeric_dtype(values):
+        rating = pd.to_numeric(values, errors='coerce').astype('Float64')
+    else:
+        number = clean_text(values).str.replace(',', '.', regex=False).str.extract(r'(\d+(?:\.\d+)?)', expand=False)
+        rating = pd.to_numeric(number, errors='coerce').astype('Float64')
+    return rating.where(rating.between(1, 5).fillna(False))
+
+
+def to_count(values):
+    """Review counts like "1.234", "1,234" or "(1.234)" as Int64"""
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_numeric(values, errors='coerce').round().astype('Int64')
+    digits = clean_text(values).str.replace(r'\D', '', regex=True)
+    return pd.to_numeric(digits.mask(digits == ''), errors='coerce').astype('Int64')
+
+
+def split_address(values):
+    """Clean address plus its street, postal_code and locality columns"""
+    address = clean_text(values)
+    parts = address.str.extract(ADDRESS_PATTERN)[['street', 'postal_code', 'locality']].astype('string')
+    # Addresses in another shape still get a postal code when they contain one
+    parts['postal_code'] = parts['postal_code'].fillna(address.str.extract(r'\b(\d{5})\b', expand=False))
+    return address, parts
+
+
+def normalize_records(df, country_code=DEFAULT_COUNTRY_CODE):
+    """Normalize a DataFrame of scraped records with column operations; returns a new frame typed as SCHEMA
+
+    Columns outside the schema are kept unchanged after the schema columns.
+    """
+    def column(name):
+        return df[name] if name in df else pd.Series(pd.NA, index=df.index, dtype='string')
+
+    out = pd.DataFrame(index=df.index)
+    out['name'] = clean_text(column('name'))
+    out['address'], parts = split_address(column('address'))
+    out[['street', 'postal_code', 'locality']] = parts
+    out['phone'] = to_e164(column('phone'), country_code)
+    out['website'] = clean_text(column('website'))
+    out['email'] = clean_text(column('email')).str.lower()
+    out['rating'] = to_rating(column('rating'))
+    out['reviews_count'] = to_count(column('reviews_count'))
+    out['city'] = clean_text(column('city')).astype('category')
+    out['category'] = clean_text(column('category')).astype('category')
+    out['scraped_at'] = pd.to_datetime(column('scraped_at'), errors='coerce')
+    out['place_id'] = clean_text(column('place_id'))
+
+    extra = [name for name in df.columns if name not in out.columns]
+    return pd.concat([out.astype(SCHEMA), df[extra]], axis=1)
+
+
+def parse_failures(raw, normalized):
+    """field -> number of non-empty raw values that could not be parsed"""
+    failures = {}
+    for field, target in (('phone', 'phone'), ('rating', 'rating'), ('reviews_count', 'reviews_count'),
+                          ('address', 'postal_code'), ('scraped_at', 'scraped_at')):
+        if field in raw:
+            present = raw[field].astype('string').str.strip().fillna('') != ''
+            failures[field] = int((present & normalized[target].isna()).sum())
+    return failures
+
+
+def normalize_csv(csv_path, output_path=None, country_code=DEFAULT_COUNTRY_CODE):
+    """Normalize a results CSV into <name>_normalized.csv; returns the typed DataFrame"""
+    raw = pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+    normalized = normalize_records(raw, country_code)
+
+    output_path = output_path or csv_path.replace('.csv', '_normalized.csv')
+    normalized.to_csv(output_path, index=False, encoding='utf-8-sig')
+
+    failures = ', '.join(f"{field} {count}" for field, count in parse_failures(raw, normalized).items() if count)
+    logging.info(f"Normalized {len(normalized)} records to {output_path}"
+                 + (f" (unparsed: {failures})" if failures else ''))
+    return normalized
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+from email_cache import canonical_url, site_key
+from email_enricher import open_session, scan_website
+from metrics import Metrics
+from waits import PolitenessBudget
+
+_STOP = object()
+
+
+class EnrichmentPipeline:
+    """Sink for scrape_city that looks up emails while scraping continues
+
+    Records go onto a bounded queue; a background event loop scans the websites over HTTP
+    (JS-rendered sites go to a browser worker) and writes the enriched records to sink.
+    When the queue is full, write() blocks, so a slow enrichment stage throttles scraping
+    instead of buffering the whole run in memory.
+    """
+
+    def __init__(self, sink, concurrency=20, maxsize=100, browser_workers=1, journal=None, cache=None,
+                 host_interval=2.0, metrics=None, known=None):
+        self.sink = sink
+        self.concurrency = concurrency
+        self.browser_workers = browser_workers
+        self.journal = journal
+        self.cache = cache
+        self.politeness = PolitenessBudget(host_interval)
+        self.metrics = metrics or Metrics()  # Usually the scraper's, so one report covers both stages
+
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.browser_queue = queue.Queue()
+        self.lock = threading.Lock()
+        # domain -> email, for places sharing a website (known: emails still valid from an earlier run)
+        self.known = dict(known or {})
+        self.browser_pending = set()  # domains handed to a browser worker and not looked up yet
+        self.browser_threads = []
+        self.stats = {'queued': 0, 'enriched': 0, 'emails': 0, 'http_scans': 0, 'browser_scans': 0,
+                      'blocked_seconds': 0.0, 'max_queue': 0}
+        self._closed = False
+
+        self.thread = threading.Thread(target=lambda: asyncio.run(self._consume()), name='enrichment', daemon=True)
+        self.thread.start()
+
+    @property
+    def count(self):
+        return self.sink.count
+
+    def write(self, record):
+        """Queue a scraped record for enrichment (blocks while the queue is full)"""
+        if self._closed:
+            raise RuntimeError("EnrichmentPipeline is closed")
+        started = time.time()
+        self.queue.put(record)
+        with self.lock:
+            self.stats['queued'] += 1
+            self.stats['blocked_seconds'] += time.time() - started
+            self.stats['max_queue'] = max(self.stats['max_queue'], self.queue.qsize())
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        self.sink.flush()
+
+    def close(self):
+        """Wait until every queued record is enriched and written, then close the sink"""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(_STOP)
+        self.thread.join()
+
+        for _ in self.browser_threads:
+            self.browser_queue.put(_STOP)
+        for thread in self.browser_threads:
+            thread.join()
+
+        # Left over if every browser failed to start
+        while not self.browser_queue.empty():
+            item = self.browser_queue.get_nowait()
+            if item is not _STOP:
+                self._emit(item[0])
+
+        self.sink.close()
+        logging.info(self.summary())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        return (f"Enrichment: {stats['enriched']}/{stats['queued']} records, {stats['emails']} with email, "
+                f"{stats['http_scans']} HTTP / {stats['browser_scans']} browser scans, "
+                f"peak queue {stats['max_queue']}/{self.queue.maxsize}, "
+                f"scraping blocked {stats['blocked_seconds']:.1f}s")
+
+    def _emit(self, record):
+        self.sink.write(record)
+        self.metrics.inc('enriched_records_total')
+        with self.lock:
+            self.stats['enriched'] += 1
+            if record.get('email'):
+                self.stats['emails'] += 1
+                self.metrics.inc('enriched_emails_total')
+
+    def _lookup(self, domain):
+        """Email already known for a domain (this run, resumed journal or cache), or None"""
+        with self.lock:
+            email = self.known.get(domain)
+        if email is None and self.journal:
+            email = self.journal.get_email(domain)
+        if email is None and self.cache:
+            email = self.cache.get(domain)
+        return email
+
+    def _remember(self, domain, email):
+        with self.lock:
+            self.known[domain] = email
+        if self.journal:
+            self.journal.record_email(domain, email)
+        if self.cache:
+            self.cache.put(domain, email)
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        inflight = {}  # domain -> task scanning it
+        tasks = set()
+
+        async with open_session(self.concurrency) as session:
+            while True:
+                # A free slot is taken before the next record, so at most `concurrency` records are in flight
+                await semaphore.acquire()
+                record = await loop.run_in_executor(None, self.queue.get)
+                if record is _STOP:
+                    break
+
+                task = asyncio.ensure_future(self._enrich(session, record, inflight))
+                tasks.add(task)
+                task.add_done_callback(lambda done: (tasks.discard(done), semaphore.release()))
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _enrich(self, session, record, inflight):
+        website = (record.get('website') or '').strip()
+        if record.get('email') or not website:
+            self._emit(record)
+            return
+
+        domain = site_key(website)
+        try:
+            email = self._lookup(domain)
+            if email is None:
+                with self.lock:
+                    in_browser = domain in self.browser_pending
+                if in_browser:
+                    # The site already waits for a browser, which answers this place too
+                    self._send_to_browser(record, domain, website)
+                    return
+                # Places sharing a website wait for the same scan
+                if domain not in inflight:
+                    inflight[domain] = asyncio.ensure_future(self._scan(session, canonical_url(website)))
+                    with self.lock:
+                        self.stats['http_scans'] += 1
+                result = await asyncio.shield(inflight[domain])
+
+                if result['needs_browser'] and self.browser_workers:
+                    inflight.pop(domain, None)
+                    with self.lock:
+                        self.browser_pending.add(domain)
+                    self._send_to_browser(record, domain, website)
+                    return
+                if domain in inflight:
+                    # A failed fetch is not "no email": it is not journaled or cached
+                    if not result['error']:
+                        self._remember(domain, result['email'])
+                    inflight.pop(domain, None)
+                email = result['email']
+            # The scraper (and its PlaceIndex) still holds the scraped dict
+            record = dict(record)
+            record['email'] = email
+        except Exception as e:
+            logging.warning(f"Email enrichment failed for {website}: {e}")
+        self._emit(record)
+
+    async def _scan(self, session, url):
+        with self.metrics.stage('scan_website'):
+            return await scan_website(session, url)
+
+    def _send_to_browser(self, record, domain, website):
+        with self.lock:
+            if len(self.browser_threads) < self.browser_workers:
+                # Browsers are only started once a JS-rendered site shows up
+                for worker_id in range(len(self.browser_threads), self.browser_workers):
+                    thread = threading.Thread(target=self._browser_worker, args=(worker_id,),
+                                              name=f'enrichment-browser-{worker_id}', daemon=True)
+                    thread.start()
+                    self.browser_threads.append(thread)
+        self.browser_queue.put((record, domain, website))
+
+    def _browser_worker(self, worker_id):
+        from email_scraper import BROWSER_ATTEMPTS, driver_alive, extract_email_from_website, setup_driver
+
+        driver = None
+        record = None  # Record being looked up, written even if this worker stops
+        try:
+            driver = setup_driver()
+            while True:
+                item = self.browser_queue.get()
+                if item is _STOP:
+                    return
+                record, domain, website = item
+
+                email = self._lookup(domain)
+                if email is None:
+                    for _ in range(BROWSER_ATTEMPTS):
+                        with self.metrics.stage('extract_email_from_website'):
+                            email = extract_email_from_website(driver, website, self.politeness)
+                        if driver_alive(driver):
+                            self._remember(domain, email)
+                            break
+                        # A crashed browser finds nothing: the site is looked up again in a new one
+                        logging.warning(f"Enrichment browser {worker_id} crashed on {website}, restarting it")
+                        email = ''
+                        crashed, driver = driver, None
+                        try:
+                            crashed.quit()
+                        except Exception:
+                            pass
+                        driver = setup_driver()
+                    with self.lock:
+                        self.stats['browser_scans'] += 1
+                with self.lock:
+                    self.browser_pending.discard(domain)
+                record = dict(record)
+                record['email'] = email
+                self._emit(record)
+                record = None
+        except Exception as e:
+            logging.error(f"Enrichment browser {worker_id} stopped: {e}")
+            # Records waiting for a browser are still written, without an email
+            if record is not None:
+                self._emit(record)
+            while True:
+                try:
+                    item = self.browser_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self.browser_queue.put(_STOP)
+                    break
+                self._emit(item[0])
+        finally:
+            if driver:
+                driver.quit()
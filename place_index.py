@@ -0,0 +1,140 @@
+import csv
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+from urllib.parse import unquote, urlparse
+
+# Feature id in place URLs: ...!1s0x47a84e373f035901:0x42120465b5e3b70!...
+FEATURE_ID_PATTERN = re.compile(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)', re.IGNORECASE)
+# Knowledge graph id: ...!16s%2Fg%2F11c1r1x2zq...
+KG_ID_PATTERN = re.compile(r'!16s([^!?&]+)')
+# Classic CID links: ...?cid=4760381393455593328
+CID_PATTERN = re.compile(r'[?&]cid=(\d+)')
+
+
+def place_id_from_href(href):
+    """Stable identifier for a place from its feed anchor href"""
+    if not href:
+        return None
+
+    for pattern in (FEATURE_ID_PATTERN, CID_PATTERN, KG_ID_PATTERN):
+        match = pattern.search(href)
+        if match:
+            return unquote(match.group(1))
+
+    # Fall back to the URL without volatile query parameters
+    parts = urlparse(href)
+    return parts.netloc + parts.path
+
+
+class PlaceIndex:
+    """In-run index of places already extracted, shared across queries (and workers)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = {}  # place id -> record (None for places that yielded no data)
+        self.queries = {}  # place id -> queries that found it
+        self.hits = {}  # query -> place ids it returned
+        self.claimed = set()  # place ids being extracted right now
+
+    def _note(self, place_id, query):
+        self.queries.setdefault(place_id, [])
+        if query not in self.queries[place_id]:
+            self.queries[place_id].append(query)
+        self.hits.setdefault(query, set()).add(place_id)
+
+    def note(self, place_id, query):
+        """Note that a query found a place without extracting it (duplicates replayed from a journal)"""
+        with self.lock:
+            self._note(place_id, query)
+
+    def claim(self, place_id, query):
+        """Claim a place for extraction; returns False for duplicates (extracted or being extracted)
+
+        The claim holds until add() or release(); the query is noted either way for merged_categories().
+        """
+        with self.lock:
+            self._note(place_id, query)
+            if place_id in self.records or place_id in self.claimed:
+                return False
+            self.claimed.add(place_id)
+            return True
+
+    def release(self, place_id):
+        """Give up a claim whose extraction failed, so the place can be claimed again"""
+        with self.lock:
+            self.claimed.discard(place_id)
+
+    def add(self, place_id, query, record=None):
+        """Register an extracted place (record=None for places that yielded no data)"""
+        with self.lock:
+            self._note(place_id, query)
+            if record is not None or place_id not in self.records:
+                self.records[place_id] = record
+            self.claimed.discard(place_id)
+
+    def merged_categories(self):
+        """{place id: 'query a, query b'} for extracted places found by more than one query
+
+        Records are streamed out when they are extracted, before later queries find them again,
+        so the merged categories are applied to the finished files (see apply_categories).
+        """
+        with self.lock:
+            return {place_id: ', '.join(queries) for place_id, queries in self.queries.items()
+                    if len(queries) > 1 and self.records.get(place_id) is not None}
+
+    def overlap_report(self):
+        """Return {(query_a, query_b): (shared places, share of query_b's places already seen in query_a)}"""
+        with self.lock:
+            hits = {query: set(ids) for query, ids in self.hits.items()}
+
+        report = {}
+        for query_a, query_b in itertools.combinations(hits, 2):
+            shared = len(hits[query_a] & hits[query_b])
+            report[(query_a, query_b)] = (shared, shared / len(hits[query_b]) if hits[query_b] else 0.0)
+        return report
+
+    def overlap_summary(self):
+        lines = [f"'{a}' / '{b}': {shared} shared ({rate:.0%} of '{b}')"
+                 for (a, b), (shared, rate) in self.overlap_report().items() if shared]
+        return 'Query overlap: ' + ('; '.join(lines) if lines else 'none')
+
+
+def apply_categories(path, categories):
+    """Write merged categories ({place id: category}) into a finished CSV or JSON Lines file
+
+    Returns the number of records updated; the file is replaced in one step.
+    """
+    if not categories or not os.path.exists(path):
+        return 0
+
+    updated = 0
+    encoding = 'utf-8-sig' if path.endswith('.csv') else 'utf-8'
+    temp_path = path + '.tmp'
+    with open(path, 'r', encoding=encoding, newline='') as source, \
+            open(temp_path, 'w', encoding=encoding, newline='') as target:
+        if path.endswith('.csv'):
+            reader = csv.DictReader(source)
+            writer = csv.DictWriter(target, fieldnames=reader.fieldnames or [])
+            writer.writeheader()
+            rows = reader
+        else:
+            rows = (json.loads(line) for line in source if line.strip())
+
+        for row in rows:
+            category = categories.get(row.get('place_id'))
+            if category is not None and row.get('category') != category:
+                row['category'] = category
+                updated += 1
+            if path.endswith('.csv'):
+                writer.writerow(row)
+            else:
+                target.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+
+    os.replace(temp_path, path)
+    if updated:
+        logging.info(f"Merged categories of {updated} places into {path}")
+    return updated
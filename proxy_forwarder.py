@@ -0,0 +1,216 @@
+import base64
+import logging
+import select
+import socket
+import socketserver
+import threading
+from urllib.parse import urlsplit
+
+BUFFER_SIZE = 65536
+CONNECT_TIMEOUT = 10
+
+
+def parse_upstream(proxy):
+    """Split 'user:pass@host:port' into ((host, port), auth header value or None)"""
+    if not proxy:
+        return None, None
+    if '://' in proxy:
+        proxy = proxy.split('://', 1)[1]
+
+    auth = None
+    if '@' in proxy:
+        credentials, proxy = proxy.rsplit('@', 1)
+        auth = 'Basic ' + base64.b64encode(credentials.encode()).decode()
+
+    host, _, port = proxy.rpartition(':')
+    return (host, int(port)), auth
+
+
+def read_head(sock):
+    """Read an HTTP message head (up to the blank line); returns (head, leftover body bytes)"""
+    data = b''
+    while b'\r\n\r\n' not in data:
+        chunk = sock.recv(BUFFER_SIZE)
+        if not chunk:
+            break
+        data += chunk
+        if len(data) > 65536:
+            break
+    head, _, rest = data.partition(b'\r\n\r\n')
+    return head, rest
+
+
+def close_after(head):
+    """Message head with its Connection/Keep-Alive headers replaced by 'Connection: close'"""
+    lines = [line for line in head.split(b'\r\n')
+             if line and not line.lower().startswith((b'connection:', b'keep-alive:'))]
+    return b'\r\n'.join(lines + [b'Connection: close'])
+
+
+def pipe(client, upstream):
+    """Copy bytes both ways until one side closes"""
+    sockets = [client, upstream]
+    try:
+        while True:
+            readable, _, errored = select.select(sockets, [], sockets, 60)
+            if errored or not readable:
+                break
+            for sock in readable:
+                data = sock.recv(BUFFER_SIZE)
+                if not data:
+                    return
+                (upstream if sock is client else client).sendall(data)
+    except OSError:
+        pass
+
+
+class ForwardingHandler(socketserver.BaseRequestHandler):
+    """Handles one browser connection: CONNECT tunnels and plain HTTP requests"""
+
+    def handle(self):
+        forwarder = self.server.forwarder
+        client = self.request
+        forwarder.track(client)
+        upstream = None
+
+        try:
+            head, rest = read_head(client)
+            if not head:
+                return
+
+            request_line, _, header_block = head.partition(b'\r\n')
+            method, target, version = request_line.decode('latin-1').split(' ', 2)
+            upstream_addr, auth = forwarder.current()
+
+            if method.upper() == 'CONNECT':
+                upstream = self.open_tunnel(target, upstream_addr, auth)
+                if upstream is None:
+                    client.sendall(b'HTTP/1.1 502 Bad Gateway\r\n\r\n')
+                    return
+                client.sendall(b'HTTP/1.1 200 Connection Established\r\n\r\n')
+            else:
+                upstream = self.forward_request(method, target, version, header_block, rest,
+                                                upstream_addr, auth)
+                # One request per connection: a second request kept alive on it would be piped
+                # through unparsed (no Proxy-Authorization, or to the first request's host)
+                head, rest = read_head(upstream)
+                if not head:
+                    client.sendall(b'HTTP/1.1 502 Bad Gateway\r\n\r\n')
+                    return
+                client.sendall(close_after(head) + b'\r\n\r\n' + rest)
+
+            pipe(client, upstream)
+
+        except (OSError, ValueError) as e:
+            logging.debug(f"Forwarder connection error: {e}")
+        finally:
+            forwarder.untrack(client)
+            if upstream:
+                upstream.close()
+
+    def open_tunnel(self, target, upstream_addr, auth):
+        """Open a tunnel to target (host:port), through the upstream proxy if one is set"""
+        if upstream_addr is None:
+            host, _, port = target.rpartition(':')
+            return socket.create_connection((host, int(port or 443)), timeout=CONNECT_TIMEOUT)
+
+        upstream = socket.create_connection(upstream_addr, timeout=CONNECT_TIMEOUT)
+        request = f'CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n'
+        if auth:
+            request += f'Proxy-Authorization: {auth}\r\n'
+        upstream.sendall((request + '\r\n').encode('latin-1'))
+
+        head, _ = read_head(upstream)
+        status = head.split(b' ', 2)[1:2]
+        if status != [b'200']:
+            upstream.close()
+            self.server.forwarder.record_failure()
+            return None
+        return upstream
+
+    def forward_request(self, method, target, version, header_block, rest, upstream_addr, auth):
+        """Forward a plain HTTP request (absolute URI form), through the upstream proxy if one is set
+
+        The request asks for Connection: close, so the connection ends with its response.
+        """
+        headers = [line for line in close_after(header_block).split(b'\r\n')
+                   if not line.lower().startswith(b'proxy-')]
+
+        if upstream_addr is None:
+            url = urlsplit(target)
+            upstream = socket.create_connection((url.hostname, url.port or 80), timeout=CONNECT_TIMEOUT)
+            path = (url.path or '/') + (f'?{url.query}' if url.query else '')
+            request_line = f'{method} {path} {version}'.encode('latin-1')
+        else:
+            upstream = socket.create_connection(upstream_addr, timeout=CONNECT_TIMEOUT)
+            request_line = f'{method} {target} {version}'.encode('latin-1')
+            if auth:
+                headers.append(f'Proxy-Authorization: {auth}'.encode('latin-1'))
+
+        upstream.sendall(b'\r\n'.join([request_line] + headers) + b'\r\n\r\n' + rest)
+        return upstream
+
+
+class ForwardingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class UpstreamForwarder:
+    """Local HTTP proxy for Chrome whose upstream proxy can be switched without restarting the browser"""
+
+    def __init__(self, upstream=None, host='127.0.0.1', port=0):
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.failures = 0
+        self.upstream = None
+        self._upstream_addr, self._auth = None, None
+        self.set_upstream(upstream, drop_connections=False)
+
+        self.server = ForwardingServer((host, port), ForwardingHandler)
+        self.server.forwarder = self
+        self.thread = threading.Thread(target=self.server.serve_forever, name='proxy-forwarder', daemon=True)
+        self.thread.start()
+        logging.info(f"Local proxy forwarder listening on {self.address}")
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f'{host}:{port}'
+
+    def current(self):
+        with self.lock:
+            return self._upstream_addr, self._auth
+
+    def set_upstream(self, proxy, drop_connections=True):
+        """Switch the upstream proxy (None = direct); takes effect on the next request"""
+        upstream_addr, auth = parse_upstream(proxy)
+        with self.lock:
+            self.upstream = proxy
+            self._upstream_addr, self._auth = upstream_addr, auth
+            connections = list(self.connections) if drop_connections else []
+
+        # Chrome keeps connections to the proxy alive; closing them makes it reconnect via the new upstream
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if proxy:
+            logging.info(f"Forwarder upstream set to {proxy.rsplit('@', 1)[-1]}")
+
+    def track(self, connection):
+        with self.lock:
+            self.connections.add(connection)
+
+    def untrack(self, connection):
+        with self.lock:
+            self.connections.discard(connection)
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,205 @@
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+import requests
+
+
+class ProxyStats:
+    """Health record for one proxy"""
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency = None  # Exponentially weighted moving average, in seconds
+        self.last_checked = 0.0
+        self.origin = None
+
+    @property
+    def healthy(self):
+        return self.successes > 0 and self.consecutive_failures == 0
+
+    @property
+    def success_rate(self):
+        # Laplace smoothing so one lucky probe does not beat a long track record
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    @property
+    def score(self):
+        """Higher is better: reliable and fast proxies first"""
+        if not self.healthy:
+            return 0.0
+        return self.success_rate / max(self.latency or 5.0, 0.05)
+
+    def record(self, ok, latency=None):
+        self.last_checked = time.time()
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+            if latency is not None:
+                self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+
+class ProxyPool:
+    """Concurrently health-checked proxy pool that hands out proxies by score"""
+
+    def __init__(self, source=None, test_url='https://httpbin.org/ip', timeout=5, max_workers=32,
+                 refresh_interval=300, min_healthy=5, max_failures=2, refresh_batch=100):
+        self.source = source  # Callable returning fresh candidate proxies ("host:port")
+        self.test_url = test_url
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self.min_healthy = min_healthy
+        self.max_failures = max_failures  # Consecutive failures before a proxy is dropped
+        self.refresh_batch = refresh_batch  # Proxies re-tested per refresh (fresh candidates are all stale)
+        self.max_workers = max_workers
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='proxy-check')
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, proxies):
+        """Register candidate proxies (already known ones keep their stats)"""
+        with self.lock:
+            for proxy in proxies:
+                if proxy and proxy not in self.stats:
+                    self.stats[proxy] = ProxyStats(proxy)
+
+    def check(self, proxy):
+        """Probe one proxy and record its latency; returns True if it works"""
+        self.add([proxy])
+        proxies = {'http': f'http://{proxy}', 'https': f'http://{proxy}'}
+        started = time.time()
+        ok = False
+        origin = None
+
+        try:
+            response = requests.get(self.test_url, proxies=proxies, timeout=self.timeout)
+            ok = response.status_code == 200
+            if ok:
+                try:
+                    origin = response.json().get('origin')
+                except ValueError:
+                    pass
+        except Exception:
+            ok = False
+
+        latency = time.time() - started
+        with self.lock:
+            stats = self.stats.get(proxy)
+            if stats is not None:
+                stats.record(ok, latency)
+                stats.origin = origin or stats.origin
+                if stats.consecutive_failures >= self.max_failures:
+                    del self.stats[proxy]
+
+        if ok:
+            logging.info(f"✓ Proxy {proxy} is working ({latency:.2f}s). IP: {origin}")
+        return ok
+
+    def check_all(self, proxies=None):
+        """Probe many proxies concurrently; returns the ones that work"""
+        if proxies is None:
+            with self.lock:
+                proxies = list(self.stats)
+        futures = {self.executor.submit(self.check, proxy): proxy for proxy in proxies}
+        return [futures[future] for future in as_completed(futures) if future.result()]
+
+    def first_healthy(self, proxies, timeout=30):
+        """Probe proxies concurrently and return the first that works (None after timeout)
+
+        At most max_workers probes are queued at a time; the ones not started yet are cancelled
+        as soon as a proxy passes.
+        """
+        candidates = iter(proxies)
+        pending = {}
+        deadline = time.time() + timeout
+
+        try:
+            while time.time() < deadline:
+                for proxy in itertools.islice(candidates, self.max_workers - len(pending)):
+                    pending[self.executor.submit(self.check, proxy)] = proxy
+                if not pending:
+                    return None
+
+                done, _ = wait(pending, timeout=deadline - time.time(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    proxy = pending.pop(future)
+                    if not future.cancelled() and future.result():
+                        return proxy
+            return None
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def best(self, exclude=None):
+        """Highest scoring healthy proxy"""
+        with self.lock:
+            candidates = [stats for proxy, stats in self.stats.items() if stats.healthy and proxy != exclude]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda stats: stats.score).proxy
+
+    def healthy_count(self):
+        with self.lock:
+            return sum(1 for stats in self.stats.values() if stats.healthy)
+
+    def report(self, proxy, ok, latency=None):
+        """Feed back a success or failure observed while scraping through a proxy"""
+        with self.lock:
+            stats = self.stats.get(proxy)
+            if stats is not None:
+                stats.record(ok, latency)
+                if stats.consecutive_failures >= self.max_failures:
+                    del self.stats[proxy]
+
+    def refresh(self):
+        """Fetch new candidates if the pool runs low and re-test up to refresh_batch stale proxies
+
+        Healthy proxies are re-tested first, then the ones checked longest ago (never-checked
+        candidates included), so a long candidate list is worked through over several refreshes.
+        """
+        if self.source and self.healthy_count() < self.min_healthy:
+            try:
+                self.add(self.source())
+            except Exception as e:
+                logging.warning(f"Could not refresh proxy candidates: {e}")
+
+        now = time.time()
+        with self.lock:
+            stale = sorted((stats for stats in self.stats.values() if now - stats.last_checked > self.refresh_interval),
+                           key=lambda stats: (not stats.healthy, stats.last_checked))
+            stale = [stats.proxy for stats in stale[:self.refresh_batch]]
+        if stale:
+            healthy = self.check_all(stale)
+            logging.info(f"Proxy pool refresh: {len(healthy)}/{len(stale)} re-tested proxies healthy, "
+                         f"{self.healthy_count()} healthy in total")
+
+    def start_background(self):
+        """Keep refreshing the pool in a background thread while scraping continues"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logging.warning(f"Proxy pool refresh failed: {e}")
+                self._stop.wait(min(self.refresh_interval, 60))
+
+        self._thread = threading.Thread(target=loop, name='proxy-pool-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh; queued probes are cancelled, running ones end within timeout"""
+        self._stop.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,138 @@
+"""Incremental refresh: only re-scrape places that are new, changed or stale since the previous run
+
+Every feed card shows a place's name, rating and review count. A place whose card still matches
+its record in the previous dataset, and whose record is younger than the TTL, is taken over
+without opening its detail panel. Emails of websites already in the previous dataset are reused,
+so only new or changed websites are looked up again.
+"""
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import config
+from email_cache import site_key
+from export import COLUMNAR_FORMATS, load_columnar
+
+# Columns of a scraped record, in the order the scraper writes them
+RECORD_COLUMNS = tuple(config.RECORD_COLUMNS)
+
+STATUSES = ('new', 'changed', 'stale', 'unchanged')
+
+
+def fingerprint(record):
+    """Content fingerprint from the card fields (name, rating, review count), independent of formatting
+
+    "4,5" and 4.5 or "(1.234)" and 1234 give the same fingerprint, so raw card values match
+    normalized values from the dataset.
+    """
+    name = re.sub(r'\s+', ' ', str(record.get('name') or '')).strip().lower()
+    rating = re.search(r'\d+(?:\.\d+)?', str(record.get('rating') or '').replace(',', '.'))
+    rating = f'{float(rating.group()):.1f}' if rating else ''
+    # Thousands separators go, a float's ".0" too ("1.000" is 1000, so is 1000.0)
+    reviews = re.sub(r'\D', '', re.sub(r'\.0$', '', str(record.get('reviews_count') or '')))
+    return f'{name}|{rating}|{reviews.lstrip("0")}'
+
+
+def _text(value):
+    """Dataset value as the string the scraper would have written"""
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if value is None or pd.isna(value):
+        return ''
+    return str(value)
+
+
+class RefreshIndex:
+    """Records of the previous run by place id, checked against the cards of the current one"""
+
+    def __init__(self, records, ttl_days=30, now=None):
+        self.ttl = timedelta(days=ttl_days)
+        self.now = now or datetime.now()
+        self.lock = threading.Lock()
+        self.counts = dict.fromkeys(STATUSES, 0)
+        self.records = {}  # place id -> record
+        for record in records:
+            if record.get('place_id'):
+                self.records[record['place_id']] = record
+
+    @classmethod
+    def load(cls, csv_path=None, cities=None, ttl_days=30, output_dir=None):
+        """Previous dataset from a results CSV, or else from the columnar dataset in OUTPUT_DIR"""
+        if csv_path:
+            df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+            source = csv_path
+        else:
+            fmt = config.COLUMNAR_FORMAT
+            source = os.path.join(output_dir or config.OUTPUT_DIR, COLUMNAR_FORMATS[fmt]['directory']) if fmt else None
+            if not source or not os.path.isdir(source):
+                logging.warning("No previous dataset found, every place is scraped in full")
+                return cls([], ttl_days)
+            df = load_columnar(fmt, output_dir)
+
+        if 'place_id' not in df:
+            logging.warning(f"{source} has no place_id column, every place is scraped in full")
+            return cls([], ttl_days)
+        if cities:
+            df = df[df['city'].astype('string').str.lower().isin([city.lower() for city in cities]).fillna(False)]
+
+        # The latest record of every place (several runs may be in the dataset)
+        df = df[df['place_id'].astype('string').fillna('') != '']
+        df = df.assign(_scraped=pd.to_datetime(df['scraped_at'], errors='coerce'))
+        df = df.sort_values('_scraped', kind='stable').drop_duplicates('place_id', keep='last')
+
+        records = [{column: _text(row.get(column)) for column in RECORD_COLUMNS}
+                   for row in df.to_dict('records')]
+        index = cls(records, ttl_days)
+        logging.info(f"Refresh: {len(index.records)} places in the previous dataset ({source})")
+        return index
+
+    def is_fresh(self, record):
+        try:
+            scraped_at = datetime.strptime(record.get('scraped_at') or '', '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return False
+        return self.now - scraped_at <= self.ttl
+
+    def check(self, place_id, card):
+        """Classify a place from its feed card: (status, previous record)
+
+        status is 'new', 'changed' (name, rating or review count differ), 'stale' (older
+        than the TTL) or 'unchanged'; only unchanged places can be reused.
+        """
+        previous = self.records.get(place_id)
+        if previous is None:
+            status = 'new'
+        elif fingerprint(card) != fingerprint(previous):
+            status = 'changed'
+        elif not self.is_fresh(previous):
+            status = 'stale'
+        else:
+            status = 'unchanged'
+        with self.lock:
+            self.counts[status] += 1
+        return status, previous
+
+    def reuse(self, previous):
+        """Copy of a previous record for this run (it keeps its scraped_at, so the TTL counts from there)"""
+        return {column: previous.get(column, '') for column in RECORD_COLUMNS}
+
+    def known_emails(self):
+        """{site key: email} of websites with a fresh record; their emails are not looked up again"""
+        emails = {}
+        for record in self.records.values():
+            if record.get('website') and self.is_fresh(record):
+                emails.setdefault(site_key(record['website']), record.get('email') or '')
+        return emails
+
+    def summary(self):
+        with self.lock:
+            counts = dict(self.counts)
+        checked = sum(counts.values())
+        reused = counts['unchanged']
+        return (f"Refresh: {reused}/{checked} places reused"
+                + (f" ({reused / checked:.0%})" if checked else '')
+                + f", {counts['new']} new, {counts['changed']} changed, {counts['stale']} stale")
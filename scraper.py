@@ -1,57 +1,139 @@
 import time
 import random
-import csv
+import copy
+import os
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from datetime import datetime
 import re
 import logging
+import threading
+from urllib.parse import urlparse
+from checkpoint import CheckpointJournal
+from maps_dom import DetailPanelTimeout, harvest_feed_cards, read_place_details, scroll_feed
+from waits import PolitenessBudget, ReadinessWaiter, TimeAccounting
+from sinks import CsvSink, JsonlSink, MultiSink
+from place_index import PlaceIndex, apply_categories, place_id_from_href
+from tiling import city_tiles, scrape_tiles, tile_units
+from worker_pool import chrome_user_agents
+from refresh import RefreshIndex
+from lean import LeanMode
+from log_setup import configure_logging
+from email_scan import best_email, scan_page
+from driver_factory import DriverFactory
+from pipeline import EnrichmentPipeline
+from metrics import Metrics, timed
+from normalize import normalize_csv
+from export import export_results, output_path
+import config
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraper.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 
 class GoogleMapsScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, profile_dir=None, user_agent=None, script_extraction=True,
+                 event_waits=False, min_interval=1.5, lean=False, standby=False,
+                 maps_url='https://www.google.com/maps', metrics=None):
         """Initialize the scraper with Chrome options"""
         self.options = Options()
+        self.script_extraction = script_extraction  # Read detail panels in one script call
+        
+        # Event-driven waits: readiness signals + per-host minimum interval instead of fixed sleeps
+        self.event_waits = event_waits
+        self.maps_url = maps_url.rstrip('/')  # Overridable for the offline benchmark fixtures
+        self.maps_host = urlparse(self.maps_url).netloc
+        self.timing = TimeAccounting()
+        self.politeness = PolitenessBudget(min_interval)
+        self.metrics = metrics or Metrics()  # Per-stage timings and counters (may be shared by workers)
+        self.feed_size = 0  # Places listed by the last search (tiling splits tiles whose feed is cut off)
+        
+        # Lean browsing: block images, fonts, media and trackers (lean=True or a configured LeanMode)
+        self.lean = LeanMode() if lean is True else (lean or None)
+        if self.lean:
+            self.lean.configure_options(self.options)
         
         # Make the browser appear more natural
         if headless:
             self.options.add_argument('--headless')
         
+        # Isolated Chrome profile (used by parallel workers); each driver gets its own slot inside it
+        self.profile_dir = profile_dir
+        self.driver_starts = 0
+        self.start_lock = threading.Lock()  # Standby drivers are started from a background thread
+        
+        # Fixed window size, so the map tiles of tiling.py fit inside the visible map
+        self.options.add_argument('--window-size=1920,1080')
         self.options.add_argument('--no-sandbox')
         self.options.add_argument('--disable-dev-shm-usage')
         self.options.add_argument('--disable-blink-features=AutomationControlled')
         self.options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.options.add_experimental_option('useAutomationExtension', False)
         
-        # Random user agent
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        ]
-        self.options.add_argument(f'user-agent={random.choice(user_agents)}')
+        # Random user agent (Chrome ones only, matching the browser)
+        self.options.add_argument(f'user-agent={user_agent or random.choice(chrome_user_agents())}')
+        
+        # standby=True keeps a second, fully configured Chrome warming for crash recovery
+        self.driver_factory = DriverFactory(self.start_driver, standby=standby)
+        self.attach_driver(self.driver_factory.acquire())
+    
+    def start_driver(self):
+        """Start Chrome and apply the stealth and lean setup (runs in the background for standby drivers)"""
+        options = copy.deepcopy(self.options)
+        if self.profile_dir:
+            # Two slots: the active driver and the standby never share a profile
+            with self.start_lock:
+                self.driver_starts += 1
+                slot = self.driver_starts % 2
+            options.add_argument(f'--user-data-dir={os.path.join(self.profile_dir, f"slot{slot}")}')
         
-        self.driver = webdriver.Chrome(options=self.options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver = webdriver.Chrome(options=options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.lean:
+            self.lean.apply(driver)
+        return driver
+    
+    def attach_driver(self, driver):
+        """Make driver the active browser"""
+        self.driver = driver
         self.wait = WebDriverWait(self.driver, 10)
+        self.waits = ReadinessWaiter(self.driver, self.timing, metrics=self.metrics)
+    
+    def driver_alive(self):
+        try:
+            self.driver.current_window_handle
+            return True
+        except WebDriverException:
+            return False
+    
+    def recover_driver(self):
+        """Replace a crashed browser with the standby driver (or a fresh one)"""
+        logging.warning("Browser is not responding, switching to a new driver")
+        self.metrics.inc('driver_restarts_total')
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        
+        started = time.time()
+        self.attach_driver(self.driver_factory.acquire())
+        self.timing.add('restart', time.time() - started)
         
+    @timed('natural_delay')
     def natural_delay(self, min_seconds=2, max_seconds=5):
         """Add random delay to mimic human behavior"""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+        if self.event_waits:
+            # Politeness comes from the per-host interval budget instead of a fixed sleep
+            self.timing.add('sleep', self.politeness.wait(self.maps_host))
+            return
+        
+        delay = random.uniform(min_seconds, max_seconds)
+        time.sleep(delay)
+        self.timing.add('sleep', delay)
     
     def scroll_element(self, element, scrolls=3):
         """Scroll within an element naturally"""
@@ -75,13 +157,24 @@ class GoogleMapsScraper:
         urls = re.findall(url_pattern, text)
         return urls[0] if urls else None
     
-    def search_location(self, city, query):
-        """Search for establishments in a specific city"""
-        search_query = f"{query} in {city}, Germany"
-        url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
+    @timed('search_location')
+    def search_location(self, city, query, tile=None):
+        """Search for establishments in a specific city (or in one map tile of it)"""
+        if tile is not None:
+            search_query = f"{query} in {city} tile {tile.key}"
+            url = tile.search_url(self.maps_url, query)
+        else:
+            search_query = f"{query} in {city}, Germany"
+            url = f"{self.maps_url}/search/{search_query.replace(' ', '+')}"
         
         logging.info(f"Searching: {search_query}")
         self.driver.get(url)
+        
+        if self.event_waits:
+            # Ready once the feed (or a single place panel) is there and the first batch has loaded
+            self.waits.any_present(["div[role='feed']", "h1.DUwDvf"])
+            self.waits.network_idle(idle_ms=300, timeout=5)
+        
         self.natural_delay(3, 5)
         
     def get_results_container(self):
@@ -96,34 +189,22 @@ class GoogleMapsScraper:
             logging.warning("Could not find results container")
             return None
     
-    def scroll_results(self, container, max_scrolls=10):
+    @timed('scroll_results')
+    def scroll_results(self, container, max_scrolls=10, target_count=None):
         """Scroll through results to load more establishments"""
         logging.info("Scrolling through results...")
         
-        for i in range(max_scrolls):
-            # Get current scroll height
-            last_height = self.driver.execute_script(
-                "return arguments[0].scrollHeight", container
-            )
-            
-            # Scroll down
-            self.driver.execute_script(
-                "arguments[0].scrollTop = arguments[0].scrollHeight", container
-            )
-            self.natural_delay(2, 4)
-            
-            # Calculate new scroll height
-            new_height = self.driver.execute_script(
-                "return arguments[0].scrollHeight", container
-            )
-            
-            # Check if we've reached the end
-            if new_height == last_height:
-                logging.info("Reached end of results")
-                break
-                
-            logging.info(f"Scroll {i+1}/{max_scrolls} completed")
+        # Stop as soon as enough unique places are loaded (or the list ends); feed growth is observed in the page
+        started = time.time()
+        result = scroll_feed(
+            self.driver, container, target_count=target_count, max_scrolls=max_scrolls,
+            min_interval=self.politeness.min_interval if self.event_waits else 0.5
+        )
+        self.timing.add('wait', time.time() - started)
+        logging.info(f"Loaded {result['count']} places in {result['scrolls']} scrolls "
+                     f"(stopped: {result['reason']})")
     
+    @timed('extract_place_data')
     def extract_place_data(self, place_element):
         """Extract data from a single place listing"""
         data = {
@@ -137,9 +218,38 @@ class GoogleMapsScraper:
         }
         
         try:
-            # Click on the place to open details
-            place_element.click()
-            self.natural_delay(2, 4)
+            # Remember the open panel so we can tell when the new one has replaced it; the card's
+            # name tells whether a panel with the same title can be the clicked place
+            previous = self.waits.detail_state() if self.event_waits else None
+            expected_name = place_element.get_attribute('aria-label') if self.event_waits else None
+            
+            # Click on the place to open details (once more if the panel did not switch)
+            for _ in range(2):
+                place_element.click()
+                
+                if self.event_waits:
+                    if not self.script_extraction:
+                        if self.waits.detail_changed(previous, expected_name) is not None:
+                            break
+                        continue
+                else:
+                    self.natural_delay(2, 4)
+                
+                # Single round trip: every field is read by one injected script
+                if self.script_extraction:
+                    started = time.time()
+                    details = read_place_details(self.driver, previous=previous, expected_name=expected_name)
+                    self.timing.add('wait', time.time() - started)
+                    if details is not None:
+                        data.update(details)
+                        logging.info(f"Extracted: {data['name']}")
+                        return data
+                    continue
+                break
+            else:
+                # Reading now would store the previous place's details under this one
+                self.metrics.inc('detail_timeouts_total')
+                raise DetailPanelTimeout(f"Detail panel did not switch to {expected_name or 'the clicked place'}")
             
             # Extract name
             try:
@@ -194,69 +304,204 @@ class GoogleMapsScraper:
             except:
                 pass
             
-            # Try to find email in the page content
+            # Scan for emails inside the page (mailto links and text nodes) instead of reading body.text
             try:
-                page_text = self.driver.find_element(By.TAG_NAME, 'body').text
-                data['email'] = self.extract_email(page_text)
+                candidates, _ = scan_page(self.driver)
+                data['email'] = best_email(candidates)[0] or None
             except:
                 pass
             
             logging.info(f"Extracted: {data['name']}")
             
+        except DetailPanelTimeout:
+            raise  # The place is skipped (and not journaled), so a resumed run tries it again
         except Exception as e:
             logging.error(f"Error extracting place data: {str(e)}")
         
         return data
     
-    def scrape_city(self, city, queries, max_results=50):
-        """Scrape establishments for a given city"""
+    def extract_card_data(self, card, detail_fields=('phone', 'website')):
+        """Build a record from a feed card, opening the detail panel only for missing fields"""
+        data = dict(card['data'])
+        missing = [field for field in detail_fields if not data.get(field)]
+        
+        if missing:
+            details = self.extract_place_data(card['element'])
+            for field, value in details.items():
+                if value and not data.get(field):
+                    data[field] = value
+            self.natural_delay(2, 4)
+        
+        return data
+    
+    def scrape_city(self, city, queries, max_results=50, journal=None, fast_list=False, sink=None,
+                    place_index=None, raise_errors=False, tile=None, refresh=None):
+        """Scrape establishments for a given city (skips units already in the journal)
+
+        raise_errors passes a failed query on to the caller instead of logging it and moving on.
+        tile (a tiling.Tile) limits the searches to one map viewport of the city.
+        refresh (a refresh.RefreshIndex) reuses unchanged places of the previous dataset.
+        Returns the records, or with a sink (which gets them as they come) the number written.
+        """
         all_data = []
+        written = 0
+        
+        # Places found by an earlier query are not clicked again (their categories are merged in the output)
+        place_index = place_index if place_index is not None else PlaceIndex()
+        
+        # Queries interrupted by a browser crash get one more attempt at the end
+        queries = list(queries)
+        retried = set()
         
         for query in queries:
+            # Journal key of the unit; each tile of a query is journaled on its own
+            unit = query if tile is None else f'{query} @{tile.key}'
+            
+            # Resume: reuse places finished by an earlier, interrupted run
+            finished = journal.place_records(city, unit) if journal else {}
+            for place_key, record in finished.items():
+                if query in retried:
+                    break  # Already collected on the first attempt
+                place_index.add(place_key, query, record)
+                if record:
+                    if sink:
+                        sink.write(record)
+                        written += 1
+                    else:
+                        all_data.append(record)
+            # Duplicates are journaled too, so their categories are still merged after a resume
+            for place_key in (journal.duplicates(city, unit) if journal else ()):
+                place_index.note(place_key, query)
+            
+            if journal and journal.is_query_done(city, unit):
+                logging.info(f"Skipping '{unit}' in {city} (already in checkpoint journal)")
+                # Tiling decides from the feed size whether to descend into the tile's quarters
+                self.feed_size = journal.feed_size(city, unit) or 0
+                continue
+            
             try:
-                self.search_location(city, query)
+                self.metrics.inc('queries_total')
+                self.feed_size = 0
+                self.search_location(city, query, tile)
                 
                 # Get results container
                 container = self.get_results_container()
                 if not container:
+                    # No results feed: usually a captcha, consent wall or banned proxy
+                    self.metrics.inc('blocked_queries_total')
+                    if raise_errors:
+                        # Fails the task, so it is handed out again (and the worker rotates its proxy)
+                        raise RuntimeError(f"No results feed for '{unit}' in {city}")
                     continue
                 
-                # Scroll to load more results
-                self.scroll_results(container, max_scrolls=5)
+                # Scroll until max_results places are loaded (max_scrolls is only a safety cap)
+                self.scroll_results(container, max_scrolls=25, target_count=max_results)
                 
                 # Get all place elements
-                place_elements = self.driver.find_elements(
-                    By.CSS_SELECTOR, "div[role='feed'] > div > div > a"
-                )
+                if fast_list or refresh is not None:
+                    # One script call snapshots every card in the feed (refresh compares the cards)
+                    place_elements = harvest_feed_cards(self.driver)
+                else:
+                    place_elements = [
+                        {'element': element} for element in self.driver.find_elements(
+                            By.CSS_SELECTOR, "div[role='feed'] > div > div > a"
+                        )
+                    ]
                 
-                logging.info(f"Found {len(place_elements)} places for '{query}' in {city}")
+                self.feed_size = len(place_elements)
+                logging.info(f"Found {len(place_elements)} places for '{unit}' in {city}")
                 
                 # Limit results
                 places_to_scrape = place_elements[:min(len(place_elements), max_results)]
                 
                 for idx, place in enumerate(places_to_scrape, 1):
+                    place_key = None
                     try:
+                        href = place.get('href') or place['element'].get_attribute('href')
+                        place_key = place_id_from_href(href) or f'{query}#{idx}'
+                        if place_key in finished:
+                            continue
+                        
+                        if not place_index.claim(place_key, query):
+                            logging.info(f"Skipping {idx}/{len(places_to_scrape)} (already found by another query)")
+                            self.metrics.inc('places_skipped_total')
+                            if journal:
+                                journal.record_duplicate(city, unit, place_key)
+                            continue
+                        
                         logging.info(f"Processing {idx}/{len(places_to_scrape)}")
                         
-                        data = self.extract_place_data(place)
+                        status = None
+                        if refresh is not None:
+                            status, previous = refresh.check(place_key, place['data'])
+                            self.metrics.inc('refresh_places_total', status=status)
+                        
+                        if status == 'unchanged':
+                            # Same card as in the previous dataset and still fresh: no detail panel
+                            data = refresh.reuse(previous)
+                        elif fast_list:
+                            data = self.extract_card_data(place)
+                        else:
+                            data = self.extract_place_data(place['element'])
                         data['city'] = city
                         data['category'] = query
-                        data['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        # Reused records keep the time their details were read
+                        data['scraped_at'] = data.get('scraped_at') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        data['place_id'] = place_key
+                        
+                        place_index.add(place_key, query, data if data['name'] else None)
                         
                         if data['name']:  # Only add if we got at least a name
-                            all_data.append(data)
+                            self.metrics.record_fields(data)
+                            if sink:
+                                sink.write(data)  # Streamed out immediately
+                                written += 1
+                            else:
+                                all_data.append(data)
+                        
+                        if journal:
+                            journal.record_place(city, unit, place_key, data if data['name'] else None)
                         
-                        self.natural_delay(2, 4)
+                        if not fast_list and status != 'unchanged':
+                            self.natural_delay(2, 4)
                         
                     except Exception as e:
                         logging.error(f"Error processing place {idx}: {str(e)}")
+                        self.metrics.inc('place_errors_total')
+                        if place_key:
+                            place_index.release(place_key)  # Another attempt may claim it again
+                        if not self.driver_alive():
+                            raise
                         continue
                 
+                if self.lean:
+                    report = self.lean.page_report(self.driver)
+                    if report:
+                        logging.info(f"Network for '{query}' in {city}: {self.lean.format(report)}")
+                
+                if journal:
+                    journal.mark_query_done(city, unit, self.feed_size)
+                
             except Exception as e:
                 logging.error(f"Error scraping {query} in {city}: {str(e)}")
+                self.metrics.inc('query_errors_total')
+                if not self.driver_alive():
+                    self.recover_driver()
+                    if query not in retried and not raise_errors:
+                        retried.add(query)
+                        queries.append(query)
+                if raise_errors:
+                    raise  # The caller decides about retries (e.g. through the task queue)
                 continue
         
-        return all_data
+        logging.info(place_index.overlap_summary())
+        if refresh is not None:
+            logging.info(refresh.summary())
+        logging.info(f"Time spent so far: {self.timing.summary()}")
+        logging.info(self.metrics.summary())
+        if self.lean:
+            logging.info(self.lean.summary())
+        return written if sink else all_data
     
     def save_to_csv(self, data, filename):
         """Save data to CSV file"""
@@ -281,55 +526,178 @@ class GoogleMapsScraper:
     def close(self):
         """Close the browser"""
         self.driver.quit()
+        self.driver_factory.close()
+        logging.info(self.driver_factory.latency_summary())
 
 
 def main():
-    # Configuration
-    cities = ['Berlin', 'Leipzig', 'Hamburg']
-    queries = [
-        'restaurant',
-        'cafe',
-        'food',
-        'bistro',
-        'imbiss'
-    ]
+    # Configuration (cities and queries come from config.py; cli.py adds flags and --shard)
+    units = [(city, query) for city in config.CITIES for query in config.SEARCH_QUERIES]
+    workers = 1  # Number of parallel browser workers (1 = single browser)
+    fast_list = False  # Build records from feed cards, click only for missing phone/website
+    event_waits = True  # Wait for page readiness + minimum interval instead of fixed 2-5s sleeps
+    lean = True  # Block images, fonts, media and trackers (saves most of the proxy traffic)
+    standby = True  # Keep a spare Chrome warmed up so a crash does not stall the run
+    enrich_emails = True  # Look up emails on the websites while scraping continues (combined files)
+    normalize_output = True  # Also write a cleaned, typed copy (all_results_*_normalized.csv)
+    refresh = False  # Only re-scrape places that are new, changed or older than REFRESH_TTL_DAYS
     
-    scraper = GoogleMapsScraper(headless=False)  # Set to True to run without browser window
+    # The previous dataset is read from the columnar output in OUTPUT_DIR
+    refresh_index = RefreshIndex.load(cities=config.CITIES, ttl_days=config.REFRESH_TTL_DAYS) if refresh else None
+    
+    run_scraper(units, max_results=config.MAX_RESULTS_PER_QUERY, workers=workers, fast_list=fast_list,
+                enrich_emails=enrich_emails, normalize_output=normalize_output, tile_zoom=config.TILE_ZOOM,
+                refresh=refresh_index, headless=config.HEADLESS_MODE, event_waits=event_waits, lean=lean,
+                standby=standby)
+
+
+def run_scraper(units, max_results=20, workers=1, fast_list=False, enrich_emails=True, normalize_output=True,
+                run_tag='', task_queue=None, tile_zoom=None, refresh=None, **scraper_kwargs):
+    """Scrape a list of (city, query) units, city by city in one browser or with a worker pool
+
+    run_tag is appended to the output file names (e.g. '_shard2of3'). With a task_queue the units
+    are added to it and the workers claim them from there, together with any other process.
+    tile_zoom searches every city tile by tile at that zoom level (see tiling.py). refresh
+    (a refresh.RefreshIndex of the previous dataset) only re-scrapes new, changed or stale places.
+    """
+    if workers > 1 or task_queue is not None:
+        scraper_kwargs.pop('standby', None)  # Workers do not keep spare browsers
+        run_worker_pool(units, workers, max_results=max_results, fast_list=fast_list, enrich_emails=enrich_emails,
+                        normalize_output=normalize_output, run_tag=run_tag, task_queue=task_queue,
+                        tile_zoom=tile_zoom, refresh=refresh, **scraper_kwargs)
+        return
+    
+    scraper = GoogleMapsScraper(**scraper_kwargs)
+    
+    # Journal of finished work; an interrupted run resumes from here
+    journal = CheckpointJournal('scraper_checkpoint.db')
+    
+    # Queries per city, in grid order
+    grid = {}
+    for city, query in units:
+        grid.setdefault(city, []).append(query)
+    
+    run_started = datetime.now()
+    run_timestamp = run_started.strftime('%Y%m%d_%H%M%S') + run_tag
+    categories = {}  # place id -> categories of places found by several queries
+    all_results = None
     
     try:
-        all_results = []
+        # Records are streamed to the combined files in OUTPUT_DIR as they are scraped
+        results_csv = output_path(f'all_results_{run_timestamp}.csv')
+        sinks = [CsvSink(results_csv, fieldnames=config.RECORD_COLUMNS)]
+        if config.SAVE_JSON:
+            sinks.append(JsonlSink(output_path(f'all_results_{run_timestamp}.jsonl')))
+        all_results = MultiSink(sinks)
+        if enrich_emails:
+            # Places are enriched by a background worker pool while Maps scraping continues
+            # In refresh mode websites of fresh previous records keep their email
+            all_results = EnrichmentPipeline(all_results, journal=journal, metrics=scraper.metrics,
+                                             known=refresh.known_emails() if refresh else None)
         
-        for city in cities:
+        for city, queries in grid.items():
             logging.info(f"\n{'='*50}")
             logging.info(f"Starting scraping for {city}")
             logging.info(f"{'='*50}\n")
             
-            city_data = scraper.scrape_city(city, queries, max_results=20)
-            all_results.extend(city_data)
-            
-            # Save intermediate results
+            # Intermediate per-city results
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            scraper.save_to_csv(city_data, f'{city.lower()}_results_{timestamp}.csv')
+            with CsvSink(output_path(f'{city.lower()}_results_{timestamp}.csv'),
+                         fieldnames=config.RECORD_COLUMNS) as city_sink:
+                # One index per city dedupes places across queries (and tile borders)
+                place_index = PlaceIndex()
+                if tile_zoom:
+                    for query in queries:
+                        scrape_tiles(scraper, city, query, city_tiles(city, tile_zoom), max_results=max_results,
+                                     place_index=place_index, journal=journal, fast_list=fast_list,
+                                     sink=MultiSink([all_results, city_sink]), refresh=refresh)
+                else:
+                    scraper.scrape_city(city, queries, max_results=max_results, journal=journal, fast_list=fast_list,
+                                        sink=MultiSink([all_results, city_sink]), place_index=place_index,
+                                        refresh=refresh)
+            apply_categories(city_sink.path, place_index.merged_categories())
+            categories.update(place_index.merged_categories())
             
             # Longer delay between cities
             logging.info(f"Completed {city}. Taking a break...")
             time.sleep(random.uniform(30, 60))
         
-        # Save final combined results
-        final_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        scraper.save_to_csv(all_results, f'all_results_{final_timestamp}.csv')
-        scraper.save_to_excel(all_results, f'all_results_{final_timestamp}.xlsx')
+        # Close the combined files; Excel and Parquet/Arrow (as set in config.py) are built from the finished CSV
+        all_results.close()
+        for sink in sinks:
+            apply_categories(sink.path, categories)
+        # Labels stripped, rating/reviews numeric, phones in E.164, address split into parts
+        normalized = normalize_csv(results_csv) if normalize_output else None
+        export_results(results_csv, run_started, normalized)
         
         logging.info(f"\n{'='*50}")
-        logging.info(f"Scraping completed! Total records: {len(all_results)}")
+        logging.info(f"Scraping completed! Total records: {all_results.count}")
         logging.info(f"{'='*50}")
         
+        # Everything is saved, the next run starts from scratch
+        journal.reset()
+        journal = None
+        
     except Exception as e:
         logging.error(f"Fatal error: {str(e)}")
     
     finally:
+        if all_results:
+            all_results.close()  # Records scraped before an error are still written out
         scraper.close()
+        scraper.metrics.export(output_path(f'metrics_{run_timestamp}'))
+        if journal:
+            journal.close()
+
 
+def run_worker_pool(units, workers, max_results=20, fast_list=False, enrich_emails=False, normalize_output=False,
+                    run_tag='', task_queue=None, tile_zoom=None, refresh=None, **scraper_kwargs):
+    """Scrape (city, query) units with a pool of parallel browsers (claimed from task_queue if given)"""
+    from worker_pool import ScraperWorkerPool
+    
+    if tile_zoom:
+        units = tile_units(units, tile_zoom)  # Every map tile is a work unit of its own
+    
+    # With a shared task queue the queue records finished units; a local journal would go stale
+    journal = CheckpointJournal('scraper_checkpoint.db') if task_queue is None else None
+    metrics = Metrics()  # Shared by every worker, so the report covers the whole grid
+    pool = ScraperWorkerPool(GoogleMapsScraper, workers=workers, scraper_kwargs=dict(scraper_kwargs, metrics=metrics),
+                             scrape_kwargs={'fast_list': fast_list, 'refresh': refresh})
+    
+    # Workers stream records into the combined files as they go
+    run_started = datetime.now()
+    run_timestamp = run_started.strftime('%Y%m%d_%H%M%S') + run_tag
+    results_csv = output_path(f'all_results_{run_timestamp}.csv')
+    sinks = [CsvSink(results_csv, fieldnames=config.RECORD_COLUMNS)]
+    if config.SAVE_JSON:
+        sinks.append(JsonlSink(output_path(f'all_results_{run_timestamp}.jsonl')))
+    sink = MultiSink(sinks)
+    if enrich_emails:
+        sink = EnrichmentPipeline(sink, journal=journal, metrics=metrics,
+                                  known=refresh.known_emails() if refresh else None)
+    with sink:
+        if task_queue is not None:
+            task_queue.add_units(units)
+            total = pool.run_queue(task_queue, max_results=max_results, sink=sink)
+        else:
+            total = pool.run_grid(units, max_results=max_results, journal=journal, sink=sink)
+    for output in sinks:
+        apply_categories(output.path, pool.merged_categories())
+    logging.info(metrics.summary())
+    metrics.export(output_path(f'metrics_{run_timestamp}'))
+    
+    if not total:
+        logging.warning("No data to save")
+        if journal:
+            journal.close()
+        return
+    
+    normalized = normalize_csv(results_csv) if normalize_output else None
+    export_results(results_csv, run_started, normalized)
+    
+    logging.info(f"Scraping completed with {workers} workers! Total records: {total}")
+    if journal:
+        journal.reset()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
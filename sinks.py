@@ -0,0 +1,186 @@
+import csv
+import json
+import logging
+import os
+import threading
+
+
+class RecordSink:
+    """Base class for writing records one at a time (thread-safe, periodically flushed)"""
+
+    def __init__(self, path, flush_every=10):
+        self.path = path
+        self.flush_every = flush_every
+        self.count = 0
+        self.lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+
+    def write(self, record):
+        """Append a single record"""
+        with self.lock:
+            self._write(record)
+            self.count += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush()
+                self._pending = 0
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+            self._pending = 0
+
+    def close(self):
+        with self.lock:
+            if self._closed:
+                return
+            self._flush()
+            self._close()
+            self._closed = True
+        logging.info(f"Saved {self.count} records to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write(self, record):
+        raise NotImplementedError
+
+    def _flush(self):
+        pass
+
+    def _close(self):
+        pass
+
+
+class CsvSink(RecordSink):
+    """Append-only CSV; the header comes from fieldnames (a fixed schema) or else the first record
+
+    Keys outside the header cannot be added to a file already being written; they are left out
+    with a warning (once per key) instead of silently.
+    """
+
+    def __init__(self, path, fieldnames=None, flush_every=10, encoding='utf-8-sig', append=False):
+        super().__init__(path, flush_every)
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.encoding = encoding
+
+        # Appending to an existing file keeps its header
+        resume = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if resume:
+            with open(path, 'r', encoding=encoding, newline='') as f:
+                self.fieldnames = next(csv.reader(f), None) or self.fieldnames
+
+        self.file = open(path, 'a' if append else 'w', encoding=encoding, newline='')
+        self.writer = None
+        self._header_written = resume
+        self._dropped = set()
+
+    def _write(self, record):
+        if self.writer is None:
+            self.fieldnames = self.fieldnames or list(record.keys())
+            self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, extrasaction='ignore')
+            if not self._header_written:
+                self.writer.writeheader()
+                self._header_written = True
+        dropped = [key for key in record if key not in self.writer.fieldnames and key not in self._dropped]
+        if dropped:
+            self._dropped.update(dropped)
+            logging.warning(f"{self.path} has no column for {', '.join(dropped)}; these values are not written")
+        self.writer.writerow(record)
+
+    def _flush(self):
+        self.file.flush()
+
+    def _close(self):
+        # An empty run still produces a file with a header when fieldnames are known
+        if self.writer is None and self.fieldnames and not self._header_written:
+            csv.DictWriter(self.file, fieldnames=self.fieldnames).writeheader()
+        self.file.close()
+
+
+class JsonlSink(RecordSink):
+    """Append-only JSON Lines, one record per line"""
+
+    def __init__(self, path, flush_every=10, append=False):
+        super().__init__(path, flush_every)
+        self.file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+    def _flush(self):
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+class MultiSink:
+    """Fan records out to several sinks"""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    @property
+    def count(self):
+        return self.sinks[0].count if self.sinks else 0
+
+    def write(self, record):
+        for sink in self.sinks:
+            sink.write(record)
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class OrderedSink:
+    """Writes records finished out of order (by index) to a sink in their original order"""
+
+    def __init__(self, sink, start=0):
+        self.sink = sink
+        self.next_index = start
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def write_at(self, index, record):
+        """Record for position index is done; writes every record that is now in sequence"""
+        with self.lock:
+            self.pending[index] = record
+            while self.next_index in self.pending:
+                self.sink.write(self.pending.pop(self.next_index))
+                self.next_index += 1
+
+
+def csv_to_excel(csv_path, excel_path):
+    """Convert a finished CSV file to Excel"""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+    if df.empty:
+        logging.warning("No data to save")
+        return
+    df.to_excel(excel_path, index=False, engine='openpyxl')
+    logging.info(f"Saved {len(df)} records to {excel_path}")
@@ -0,0 +1,268 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# Seconds an idle worker waits before asking again while other workers still hold leases
+POLL_SECONDS = 10
+
+# Largest number of keys looked up in one query
+KEY_CHUNK = 500
+
+
+def worker_name():
+    """Name of this process in lease records, e.g. 'crawler-2-48213'"""
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+class TaskQueue:
+    """Durable SQLite task queue shared by worker processes; tasks are claimed with a time-limited lease
+
+    A worker renews its lease while it works (keep_alive) and completes, fails or releases the task.
+    Tasks of a worker that crashed or stalled are handed to the next worker once the lease expires;
+    failed tasks are retried with backoff until max_attempts. Results expire after expire_after
+    seconds (None: never): adding an expired key again reopens its task, so a later run repeats the
+    work instead of finding everything done. Any number of processes can join or leave during a run.
+    Processes on several machines can share the file on a disk they all mount, with wal=False (WAL
+    needs shared memory) and clocks kept in sync (leases use wall-clock time).
+    """
+
+    def __init__(self, path='task_queue.db', lease_seconds=300, max_attempts=3, retry_delay=30, wal=True,
+                 expire_after=12 * 3600):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.expire_after = expire_after
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay  # Doubled after every failed attempt
+        self.lock = threading.Lock()
+        # Autocommit, so claims can run in an explicit BEGIN IMMEDIATE transaction
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                not_before REAL NOT NULL DEFAULT 0,
+                lease_id TEXT,
+                worker TEXT,
+                lease_until REAL,
+                result TEXT,
+                error TEXT,
+                expires_at REAL,
+                updated_at TEXT NOT NULL,
+                UNIQUE (kind, key)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (kind, status, not_before);
+        ''')
+
+    def _now(self):
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def _expires_at(self, expire_after):
+        expire_after = self.expire_after if expire_after is None else expire_after
+        return time.time() + expire_after if expire_after is not None else None
+
+    def _write(self, sql, params):
+        with self.lock:
+            return self.conn.execute(sql, params).rowcount
+
+    def _read(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # --- Adding work ------------------------------------------------------
+
+    def add(self, kind, items):
+        """Add (key, payload) tasks of a kind; keys already in the queue are left as they are
+
+        Finished tasks whose result has expired are reopened with the new payload. Returns the
+        number of new and reopened tasks, so every worker can add the same grid safely.
+        """
+        now, checked_at = self._now(), time.time()
+        rows = [(kind, key, json.dumps(payload, ensure_ascii=False), now) for key, payload in items]
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.executemany(
+                    "UPDATE tasks SET payload = ?, status = 'pending', attempts = 0, not_before = 0, result = NULL, "
+                    "error = NULL, expires_at = NULL, updated_at = ? "
+                    "WHERE kind = ? AND key = ? AND status IN ('done', 'failed') AND expires_at <= ?",
+                    [(payload, now, kind, key, checked_at) for kind, key, payload, _ in rows])
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO tasks (kind, key, payload, updated_at) VALUES (?, ?, ?, ?)', rows)
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            return self.conn.total_changes - before
+
+    def add_units(self, units):
+        """Add (city, query) work units, or (city, query, tile) map tiles, as 'maps' tasks"""
+        items = []
+        for city, query, *tile in units:
+            key, payload = f'{city}|{query}', {'city': city, 'query': query}
+            if tile:
+                key, payload['tile'] = f'{key}|{tile[0].key}', tile[0].to_dict()
+            items.append((key, payload))
+        added = self.add('maps', items)
+        logging.info(f"Task queue {self.path}: {added} new work units")
+        if not added and self.is_drained('maps'):
+            logging.warning(f"Every work unit in {self.path} is already finished; use a new queue file "
+                            f"(or wait until the results expire) to scrape them again")
+        return added
+
+    def requeue_failed(self, kind):
+        """Give failed tasks of a kind a fresh set of attempts"""
+        return self._write("UPDATE tasks SET status = 'pending', attempts = 0, not_before = 0, updated_at = ? "
+                           "WHERE kind = ? AND status = 'failed'", (self._now(), kind))
+
+    # --- Leases -----------------------------------------------------------
+
+    def claim(self, kind, worker):
+        """Lease the next available task of a kind, or return None if there is none right now"""
+        tasks = self.claim_batch(kind, worker, limit=1)
+        return tasks[0] if tasks else None
+
+    def claim_batch(self, kind, worker, limit=10):
+        """Lease up to limit available tasks: pending ones past their retry delay and expired leases"""
+        now = time.time()
+        tasks = []
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                # An expired lease on the last attempt means the task keeps killing its workers
+                self.conn.execute("UPDATE tasks SET status = 'failed', lease_id = NULL, "
+                                  "error = COALESCE(error, 'lease expired'), expires_at = ?, updated_at = ? "
+                                  "WHERE kind = ? AND status = 'leased' AND lease_until < ? AND attempts >= ?",
+                                  (self._expires_at(None), self._now(), kind, now, self.max_attempts))
+                rows = self.conn.execute(
+                    "SELECT id, key, payload, status, attempts, worker FROM tasks WHERE kind = ? AND "
+                    "((status = 'pending' AND not_before <= ?) OR (status = 'leased' AND lease_until < ?)) "
+                    "ORDER BY id LIMIT ?", (kind, now, now, limit)
+                ).fetchall()
+                for task_id, key, payload, status, attempts, previous in rows:
+                    if status == 'leased':
+                        logging.warning(f"Lease of {kind} task '{key}' held by {previous} expired, reassigning")
+                    lease_id = uuid.uuid4().hex
+                    self.conn.execute("UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_id = ?, "
+                                      "worker = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                                      (lease_id, worker, now + self.lease_seconds, self._now(), task_id))
+                    tasks.append({'id': task_id, 'kind': kind, 'key': key, 'payload': json.loads(payload),
+                                  'attempts': attempts + 1, 'lease_id': lease_id, 'worker': worker})
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        return tasks
+
+    def heartbeat(self, task):
+        """Extend a task's lease; False if it was lost (expired and handed to another worker)"""
+        return self._write("UPDATE tasks SET lease_until = ? WHERE id = ? AND lease_id = ? AND status = 'leased'",
+                           (time.time() + self.lease_seconds, task['id'], task['lease_id'])) == 1
+
+    @contextmanager
+    def keep_alive(self, tasks, interval=None):
+        """Renew the lease of a task (or list of tasks) from a background thread while the block runs"""
+        tasks = list(tasks) if isinstance(tasks, list) else [tasks]
+        stop = threading.Event()
+
+        def beat():
+            while tasks and not stop.wait(interval or self.lease_seconds / 3):
+                for task in list(tasks):
+                    if not self.heartbeat(task):
+                        logging.warning(f"Lost the lease of {task['kind']} task '{task['key']}'")
+                        tasks.remove(task)
+
+        thread = threading.Thread(target=beat, name='task-heartbeat', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, task, result=None, expire_after=None):
+        """Mark a leased task as done; False if the lease was lost meanwhile
+
+        expire_after (seconds) overrides the queue's result lifetime for this task.
+        """
+        payload = json.dumps(result, ensure_ascii=False) if result is not None else None
+        return self._write("UPDATE tasks SET status = 'done', result = ?, error = NULL, lease_id = NULL, "
+                           "expires_at = ?, updated_at = ? WHERE id = ? AND lease_id = ? AND status = 'leased'",
+                           (payload, self._expires_at(expire_after), self._now(), task['id'],
+                            task['lease_id'])) == 1
+
+    def fail(self, task, error, retry=True, expire_after=None):
+        """Give a task back after an error: retried after a backoff, or failed after max_attempts
+
+        A failed task expires like a result (expire_after overrides the queue's lifetime).
+        """
+        if retry and task['attempts'] < self.max_attempts:
+            not_before = time.time() + self.retry_delay * 2 ** (task['attempts'] - 1)
+            status, expires_at = 'pending', None
+        else:
+            status, not_before, expires_at = 'failed', 0, self._expires_at(expire_after)
+        return self._write("UPDATE tasks SET status = ?, not_before = ?, error = ?, lease_id = NULL, expires_at = ?, "
+                           "updated_at = ? WHERE id = ? AND lease_id = ? AND status = 'leased'",
+                           (status, not_before, str(error)[:500], expires_at, self._now(), task['id'],
+                            task['lease_id'])) == 1
+
+    def release(self, task):
+        """Give an unfinished task back without counting the attempt (e.g. on shutdown)"""
+        return self._write("UPDATE tasks SET status = 'pending', attempts = attempts - 1, not_before = 0, "
+                           "lease_id = NULL, updated_at = ? WHERE id = ? AND lease_id = ? AND status = 'leased'",
+                           (self._now(), task['id'], task['lease_id'])) == 1
+
+    # --- Progress ---------------------------------------------------------
+
+    def is_drained(self, kind):
+        """Check whether no task of a kind is pending or leased any more"""
+        return not self._read("SELECT 1 FROM tasks WHERE kind = ? AND status IN ('pending', 'leased') LIMIT 1",
+                              (kind,))
+
+    def finished(self, kind, keys):
+        """Return {key: result} for the given keys that are done (result None for failed tasks)"""
+        keys = list(keys)
+        finished = {}
+        for start in range(0, len(keys), KEY_CHUNK):
+            chunk = keys[start:start + KEY_CHUNK]
+            rows = self._read(f"SELECT key, status, result FROM tasks WHERE kind = ? AND status IN ('done', 'failed') "
+                              f"AND key IN ({', '.join('?' * len(chunk))})", [kind] + chunk)
+            for key, status, result in rows:
+                finished[key] = json.loads(result) if status == 'done' and result else None
+        return finished
+
+    def stats(self, kind=None):
+        """Return {status: count}, optionally for one kind"""
+        if kind is None:
+            rows = self._read('SELECT status, COUNT(*) FROM tasks GROUP BY status')
+        else:
+            rows = self._read('SELECT status, COUNT(*) FROM tasks WHERE kind = ? GROUP BY status', (kind,))
+        return dict(rows)
+
+    # --- Lifecycle --------------------------------------------------------
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.conn.close()
+
+    def reset(self):
+        """Delete the queue file (only once every worker has finished)"""
+        self.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+        logging.info(f"Task queue {self.path} cleared")
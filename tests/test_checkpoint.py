@@ -0,0 +1,76 @@
+import os
+import sqlite3
+
+import pytest
+
+from checkpoint import CheckpointJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = CheckpointJournal(str(tmp_path / 'checkpoint.db'))
+    yield journal
+    journal.close()
+
+
+def test_places_are_replayed_in_order(journal):
+    journal.record_place('Berlin', 'pizza', 'p2', {'name': 'Roma'})
+    journal.record_place('Berlin', 'pizza', 'p1', None)  # Yielded no data
+    journal.record_place('Berlin', 'sushi', 'p3', {'name': 'Sakura'})
+    journal.record_place('Hamburg', 'pizza', 'p4', {'name': 'Elbe'})
+
+    assert journal.place_records('Berlin', 'pizza') == {'p2': {'name': 'Roma'}, 'p1': None}
+    assert list(journal.place_records('Berlin', 'pizza')) == ['p2', 'p1']
+    assert journal.records('Berlin') == [{'name': 'Roma'}, {'name': 'Sakura'}]
+    assert len(journal.records()) == 3
+    assert journal.place_records('Berlin', 'cafe') == {}
+
+
+def test_queries_and_feed_sizes(journal):
+    assert not journal.is_query_done('Berlin', 'pizza')
+    assert journal.feed_size('Berlin', 'pizza') is None
+    journal.mark_query_done('Berlin', 'pizza', 20)
+    assert journal.is_query_done('Berlin', 'pizza')
+    assert journal.feed_size('Berlin', 'pizza') == 20
+    assert not journal.is_query_done('Hamburg', 'pizza')
+
+
+def test_duplicates_and_emails(journal):
+    journal.record_duplicate('Berlin', 'italian', 'p2')
+    journal.record_duplicate('Berlin', 'italian', 'p2')
+    assert journal.duplicates('Berlin', 'italian') == ['p2']
+
+    assert journal.get_email('https://roma.de') is None
+    journal.record_email('https://roma.de', None)
+    assert journal.get_email('https://roma.de') == ''
+    journal.record_email('https://roma.de', 'info@roma.de')
+    assert journal.get_email('https://roma.de') == 'info@roma.de'
+
+
+def test_resume_after_reopening(tmp_path):
+    path = str(tmp_path / 'checkpoint.db')
+    journal = CheckpointJournal(path)
+    journal.record_place('Berlin', 'pizza', 'p1', {'name': 'Röma'})
+    journal.mark_query_done('Berlin', 'pizza', 1)
+    journal.close()
+
+    journal = CheckpointJournal(path)
+    assert journal.place_records('Berlin', 'pizza') == {'p1': {'name': 'Röma'}}
+    assert journal.is_query_done('Berlin', 'pizza')
+    journal.reset()
+    assert not os.path.exists(path)
+
+
+def test_old_journal_gets_the_feed_size_column(tmp_path):
+    path = str(tmp_path / 'checkpoint.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE queries (city TEXT NOT NULL, query TEXT NOT NULL, finished_at TEXT NOT NULL, '
+                 'PRIMARY KEY (city, query))')
+    conn.execute("INSERT INTO queries VALUES ('Berlin', 'pizza', '2025-01-01 00:00:00')")
+    conn.commit()
+    conn.close()
+
+    journal = CheckpointJournal(path)
+    assert journal.is_query_done('Berlin', 'pizza')
+    assert journal.feed_size('Berlin', 'pizza') is None
+    journal.close()
@@ -0,0 +1,47 @@
+import argparse
+
+import pytest
+
+import config
+from cli import build_parser, parse_list, parse_shard, select_shard, shard_of, work_grid
+
+UNITS = work_grid(['Berlin', 'Leipzig', 'Hamburg', 'Munich'], ['restaurant', 'cafe', 'pizzeria', 'sushi'])
+
+
+def test_work_grid_is_city_by_city():
+    assert work_grid(['Berlin', 'Hamburg'], ['cafe', 'bar']) == [
+        ('Berlin', 'cafe'), ('Berlin', 'bar'), ('Hamburg', 'cafe'), ('Hamburg', 'bar')]
+
+
+def test_shard_of_ignores_case_whitespace_and_grid_order():
+    assert shard_of('Berlin', 'cafe', 5) == shard_of(' berlin ', 'CAFE', 5)
+    assert 1 <= shard_of('Berlin', 'cafe', 5) <= 5
+    assert shard_of('Berlin', 'cafe', 1) == 1
+    assert select_shard(list(reversed(UNITS)), 2, 3) == list(reversed(select_shard(UNITS, 2, 3)))
+
+
+def test_shards_split_the_grid_without_overlap():
+    shards = [select_shard(UNITS, index, 3) for index in (1, 2, 3)]
+    assert sorted(unit for shard in shards for unit in shard) == sorted(UNITS)
+    assert all(shards)  # 16 units over 3 shards: none is left empty
+
+
+def test_parse_shard():
+    assert parse_shard('2/3') == (2, 3)
+    for value in ('0/3', '4/3', '1/0', 'two/3', '2'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(value)
+
+
+def test_parse_list():
+    assert parse_list(' Berlin, Hamburg ,,') == ['Berlin', 'Hamburg']
+
+
+
+def test_headless_can_be_switched_off(monkeypatch):
+    monkeypatch.setattr(config, 'HEADLESS_MODE', True)
+    parser = build_parser()
+    assert parser.parse_args([]).headless
+    assert not parser.parse_args(['--no-headless']).headless
+    monkeypatch.setattr(config, 'HEADLESS_MODE', False)
+    assert build_parser().parse_args(['--headless']).headless
@@ -0,0 +1,60 @@
+import email_cache
+from email_cache import EmailCache, canonical_domain, canonical_url, site_key
+
+
+def test_canonical_domain():
+    assert canonical_domain('https://www.melia.com/de/hotels') == 'melia.com'
+    assert canonical_domain('shop.example.co.uk') == 'example.co.uk'
+    assert canonical_domain('http://127.0.0.1:8000/') == '127.0.0.1:8000'
+
+
+def test_canonical_url_drops_tracking_params():
+    assert canonical_url('WWW.Roma.de/menu?utm_source=maps&lang=de#top') == 'http://www.roma.de/menu?lang=de'
+
+
+def test_site_key():
+    assert site_key('https://www.melia.com/de/hotels') == 'melia.com'
+    assert site_key('http://user@Roma.de:8080/') == 'roma.de:8080'
+    # Businesses on a platform host are told apart by their path
+    assert site_key('https://speisekartenweb.de/restaurants/berlin/elefant-60615/?utm_source=x') == \
+        'speisekartenweb.de/restaurants/berlin/elefant-60615'
+    assert site_key('https://www.facebook.com/Roma.Berlin') != site_key('https://www.facebook.com/elefant')
+
+
+def make_cache(tmp_path, monkeypatch, **kwargs):
+    clock = [1000.0]
+    monkeypatch.setattr(email_cache.time, 'time', lambda: clock[0])
+    return EmailCache(str(tmp_path / 'cache.db'), **kwargs), clock
+
+
+def test_ttl(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl_days=2, negative_ttl_days=1)
+    cache.put('roma.de', 'info@roma.de')
+    cache.put('elefant.de', '')
+    assert cache.get('missing.de') is None
+    assert cache.get('elefant.de') == ''
+
+    clock[0] += 1.5 * 86400  # Past the negative TTL only
+    assert cache.get('elefant.de') is None
+    assert cache.get('roma.de') == 'info@roma.de'
+
+    clock[0] += 86400
+    assert cache.get('roma.de') is None
+    assert (cache.hits, cache.misses) == (2, 3)
+    cache.close()
+
+
+def test_lru_eviction(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, max_entries=2)
+    cache.put('a.de', 'a@a.de')
+    clock[0] += 1
+    cache.put('b.de', 'b@b.de')
+    clock[0] += 1
+    assert cache.get('a.de') == 'a@a.de'  # a is now more recently used than b
+    clock[0] += 1
+    cache.put('c.de', 'c@c.de')
+
+    assert cache.get('b.de') is None
+    assert cache.get('a.de') == 'a@a.de'
+    assert cache.get('c.de') == 'c@c.de'
+    cache.close()
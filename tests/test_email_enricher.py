@@ -0,0 +1,88 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import config
+from email_enricher import enrich_websites
+
+PAGES = {
+    # Contact page ranking: the Impressum is visited before the Kontakt page listed first
+    '/ranked/': '<p>Willkommen</p><a href="/ranked/kontakt">Kontakt</a> <a href="/ranked/impressum">Impressum</a>',
+    '/ranked/kontakt': '<a href="mailto:kontakt@web.de">Schreiben Sie uns</a>',
+    '/ranked/impressum': '<p>Inhaber: Max</p><a href="mailto:impressum@gmx.de">impressum@gmx.de</a>',
+    # A mailto link beats an address that is only in the text
+    '/mailto/': '<p>Fragen? text@gmx.de</p><a href="mailto:reservierung@web.de">Reservieren</a>',
+    # A free-mail address in the text is kept when nothing better exists
+    '/text/': '<p>Bestellungen an roma.berlin@gmx.de</p>',
+    # Ranked over every page read: the Impressum's free-mail address beats the homepage's foreign one
+    '/foreign/': '<p>Webdesign: hello@agentur.de</p><a href="/foreign/impressum">Impressum</a>',
+    '/foreign/impressum': '<p>Inhaber: Max, roma.berlin@gmx.de</p>',
+    # Built client-side: only a browser can read it
+    '/spa/': '<div id="root"></div><script src="/spa/app.js"></script>',
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/broken/'):
+            self.send_error(503)
+            return
+        if self.path.startswith('/slow/'):
+            time.sleep(2)
+        body = PAGES.get(self.path, '<p>Nichts</p>').encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def results(server, monkeypatch):
+    monkeypatch.setattr(config, 'EMAIL_PAGE_TIMEOUT', 0.5)
+    sites = ['ranked', 'mailto', 'text', 'foreign', 'spa', 'broken', 'slow']
+    found = enrich_websites([f'{server}/{site}/' for site in sites], concurrency=4)
+    return {site: found[f'{server}/{site}/'] for site in sites}
+
+
+def test_impressum_is_checked_first(results):
+    assert results['ranked']['email'] == 'impressum@gmx.de'
+    assert results['ranked']['pages'] == 2
+
+
+def test_mailto_beats_text(results):
+    assert results['mailto']['email'] == 'reservierung@web.de'
+    assert results['text']['email'] == 'roma.berlin@gmx.de'
+    assert not results['text']['needs_browser'] and results['text']['error'] is None
+
+
+def test_fallback_is_ranked_across_pages(results):
+    assert results['foreign']['email'] == 'roma.berlin@gmx.de'
+    assert results['foreign']['pages'] == 2
+
+
+def test_js_rendered_page_needs_browser(results):
+    assert results['spa']['email'] == ''
+    assert results['spa']['needs_browser'] and results['spa']['error'] is None
+
+
+def test_failed_fetches_are_not_negative_results(results):
+    assert results['broken'] == {'email': '', 'needs_browser': True, 'pages': 0, 'error': 'HTTP 503'}
+    assert results['slow']['error'] == 'timeout'
+    assert results['slow']['needs_browser']
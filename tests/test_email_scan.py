@@ -0,0 +1,56 @@
+from email_scan import best_email, clean_candidates, is_placeholder, rank_contact_links, scan_markup
+
+
+def test_mailto_beats_text():
+    candidates = [('info@gmx.de', 'text'), ('kontakt@agentur.de', 'mailto')]
+    assert best_email(candidates) == ('kontakt@agentur.de', True)
+
+
+def test_own_domain_is_confident():
+    candidates = [('webmaster@agentur.de', 'text'), ('info@ristorante-roma.de', 'text')]
+    assert best_email(candidates, 'https://www.ristorante-roma.de/kontakt') == ('info@ristorante-roma.de', True)
+
+
+def test_foreign_text_address_falls_back_to_freemail():
+    candidates = [('webmaster@agentur.de', 'text'), ('roma.berlin@gmx.de', 'text')]
+    assert best_email(candidates, 'https://ristorante-roma.de') == ('roma.berlin@gmx.de', False)
+
+
+def test_foreign_text_address_alone_is_a_low_confidence_fallback():
+    assert best_email([('webmaster@agentur.de', 'text')], 'https://ristorante-roma.de') == ('webmaster@agentur.de', False)
+
+
+def test_platform_addresses_are_skipped():
+    candidates = [('impressum@speisekartenweb.de', 'mailto'), ('elefant@web.de', 'text')]
+    assert best_email(candidates) == ('elefant@web.de', False)
+    assert best_email([]) == ('', False)
+
+
+def test_placeholders():
+    assert is_placeholder('your.name@gmail.com')
+    assert is_placeholder('info@example.com')
+    assert is_placeholder('abc123@sentry.io')
+    assert is_placeholder('logo@2x.png')
+    # Whole parts only: real addresses that merely contain a placeholder word stay
+    assert not is_placeholder('vorname@restaurant.de')
+    assert not is_placeholder('info@email.de')
+    assert not is_placeholder('username1@domainhaus.de')
+
+
+def test_clean_candidates_dedupes_and_puts_mailto_first():
+    pairs = [('Info@Roma.de', 'text'), ('info@roma.de.', 'mailto'), ('icon@logo.png', 'text'),
+             ('yourname@firma.de', 'text'), ('chef@roma.de', 'text')]
+    assert clean_candidates(pairs) == [('info@roma.de', 'mailto'), ('chef@roma.de', 'text')]
+
+
+def test_scan_markup_decodes_mailto_and_entities():
+    markup = ('<a href="mailto:kontakt%40roma.de?subject=Reservierung">Mail</a>'
+              '<p>info&#64;roma.de</p><img src="hero@2x.jpg">')
+    assert scan_markup(markup) == [('kontakt@roma.de', 'mailto'), ('info@roma.de', 'text')]
+
+
+def test_rank_contact_links_keeps_same_site_by_keyword_priority():
+    links = [('/impressum', 'Impressum'), ('https://other.de/kontakt', 'Kontakt'), ('/kontakt#form', 'Kontakt'),
+             ('mailto:info@roma.de', 'Mail')]
+    ranked = rank_contact_links(links, 'https://roma.de/', ['kontakt', 'impressum'])
+    assert ranked == ['https://roma.de/kontakt', 'https://roma.de/impressum']
@@ -0,0 +1,74 @@
+import csv
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import config
+from export import export_results, load_columnar, write_columnar
+from normalize import normalize_records
+
+pytest.importorskip('pyarrow')
+
+RUN = datetime(2025, 11, 18, 9, 30, 0)
+ROWS = [
+    {'name': 'Roma', 'city': 'Berlin', 'category': 'pizza', 'phone': '030 20607900', 'rating': '4,5',
+     'reviews_count': '(1.234)', 'scraped_at': '2025-11-18 09:31:00'},
+    {'name': 'Elbe', 'city': 'Hamburg', 'category': 'pizza', 'phone': '040 123456', 'rating': '4,1',
+     'reviews_count': '87', 'scraped_at': '2025-11-18 09:40:00'},
+    {'name': 'Irgendwo', 'city': '', 'category': 'cafe', 'phone': '', 'rating': '', 'reviews_count': '',
+     'scraped_at': '2025-11-18 09:45:00'},
+]
+
+
+def records():
+    return normalize_records(pd.DataFrame(ROWS, dtype=str))
+
+
+def part_files(root):
+    return sorted(os.path.relpath(os.path.join(directory, name), root)
+                  for directory, _, names in os.walk(root) for name in names)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_hive_partitioned_layout(tmp_path, fmt):
+    root = write_columnar(records(), RUN, fmt, output_dir=str(tmp_path))
+    assert root == str(tmp_path / f'results.{fmt}')
+    assert part_files(root) == [
+        os.path.join(f'city={city}', 'run_date=2025-11-18', f'part-20251118_093000-0.{fmt}')
+        for city in ('Berlin', 'Hamburg', 'unknown')]
+
+    berlin = load_columnar(fmt, output_dir=str(tmp_path), city='Berlin')
+    assert berlin['name'].tolist() == ['Roma']
+    assert berlin['rating'].tolist() == [4.5] and berlin['reviews_count'].tolist() == [1234]
+    assert str(berlin['scraped_at'].dtype).startswith('datetime64')
+
+
+def test_later_runs_add_part_files(tmp_path):
+    write_columnar(records(), RUN, output_dir=str(tmp_path))
+    write_columnar(records(), RUN.replace(hour=15), output_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path / 'results.parquet' / 'city=Berlin' / 'run_date=2025-11-18')) == 2
+    assert len(load_columnar(output_dir=str(tmp_path), run_date='2025-11-18')) == 6
+    with pytest.raises(ValueError):
+        write_columnar(records(), RUN, 'orc', output_dir=str(tmp_path))
+
+
+def test_export_results_keeps_the_only_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'OUTPUT_DIR', str(tmp_path))
+    monkeypatch.setattr(config, 'SAVE_EXCEL', False)
+    monkeypatch.setattr(config, 'SAVE_CSV', False)
+    csv_path = tmp_path / 'all_results.csv'
+    with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows(ROWS)
+
+    monkeypatch.setattr(config, 'COLUMNAR_FORMAT', None)
+    export_results(str(csv_path), RUN)
+    assert csv_path.exists()
+
+    monkeypatch.setattr(config, 'COLUMNAR_FORMAT', 'parquet')
+    export_results(str(csv_path), RUN)
+    assert not csv_path.exists()
+    assert len(load_columnar()) == 3
@@ -0,0 +1,61 @@
+from maps_dom import parse_feed_card, parse_place_details
+
+
+def test_parse_place_details():
+    raw = {
+        'name': 'Ristorante Roma',
+        'address': 'Address: Gubener Str. 48, 10243 Berlin',
+        'phone': 'Phone: 030 20607900',
+        'website': 'https://ristorante-roma.de/',
+        'rating': '4,5',
+        'reviews': '1,234 reviews',
+        'emails': [['info@gmx.de', 'text'], ['reservierung@ristorante-roma.de', 'mailto'],
+                   ['logo@2x.png', 'text']]
+    }
+    assert parse_place_details(raw) == {
+        'name': 'Ristorante Roma',
+        'address': 'Gubener Str. 48, 10243 Berlin',
+        'phone': '030 20607900',
+        'website': 'https://ristorante-roma.de/',
+        'email': 'reservierung@ristorante-roma.de',
+        'rating': '4,5',
+        'reviews_count': '1,234'
+    }
+
+
+def test_parse_place_details_of_an_empty_panel():
+    empty = {'name': None, 'address': None, 'phone': None, 'website': None, 'email': None, 'rating': None,
+             'reviews_count': None}
+    assert parse_place_details(None) == empty
+    # Reviews are only read next to a rating, and platform addresses are not the business's
+    raw = {'name': '', 'reviews': '12 reviews', 'emails': [['impressum@speisekartenweb.de', 'mailto']]}
+    assert parse_place_details(raw) == empty
+
+
+def test_parse_feed_card():
+    raw = {
+        'href': 'https://www.google.com/maps/place/Roma/data=!4m7!3m6!1s0x47a84e373f035901:0x42120465b5e3b70',
+        'name': 'Ristorante Roma',
+        'rating': '4,5',
+        'reviews': '(1.234)',
+        'phone': '030 20607900',
+        'website': 'https://ristorante-roma.de/',
+        'info_rows': ['4,5(1.234) · €€', 'Italienisch · € · Gubener Str. 48', 'Geöffnet · Schließt um 22:00']
+    }
+    data, category = parse_feed_card(raw)
+    assert category == 'Italienisch'
+    assert data == {
+        'name': 'Ristorante Roma',
+        'address': 'Gubener Str. 48',
+        'phone': '030 20607900',
+        'website': 'https://ristorante-roma.de/',
+        'email': None,
+        'rating': '4,5',
+        'reviews_count': '1.234'
+    }
+
+
+def test_parse_feed_card_without_info():
+    data, category = parse_feed_card({'name': 'Imbiss', 'info_rows': ['Öffnet um 11:00 · Mo']})
+    assert category is None
+    assert data['address'] is None and data['reviews_count'] is None and data['phone'] is None
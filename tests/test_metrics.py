@@ -0,0 +1,85 @@
+import json
+import threading
+
+import pytest
+
+from metrics import Histogram, Metrics, label_string, timed
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = Histogram(buckets=(0.1, 1), window=4)
+    for value in (0.05, 0.1, 0.5, 2, 3):
+        histogram.observe(value)
+    # Upper bounds are inclusive; values above the last bound only count towards +Inf
+    assert histogram.bucket_counts == [2, 1]
+    assert histogram.count == 5 and histogram.max == 3
+    # Percentiles come from the recent window only
+    assert list(histogram.recent) == [0.1, 0.5, 2, 3]
+    assert histogram.percentile(50) == 2
+    assert Histogram().percentile(50) is None
+
+
+def test_counters_are_thread_safe():
+    metrics = Metrics()
+
+    def count():
+        for _ in range(1000):
+            metrics.inc('places_total')
+            metrics.inc('refresh_places_total', status='new')
+
+    threads = [threading.Thread(target=count) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.counters[('places_total', ())] == 4000
+    assert metrics.counters[('refresh_places_total', (('status', 'new'),))] == 4000
+
+
+class Worker:
+    def __init__(self):
+        self.metrics = Metrics()
+
+    @timed('search_location')
+    def search(self, fail=False):
+        if fail:
+            raise ValueError('no feed')
+        return 'ok'
+
+
+def test_stages_count_calls_and_errors():
+    worker = Worker()
+    assert worker.search() == 'ok'
+    with pytest.raises(ValueError):
+        worker.search(fail=True)
+    stages = worker.metrics.stages()
+    assert stages['search_location']['count'] == 2
+    assert stages['search_location']['errors'] == 1
+
+
+def test_report_snapshot(tmp_path):
+    metrics = Metrics()
+    metrics.inc('queries_total', 2)
+    metrics.observe('stage_seconds', 0.2, stage='scroll_results')
+    metrics.record_fields({'name': 'Roma', 'phone': '030 123', 'email': ''})
+    metrics.record_fields({'name': 'Saigon'})
+
+    report = metrics.report()
+    assert report['counters']['queries_total'] == 2
+    assert report['counters']['field_present_total{field="name"}'] == 2
+    assert report['field_success']['name'] == 1.0
+    assert report['field_success']['phone'] == 0.5
+    assert report['field_success']['email'] == 0.0
+    assert report['stages']['scroll_results']['count'] == 1
+    assert report['histograms']['stage_seconds{stage="scroll_results"}']['total_s'] == 0.2
+
+    json_path, prom_path = metrics.export(str(tmp_path / 'run'))
+    with open(json_path, encoding='utf-8') as f:
+        assert json.load(f)['counters'] == report['counters']
+    with open(prom_path, encoding='utf-8') as f:
+        prom = f.read()
+    assert '# TYPE scraper_queries_total counter\nscraper_queries_total 2\n' in prom
+    assert 'scraper_stage_seconds_bucket{stage="scroll_results",le="0.25"} 1\n' in prom
+    assert 'scraper_stage_seconds_bucket{stage="scroll_results",le="+Inf"} 1\n' in prom
+    assert 'scraper_field_success_ratio{field="phone"} 0.5\n' in prom
+    assert label_string(()) == ''
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from normalize import SCHEMA, clean_text, normalize_records, parse_failures, split_address, to_count, to_e164, to_rating
+
+
+def test_clean_text_strips_labels_icons_and_whitespace():
+    values = pd.Series(['  Website: roma.de ', ' Adresse: Hauptstr. 1', '  ', None])
+    assert clean_text(values).tolist() == ['roma.de', 'Hauptstr. 1', pd.NA, pd.NA]
+
+
+def test_to_e164():
+    values = pd.Series(['Telefon: 030 20607900', '+49 (0)30 2060 7900', '0049 30 20607900', '+43 1 5134321',
+                        '12', None])
+    assert to_e164(values).tolist() == ['+493020607900', '+493020607900', '+493020607900', '+4315134321',
+                                        pd.NA, pd.NA]
+
+
+def test_to_rating():
+    assert to_rating(pd.Series(['4,4', '4.5 stars', '7', ''])).tolist() == [4.4, 4.5, pd.NA, pd.NA]
+    assert to_rating(pd.Series([4.0, 0.0])).tolist() == [4.0, pd.NA]
+
+
+def test_to_count():
+    assert to_count(pd.Series(['(1.234)', '1,234', '87', '', None])).tolist() == [1234, 1234, 87, pd.NA, pd.NA]
+    assert to_count(pd.Series([12.0, None])).tolist() == [12, pd.NA]
+
+
+def test_split_address():
+    address, parts = split_address(pd.Series(['Adresse: Unter den Linden 77, 10117 Berlin, Deutschland',
+                                              'Somewhere near 10115 Berlin']))
+    assert address.tolist() == ['Unter den Linden 77, 10117 Berlin, Deutschland', 'Somewhere near 10115 Berlin']
+    assert parts['street'].tolist() == ['Unter den Linden 77', pd.NA]
+    assert parts['postal_code'].tolist() == ['10117', '10115']
+    assert parts['locality'].tolist() == ['Berlin', pd.NA]
+
+
+def test_normalize_records_types_the_schema_and_keeps_extra_columns():
+    raw = pd.DataFrame([{'name': ' Roma ', 'address': 'Unter den Linden 77, 10117 Berlin', 'phone': '030 20607900',
+                         'email': 'Info@Roma.de', 'rating': '4,4', 'reviews_count': '(1.234)', 'city': 'Berlin',
+                         'scraped_at': '2025-01-18 14:30:25', 'extra': 'x'}])
+    df = normalize_records(raw)
+    assert list(df.columns) == list(SCHEMA) + ['extra']
+    assert str(df['rating'].dtype) == 'Float64' and str(df['city'].dtype) == 'category'
+    row = df.iloc[0]
+    assert (row['name'], row['phone'], row['email'], row['rating'], row['reviews_count']) == \
+        ('Roma', '+493020607900', 'info@roma.de', 4.4, 1234)
+    assert row['scraped_at'] == pd.Timestamp('2025-01-18 14:30:25')
+    assert pd.isna(row['website']) and row['extra'] == 'x'
+
+
+def test_parse_failures_counts_unparseable_values():
+    raw = pd.DataFrame({'phone': ['030 20607900', 'n/a', ''], 'rating': ['4,4', 'great', '']})
+    assert parse_failures(raw, normalize_records(raw)) == {'phone': 1, 'rating': 1}
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import pytest
+
+import pipeline
+from checkpoint import CheckpointJournal
+from email_cache import site_key
+from pipeline import EnrichmentPipeline
+
+RESULTS = {
+    'roma.de': {'email': 'info@roma.de', 'needs_browser': False, 'pages': 1, 'error': None},
+    'saigon.de': {'email': '', 'needs_browser': False, 'pages': 3, 'error': None},
+    'broken.de': {'email': '', 'needs_browser': True, 'pages': 0, 'error': 'HTTP 503'},
+    'spa.de': {'email': '', 'needs_browser': True, 'pages': 1, 'error': None},
+}
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+        self.closed_with = None
+
+    @property
+    def count(self):
+        return len(self.records)
+
+    def write(self, record):
+        self.records.append(record)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed_with = len(self.records)
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Fake scan_website; returns the scanned URLs"""
+    scanned = []
+    lock = threading.Lock()
+
+    async def scan_website(session, url):
+        with lock:
+            scanned.append(url)
+        await asyncio.sleep(0.05)
+        return dict(RESULTS[site_key(url)])
+
+    monkeypatch.setattr(pipeline, 'scan_website', scan_website)
+    return scanned
+
+
+def enrich(records, **kwargs):
+    sink = ListSink()
+    with EnrichmentPipeline(sink, browser_workers=0, **kwargs) as enrichment:
+        enrichment.write_many(records)
+    return sink
+
+
+def test_places_sharing_a_website_share_one_scan(scans):
+    records = [{'name': f'Roma {i}', 'website': website} for i, website in
+               enumerate(['https://roma.de', 'http://www.roma.de/', 'https://roma.de/speisekarte'])]
+    sink = enrich(records + [{'name': 'Saigon', 'website': 'saigon.de'}])
+    # The first place's URL is scanned for all three
+    assert scans == ['https://roma.de/', 'http://saigon.de/']
+    emails = {record['name']: record['email'] for record in sink.records}
+    assert emails == {'Roma 0': 'info@roma.de', 'Roma 1': 'info@roma.de', 'Roma 2': 'info@roma.de', 'Saigon': ''}
+    # The scraper's dicts are not changed
+    assert 'email' not in records[0]
+
+
+def test_close_writes_every_record_before_closing_the_sink(scans):
+    records = [{'name': 'Roma', 'website': 'roma.de'}, {'name': 'Ohne Website', 'website': ''},
+               {'name': 'Bekannt', 'website': 'saigon.de', 'email': 'pho@saigon.de'},
+               {'name': 'SPA', 'website': 'spa.de'}]
+    sink = enrich(records)
+    assert sink.closed_with == 4
+    assert sorted(record['name'] for record in sink.records) == ['Bekannt', 'Ohne Website', 'Roma', 'SPA']
+    assert scans == ['http://roma.de/', 'http://spa.de/']
+
+    enrichment = EnrichmentPipeline(ListSink(), browser_workers=0)
+    enrichment.close()
+    with pytest.raises(RuntimeError):
+        enrichment.write(records[0])
+
+
+def test_known_emails_and_failed_fetches(scans, tmp_path):
+    journal = CheckpointJournal(str(tmp_path / 'checkpoint.db'))
+    sink = enrich([{'name': 'Roma', 'website': 'roma.de'}, {'name': 'Saigon', 'website': 'saigon.de'},
+                   {'name': 'Broken', 'website': 'broken.de'}],
+                  journal=journal, known={'roma.de': 'reservierung@roma.de'})
+    assert {record['name']: record['email'] for record in sink.records} == {
+        'Roma': 'reservierung@roma.de', 'Saigon': '', 'Broken': ''}
+    assert scans == ['http://saigon.de/', 'http://broken.de/']
+    # "No email" is journaled, a failed fetch is not
+    assert journal.get_email('saigon.de') == ''
+    assert journal.get_email('broken.de') is None
+    journal.close()
@@ -0,0 +1,144 @@
+import csv
+import json
+
+import pytest
+
+import scraper
+from checkpoint import CheckpointJournal
+from metrics import Metrics
+from place_index import PlaceIndex, apply_categories, place_id_from_href
+from waits import TimeAccounting
+
+ROMA = 'https://www.google.com/maps/place/Roma/data=!4m7!3m6!1s0x47a84e373f035901:0x42120465b5e3b70!8m2'
+SAIGON = 'https://www.google.com/maps/place/Saigon/data=!4m7!3m6!1s0x47a851e0b2b1a3b1:0x9c1d3f1e2a4b5c6d!8m2'
+
+
+def test_place_id_from_href():
+    assert place_id_from_href(ROMA) == '0x47a84e373f035901:0x42120465b5e3b70'
+    # The id does not depend on the query or viewport the place was found with
+    assert place_id_from_href(ROMA.replace('/Roma/', '/Roma/@52.5,13.4,14z/') + '?authuser=0') == \
+        '0x47a84e373f035901:0x42120465b5e3b70'
+    assert place_id_from_href('https://maps.google.com/?cid=4760381393455593328&hl=de') == '4760381393455593328'
+    assert place_id_from_href('https://www.google.com/maps/place/X/data=!4m2!16s%2Fg%2F11c1r1x2zq') == '/g/11c1r1x2zq'
+    assert place_id_from_href('https://www.google.com/maps/place/X?hl=de') == 'www.google.com/maps/place/X'
+    assert place_id_from_href(None) is None
+
+
+def test_claim_dedupes_across_queries_and_tiles():
+    index = PlaceIndex()
+    assert index.claim('p1', 'pizza')
+    assert not index.claim('p1', 'italian')  # Being extracted
+    index.add('p1', 'pizza', {'name': 'Roma'})
+    # The same query in the neighbouring tile: a duplicate, but no second category
+    assert not index.claim('p1', 'pizza')
+    assert not index.claim('p1', 'restaurant')
+    assert index.merged_categories() == {'p1': 'pizza, italian, restaurant'}
+
+
+def test_release_lets_another_query_claim_again():
+    index = PlaceIndex()
+    assert index.claim('p1', 'pizza')
+    index.release('p1')
+    assert index.claim('p1', 'italian')
+    index.add('p1', 'italian', None)
+    # Places without data get no merged category
+    index.add('p2', 'pizza', {'name': 'Saigon'})
+    assert index.merged_categories() == {}
+    assert index.overlap_report()[('pizza', 'italian')] == (1, 1.0)
+
+
+def test_apply_categories_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / 'results.csv'
+    with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['name', 'category', 'place_id'])
+        writer.writeheader()
+        writer.writerows([{'name': 'Roma', 'category': 'pizza', 'place_id': 'p1'},
+                          {'name': 'Saigon', 'category': 'pho', 'place_id': 'p2'}])
+    jsonl_path = tmp_path / 'results.jsonl'
+    jsonl_path.write_text(json.dumps({'name': 'Roma', 'category': 'pizza', 'place_id': 'p1'}) + '\n',
+                          encoding='utf-8')
+
+    categories = {'p1': 'pizza, italian'}
+    assert apply_categories(str(csv_path), categories) == 1
+    with open(csv_path, encoding='utf-8-sig', newline='') as f:
+        assert [row['category'] for row in csv.DictReader(f)] == ['pizza, italian', 'pho']
+    assert apply_categories(str(jsonl_path), categories) == 1
+    assert json.loads(jsonl_path.read_text(encoding='utf-8'))['category'] == 'pizza, italian'
+    # Already merged, missing files and empty merges leave everything alone
+    assert apply_categories(str(csv_path), categories) == 0
+    assert apply_categories(str(tmp_path / 'missing.csv'), categories) == 0
+    assert apply_categories(str(csv_path), {}) == 0
+
+
+class FakeScraper(scraper.GoogleMapsScraper):
+    """Serves a fixed feed of complete cards per query, without a browser"""
+
+    def __init__(self, feeds):
+        self.driver = self  # harvest_feed_cards gets the scraper as its driver
+        self.feeds = feeds
+        self.query = None
+        self.feed_size = 0
+        self.lean = None
+        self.metrics = Metrics()
+        self.timing = TimeAccounting()
+
+    def search_location(self, city, query, tile=None):
+        self.query = query
+
+    def get_results_container(self):
+        return object()
+
+    def scroll_results(self, container, max_scrolls=10, target_count=None):
+        pass
+
+    def driver_alive(self):
+        return True
+
+
+class Anchor:
+    def __init__(self, href):
+        self.href = href
+
+    def get_attribute(self, name):
+        return self.href if name == 'href' else None
+
+
+def card(href, name):
+    return {'element': Anchor(href), 'href': href, 'place_category': '',
+            'data': {'name': name, 'phone': '030 123', 'website': 'https://example.de'}}
+
+
+@pytest.fixture
+def feeds(monkeypatch):
+    feeds = {'pizza': [card(ROMA, 'Roma'), card(None, 'Ohne Link')],
+             'italian': [card(ROMA, 'Roma'), card(SAIGON, 'Saigon')]}
+    monkeypatch.setattr(scraper, 'harvest_feed_cards', lambda driver: driver.feeds[driver.query])
+    return feeds
+
+
+def scrape(feeds, queries, **kwargs):
+    fake = FakeScraper(feeds)
+    index = PlaceIndex()
+    records = fake.scrape_city('Berlin', queries, fast_list=True, place_index=index, **kwargs)
+    return records, index, fake.metrics
+
+
+def test_scrape_city_skips_duplicates_and_merges_categories(feeds):
+    records, index, metrics = scrape(feeds, ['pizza', 'italian'])
+    assert [(record['name'], record['place_id']) for record in records] == [
+        ('Roma', '0x47a84e373f035901:0x42120465b5e3b70'), ('Ohne Link', 'pizza#2'),
+        ('Saigon', '0x47a851e0b2b1a3b1:0x9c1d3f1e2a4b5c6d')]
+    assert index.merged_categories() == {'0x47a84e373f035901:0x42120465b5e3b70': 'pizza, italian'}
+    assert metrics.counters[('places_skipped_total', ())] == 1
+
+
+def test_resume_keeps_merged_categories(feeds, tmp_path):
+    journal = CheckpointJournal(str(tmp_path / 'checkpoint.db'))
+    scrape(feeds, ['pizza', 'italian'], journal=journal)
+
+    # Everything is replayed from the journal: no feed is read again
+    feeds.clear()
+    records, index, _ = scrape(feeds, ['pizza', 'italian'], journal=journal)
+    journal.close()
+    assert len(records) == 3
+    assert index.merged_categories() == {'0x47a84e373f035901:0x42120465b5e3b70': 'pizza, italian'}
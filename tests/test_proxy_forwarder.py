@@ -0,0 +1,117 @@
+import socket
+import socketserver
+import threading
+import urllib.request
+
+import pytest
+
+from proxy_forwarder import UpstreamForwarder, parse_upstream, read_head
+
+
+class FakeProxyHandler(socketserver.BaseRequestHandler):
+    """Upstream proxy that answers requests itself and echoes tunnelled bytes, prefixed with its name"""
+
+    def handle(self):
+        proxy = self.server.proxy
+        head, _ = read_head(self.request)
+        lines = head.decode('latin-1').split('\r\n')
+        proxy.requests.append(lines)
+
+        if lines[0].startswith('CONNECT'):
+            if proxy.refuse_tunnels:
+                self.request.sendall(b'HTTP/1.1 407 Proxy Authentication Required\r\n\r\n')
+                return
+            self.request.sendall(b'HTTP/1.1 200 Connection Established\r\n\r\n')
+            data = self.request.recv(1024)
+            self.request.sendall(proxy.name.encode() + b':' + data)
+        else:
+            body = proxy.name.encode()
+            self.request.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\nConnection: keep-alive\r\n\r\n%s'
+                                 % (len(body), body))
+
+
+class FakeProxy:
+    def __init__(self, name):
+        self.name = name
+        self.requests = []
+        self.refuse_tunnels = False
+        self.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), FakeProxyHandler)
+        self.server.daemon_threads = True
+        self.server.proxy = self
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def address(self):
+        return f'127.0.0.1:{self.server.server_address[1]}'
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def proxies():
+    a, b = FakeProxy('A'), FakeProxy('B')
+    yield a, b
+    a.close()
+    b.close()
+
+
+@pytest.fixture
+def forwarder(proxies):
+    forwarder = UpstreamForwarder(f'user:secret@{proxies[0].address}')
+    yield forwarder
+    forwarder.close()
+
+
+def fetch(forwarder, url='http://example.com/menu?lang=de'):
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({'http': f'http://{forwarder.address}'}))
+    with opener.open(url, timeout=5) as response:
+        return response.read().decode(), response.headers['Connection']
+
+
+def tunnel(forwarder, payload=b'ping'):
+    host, port = forwarder.address.split(':')
+    with socket.create_connection((host, int(port)), timeout=5) as sock:
+        sock.sendall(b'CONNECT example.com:443 HTTP/1.1\r\nHost: example.com:443\r\n\r\n')
+        head, _ = read_head(sock)
+        if not head.startswith(b'HTTP/1.1 200'):
+            return head.decode('latin-1')
+        sock.sendall(payload)
+        return sock.recv(1024).decode()
+
+
+def test_parse_upstream():
+    assert parse_upstream('http://user:pw@10.0.0.1:8080') == (('10.0.0.1', 8080), 'Basic dXNlcjpwdw==')
+    assert parse_upstream('10.0.0.1:3128') == (('10.0.0.1', 3128), None)
+    assert parse_upstream(None) == (None, None)
+
+
+def test_requests_follow_the_upstream_switch(proxies, forwarder):
+    a, b = proxies
+    assert fetch(forwarder) == ('A', 'close')
+    request_line, headers = a.requests[-1][0], a.requests[-1][1:]
+    assert request_line == 'GET http://example.com/menu?lang=de HTTP/1.1'
+    assert 'Proxy-Authorization: Basic dXNlcjpzZWNyZXQ=' in headers
+    assert 'Connection: close' in headers
+
+    forwarder.set_upstream(b.address)
+    assert fetch(forwarder) == ('B', 'close')
+    assert not [line for line in b.requests[-1] if line.startswith('Proxy-Authorization')]
+    assert len(a.requests) == 1
+
+
+def test_connect_tunnels_through_the_current_upstream(proxies, forwarder):
+    a, b = proxies
+    assert tunnel(forwarder) == 'A:ping'
+    assert a.requests[-1][0] == 'CONNECT example.com:443 HTTP/1.1'
+    assert 'Proxy-Authorization: Basic dXNlcjpzZWNyZXQ=' in a.requests[-1]
+
+    forwarder.set_upstream(b.address)
+    assert tunnel(forwarder) == 'B:ping'
+
+
+def test_refused_tunnel_is_a_bad_gateway(proxies, forwarder):
+    proxies[0].refuse_tunnels = True
+    assert tunnel(forwarder).startswith('HTTP/1.1 502')
+    assert forwarder.failures == 1
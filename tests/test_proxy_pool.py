@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+
+import proxy_pool
+from proxy_pool import ProxyPool, ProxyStats
+
+
+class FakeResponse:
+    def __init__(self, status_code, origin=None):
+        self.status_code = status_code
+        self.origin = origin
+
+    def json(self):
+        return {'origin': self.origin}
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    """Fake requests.get: proxies whose name starts with 'good' work; returns the probed proxies"""
+    probed = []
+    lock = threading.Lock()
+
+    def get(url, proxies=None, timeout=None):
+        proxy = proxies['http'][len('http://'):]
+        with lock:
+            probed.append(proxy)
+        if proxy.startswith('good'):
+            return FakeResponse(200, origin=proxy)
+        raise OSError('connection refused')
+
+    monkeypatch.setattr(proxy_pool.requests, 'get', get)
+    return probed
+
+
+def test_score_prefers_reliable_fast_proxies():
+    fast, slow, broken = ProxyStats('fast'), ProxyStats('slow'), ProxyStats('broken')
+    fast.record(True, 0.2)
+    slow.record(True, 2.0)
+    broken.record(True, 0.1)
+    broken.record(False)
+    assert fast.score > slow.score > broken.score == 0.0
+    assert not ProxyStats('new').healthy
+
+
+def test_check_records_health_and_drops_failing_proxies(probes):
+    pool = ProxyPool(max_failures=2)
+    assert pool.check('good:1')
+    assert pool.stats['good:1'].origin == 'good:1'
+    assert not pool.check('bad:1')
+    assert 'bad:1' in pool.stats
+    assert not pool.check('bad:1')
+    assert 'bad:1' not in pool.stats
+    pool.stop()
+
+
+def test_best_and_report(probes):
+    pool = ProxyPool()
+    assert pool.best() is None
+    assert sorted(pool.check_all(['good:1', 'bad:1', 'good:2'])) == ['good:1', 'good:2']
+    assert pool.healthy_count() == 2
+
+    pool.report('good:1', False)  # Failed while scraping: unhealthy until it passes again
+    assert pool.best() == 'good:2'
+    assert pool.best(exclude='good:2') is None
+    pool.stop()
+
+
+def test_first_healthy_returns_first_working_proxy(probes):
+    pool = ProxyPool(max_workers=2)
+    candidates = ['bad:1', 'bad:2', 'good:1'] + [f'bad:{i}' for i in range(3, 50)]
+    assert pool.first_healthy(candidates, timeout=5) == 'good:1'
+    # Probes are queued max_workers at a time, so the candidates after the hit are mostly never probed
+    assert len(probes) < 10
+    assert pool.first_healthy(['bad:1', 'bad:2'], timeout=5) is None
+    pool.stop()
+
+
+def test_refresh_fetches_candidates_when_low(probes):
+    pool = ProxyPool(source=lambda: ['good:1', 'bad:1'], min_healthy=1, refresh_interval=0)
+    pool.refresh()
+    assert pool.best() == 'good:1'
+    pool.stop()
+
+
+def test_refresh_retests_a_batch_healthy_first(probes):
+    pool = ProxyPool(refresh_interval=0, refresh_batch=3)
+    pool.check('good:1')
+    pool.add([f'bad:{i}' for i in range(10)])
+    probes.clear()
+    pool.refresh()
+    # The known good proxy, then never-checked candidates; the rest waits for the next refresh
+    assert len(probes) == 3 and probes.count('good:1') == 1
+    pool.refresh()
+    assert len(probes) == 6 and probes.count('good:1') == 2
+    pool.stop()
+
+
+def test_manager_probes_without_holding_its_lock(probes, monkeypatch):
+    from main_scraper_proxy import ProxyManager
+
+    manager = ProxyManager(proxy_list=['bad:1', 'good:1'])
+    monkeypatch.setattr(manager.pool, 'start_background', lambda: None)
+    held = []
+    check = manager.pool.check
+    monkeypatch.setattr(manager.pool, 'check', lambda proxy: held.append(manager.lock.locked()) or check(proxy))
+    assert manager.get_working_proxy(timeout=5) == 'good:1'
+    assert manager.current_proxy == 'good:1'
+    assert held and not any(held)
+    manager.close()
+
+
+def test_stop_ends_background_refresh_and_probing(probes):
+    pool = ProxyPool(source=lambda: ['good:1'], refresh_interval=0.01)
+    pool.start_background()
+    thread = pool._thread
+    pool.stop()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    with pytest.raises(RuntimeError):
+        pool.executor.submit(pool.check, 'good:2')
@@ -0,0 +1,67 @@
+import csv
+from datetime import datetime
+
+from refresh import RECORD_COLUMNS, RefreshIndex, fingerprint
+
+NOW = datetime(2025, 3, 1, 12, 0, 0)
+
+
+def record(place_id, name='Roma', rating='4.5', reviews='1234', scraped_at='2025-02-20 10:00:00', **fields):
+    return dict({'place_id': place_id, 'name': name, 'rating': rating, 'reviews_count': reviews,
+                 'scraped_at': scraped_at}, **fields)
+
+
+def test_fingerprint_ignores_formatting():
+    card = {'name': '  Roma  Pizzeria ', 'rating': '4,5', 'reviews_count': '(1.234)'}
+    stored = {'name': 'roma pizzeria', 'rating': 4.5, 'reviews_count': 1234.0}
+    assert fingerprint(card) == fingerprint(stored)
+    assert fingerprint({'name': 'Roma', 'rating': '4', 'reviews_count': '1.000'}) == \
+        fingerprint({'name': 'roma', 'rating': '4.0', 'reviews_count': '1000'})
+    assert fingerprint(card) != fingerprint(dict(stored, reviews_count=1235))
+
+
+def test_check_classifies_places():
+    index = RefreshIndex([record('fresh'), record('old', scraped_at='2024-12-01 10:00:00'),
+                          record('broken', scraped_at='')], ttl_days=30, now=NOW)
+    card = {'name': 'Roma', 'rating': '4,5', 'reviews_count': '(1.234)'}
+    assert index.check('fresh', card)[0] == 'unchanged'
+    assert index.check('fresh', dict(card, reviews_count='(1.240)'))[0] == 'changed'
+    assert index.check('old', card)[0] == 'stale'
+    assert index.check('broken', card)[0] == 'stale'
+    status, previous = index.check('unknown', card)
+    assert (status, previous) == ('new', None)
+    assert index.counts == {'new': 1, 'changed': 1, 'stale': 2, 'unchanged': 1}
+    assert index.summary().startswith('Refresh: 1/5 places reused (20%)')
+
+
+def test_reuse_copies_the_record_columns():
+    previous = record('p1', email='info@roma.de', extra='dropped')
+    reused = RefreshIndex([], now=NOW).reuse(previous)
+    assert list(reused) == list(RECORD_COLUMNS)
+    assert reused['email'] == 'info@roma.de' and reused['scraped_at'] == '2025-02-20 10:00:00'
+    reused['email'] = ''
+    assert previous['email'] == 'info@roma.de'
+
+
+def test_known_emails_of_fresh_records_by_site():
+    index = RefreshIndex([record('p1', website='https://www.roma.de/kontakt', email='info@roma.de'),
+                          record('p2', website='https://roma.de', email='other@roma.de'),
+                          record('p3', website='https://elefant.de', email='',
+                                 scraped_at='2024-01-01 00:00:00')], now=NOW)
+    assert index.known_emails() == {'roma.de': 'info@roma.de'}
+
+
+def test_load_keeps_the_latest_record_per_place(tmp_path):
+    path = tmp_path / 'previous.csv'
+    rows = [record('p1', reviews='10', scraped_at='2025-02-01 10:00:00', city='Berlin'),
+            record('p1', reviews='12', scraped_at='2025-02-10 10:00:00', city='Berlin'),
+            record('p2', city='Hamburg'),
+            record('', city='Berlin')]
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RECORD_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+    index = RefreshIndex.load(str(path), cities=['berlin'])
+    assert list(index.records) == ['p1']
+    assert index.records['p1']['reviews_count'] == '12'
@@ -0,0 +1,89 @@
+import csv
+import json
+import logging
+import threading
+
+import config
+from sinks import CsvSink, JsonlSink, MultiSink, OrderedSink
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_csv_round_trip_with_fixed_schema(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    with CsvSink(path, fieldnames=config.RECORD_COLUMNS, flush_every=1) as sink:
+        sink.write({'name': 'Roma', 'city': 'Berlin'})
+        # email first shows up in a later record and still gets its column
+        sink.write({'name': 'Elefant', 'email': 'info@elefant.de', 'place_id': 'p2'})
+    rows = read_csv(path)
+    assert list(rows[0]) == config.RECORD_COLUMNS
+    assert (rows[0]['name'], rows[0]['city'], rows[0]['email']) == ('Roma', 'Berlin', '')
+    assert (rows[1]['email'], rows[1]['place_id']) == ('info@elefant.de', 'p2')
+    assert sink.count == 2
+
+
+def test_csv_warns_about_keys_outside_the_header(tmp_path, caplog):
+    path = str(tmp_path / 'results.csv')
+    with caplog.at_level(logging.WARNING):
+        with CsvSink(path) as sink:
+            sink.write({'name': 'Roma'})
+            sink.write({'name': 'Elefant', 'categories': 'cafe, bar'})
+            sink.write({'name': 'Nante', 'categories': 'bar'})
+    assert [row['name'] for row in read_csv(path)] == ['Roma', 'Elefant', 'Nante']
+    assert [record.message for record in caplog.records if 'categories' in record.message] == \
+        [f"{path} has no column for categories; these values are not written"]
+
+
+def test_csv_append_keeps_the_header(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    with CsvSink(path, fieldnames=['name', 'email']) as sink:
+        sink.write({'name': 'Roma', 'email': 'a@roma.de'})
+    with CsvSink(path, fieldnames=['email', 'name'], append=True) as sink:
+        sink.write({'name': 'Elefant', 'email': 'b@elefant.de'})
+    assert read_csv(path) == [{'name': 'Roma', 'email': 'a@roma.de'}, {'name': 'Elefant', 'email': 'b@elefant.de'}]
+
+
+def test_empty_csv_still_has_a_header(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    CsvSink(path, fieldnames=config.RECORD_COLUMNS).close()
+    with open(path, encoding='utf-8-sig') as f:
+        assert f.read().strip() == ','.join(config.RECORD_COLUMNS)
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    records = [{'name': 'Café Übersee', 'rating': 4.5}, {'name': 'Roma', 'categories': 'cafe, bar'}]
+    with JsonlSink(path) as sink:
+        sink.write_many(records)
+    assert read_jsonl(path) == records
+
+
+def test_multi_sink_writes_every_sink(tmp_path):
+    csv_path, jsonl_path = str(tmp_path / 'r.csv'), str(tmp_path / 'r.jsonl')
+    with MultiSink([CsvSink(csv_path, fieldnames=['name']), JsonlSink(jsonl_path)]) as sink:
+        sink.write_many({'name': f'place {i}'} for i in range(25))
+        assert sink.count == 25
+    assert [row['name'] for row in read_csv(csv_path)] == [f'place {i}' for i in range(25)]
+    assert len(read_jsonl(jsonl_path)) == 25
+
+
+def test_ordered_sink_restores_input_order(tmp_path):
+    path = str(tmp_path / 'ordered.jsonl')
+    with JsonlSink(path) as sink:
+        ordered = OrderedSink(sink)
+        threads = [threading.Thread(target=ordered.write_at, args=(index, {'index': index}))
+                   for index in reversed(range(20))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert ordered.next_index == 20 and not ordered.pending
+    assert [record['index'] for record in read_jsonl(path)] == list(range(20))
@@ -0,0 +1,97 @@
+import pytest
+
+import task_queue
+from task_queue import TaskQueue
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(task_queue.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def tasks(tmp_path, clock):
+    queue = TaskQueue(str(tmp_path / 'queue.db'), lease_seconds=60, max_attempts=2, retry_delay=10,
+                      expire_after=3600)
+    yield queue
+    queue.close()
+
+
+def test_add_ignores_known_keys(tasks):
+    assert tasks.add('maps', [('a', {'n': 1}), ('b', {'n': 2})]) == 2
+    assert tasks.add('maps', [('a', {'n': 9}), ('c', {'n': 3})]) == 1
+    assert tasks.stats('maps') == {'pending': 3}
+
+
+def test_claim_complete(tasks):
+    tasks.add('maps', [('a', {'n': 1})])
+    task = tasks.claim('maps', 'w1')
+    assert (task['key'], task['payload'], task['attempts']) == ('a', {'n': 1}, 1)
+    assert tasks.claim('maps', 'w2') is None
+    assert tasks.complete(task, {'records': 5})
+    assert tasks.finished('maps', ['a', 'b']) == {'a': {'records': 5}}
+    assert tasks.is_drained('maps')
+
+
+def test_expired_lease_is_reassigned(tasks, clock):
+    tasks.add('maps', [('a', {})])
+    first = tasks.claim('maps', 'w1')
+    clock[0] += 30
+    assert tasks.heartbeat(first)
+    clock[0] += 61
+    second = tasks.claim('maps', 'w2')
+    assert second['key'] == 'a' and second['attempts'] == 2
+    # The first worker lost its lease and can no longer finish the task
+    assert not tasks.heartbeat(first)
+    assert not tasks.complete(first)
+    assert tasks.complete(second)
+
+
+def test_lease_expiring_on_last_attempt_fails_the_task(tasks, clock):
+    tasks.add('maps', [('a', {})])
+    tasks.claim('maps', 'w1')
+    clock[0] += 61
+    tasks.claim('maps', 'w2')
+    clock[0] += 61
+    assert tasks.claim('maps', 'w3') is None
+    assert tasks.stats('maps') == {'failed': 1}
+    assert tasks.finished('maps', ['a']) == {'a': None}
+
+
+def test_fail_retries_with_backoff_then_gives_up(tasks, clock):
+    tasks.add('maps', [('a', {})])
+    task = tasks.claim('maps', 'w1')
+    assert tasks.fail(task, 'timeout')
+    assert tasks.claim('maps', 'w1') is None  # Waits out the retry delay
+    clock[0] += 10
+    task = tasks.claim('maps', 'w1')
+    assert task['attempts'] == 2
+    assert tasks.fail(task, 'timeout')
+    assert tasks.stats('maps') == {'failed': 1}
+
+    assert tasks.requeue_failed('maps') == 1
+    assert tasks.claim('maps', 'w1')['attempts'] == 1
+
+
+def test_release_does_not_count_the_attempt(tasks):
+    tasks.add('maps', [('a', {})])
+    task = tasks.claim('maps', 'w1')
+    assert tasks.release(task)
+    assert tasks.claim('maps', 'w2')['attempts'] == 1
+
+
+def test_finished_tasks_reopen_once_expired(tasks, clock):
+    tasks.add('maps', [('a', {'v': 1}), ('b', {'v': 1})])
+    tasks.complete(tasks.claim('maps', 'w1'), expire_after=7200)
+    tasks.fail(tasks.claim('maps', 'w1'), 'broken', retry=False)
+
+    clock[0] += 3600
+    assert tasks.add('maps', [('a', {'v': 2}), ('b', {'v': 2})]) == 1  # b failed with the default lifetime
+    task = tasks.claim('maps', 'w1')
+    assert (task['key'], task['payload'], task['attempts']) == ('b', {'v': 2}, 1)
+
+    clock[0] += 3600
+    assert tasks.add('maps', [('a', {'v': 2})]) == 1
+    assert tasks.claim('maps', 'w1')['payload'] == {'v': 2}
@@ -0,0 +1,86 @@
+import pytest
+
+import config
+from place_index import PlaceIndex
+from tiling import Tile, city_bounds, is_dense, plan_tiles, scrape_tiles, tile_span, tile_units
+
+BERLIN = (52.3383, 13.0884, 52.6755, 13.7611)
+
+
+def test_plan_tiles_covers_the_box_without_gaps():
+    tiles = plan_tiles(BERLIN, 14)
+    lat_span, lng_span = tile_span(14, (BERLIN[0] + BERLIN[2]) / 2)
+    assert len(tiles) > 1
+    assert all(tile.north - tile.south <= lat_span and tile.east - tile.west <= lng_span for tile in tiles)
+    # North-west first, and the outer tiles end exactly on the box
+    assert tiles[0].north == pytest.approx(BERLIN[2]) and tiles[0].west == pytest.approx(BERLIN[1])
+    assert min(tile.south for tile in tiles) == pytest.approx(BERLIN[0])
+    assert max(tile.east for tile in tiles) == pytest.approx(BERLIN[3])
+    area = sum((tile.north - tile.south) * (tile.east - tile.west) for tile in tiles)
+    assert area == pytest.approx((BERLIN[2] - BERLIN[0]) * (BERLIN[3] - BERLIN[1]))
+
+
+def test_small_box_is_one_tile():
+    assert len(plan_tiles((52.50, 13.40, 52.501, 13.401), 12)) == 1
+
+
+def test_split_quarters_the_tile_one_zoom_deeper():
+    tile = Tile(52.0, 13.0, 53.0, 14.0, 12)
+    quarters = tile.split()
+    assert [(q.south, q.west, q.north, q.east) for q in quarters] == [
+        (52.5, 13.0, 53.0, 13.5), (52.5, 13.5, 53.0, 14.0), (52.0, 13.0, 52.5, 13.5), (52.0, 13.5, 52.5, 14.0)]
+    assert {q.zoom for q in quarters} == {13}
+
+
+def test_tile_key_url_and_round_trip():
+    tile = Tile(52.0, 13.0, 53.0, 14.0, 12)
+    assert tile.key == 'z12/52.50000,13.50000'
+    assert tile.search_url('https://www.google.com/maps', 'sushi bar') == \
+        'https://www.google.com/maps/search/sushi+bar/@52.500000,13.500000,12z'
+    assert Tile.from_dict(tile.to_dict()).key == tile.key
+
+
+def test_is_dense():
+    tile = Tile(52.0, 13.0, 53.0, 14.0, 14)
+    assert is_dense(20, 20, tile, max_zoom=17)
+    assert not is_dense(19, 20, tile, max_zoom=17)
+    assert not is_dense(20, 20, tile, max_zoom=14)
+
+
+def test_tile_units_and_city_bounds(monkeypatch):
+    monkeypatch.setattr(config, 'CITY_BOUNDS', {'Berlin': BERLIN})
+    assert city_bounds(' berlin ') == BERLIN
+    units = tile_units([('Berlin', 'cafe'), ('Berlin', 'bar')], 13)
+    assert len(units) == 2 * len(plan_tiles(BERLIN, 13))
+    assert units[0][:2] == ('Berlin', 'cafe') and isinstance(units[0][2], Tile)
+    with pytest.raises(ValueError):
+        city_bounds('Atlantis')
+
+
+class FakeScraper:
+    """Reports a full feed for the first tile only"""
+
+    def __init__(self):
+        self.feed_size = 0
+        self.tiles = []
+
+    def scrape_city(self, city, queries, max_results=20, place_index=None, tile=None, sink=None, **kwargs):
+        self.tiles.append(tile)
+        self.feed_size = max_results if len(self.tiles) == 1 else 3
+        records = [{'name': f'{tile.key}/{i}'} for i in range(self.feed_size)]
+        return len(records) if sink else records
+
+
+def test_scrape_tiles_splits_dense_tiles():
+    scraper = FakeScraper()
+    records = scrape_tiles(scraper, 'Berlin', 'cafe', [Tile(52.0, 13.0, 53.0, 14.0, 12)], max_results=5,
+                           max_zoom=17, place_index=PlaceIndex())
+    assert len(scraper.tiles) == 5
+    assert [tile.zoom for tile in scraper.tiles] == [12, 13, 13, 13, 13]
+    assert len(records) == 5 + 4 * 3
+
+
+def test_scrape_tiles_counts_with_a_sink():
+    written = scrape_tiles(FakeScraper(), 'Berlin', 'cafe', [Tile(52.0, 13.0, 53.0, 14.0, 17)], max_results=5,
+                           max_zoom=17, sink=object())
+    assert written == 5
@@ -0,0 +1,141 @@
+"""Split a city into map viewport tiles that are searched one by one
+
+A single "restaurant in Berlin" search only lists a limited number of places. Searching the
+query tile by tile with coordinate-anchored URLs (.../maps/search/restaurant/@52.52,13.40,14z)
+reaches many more, and a tile whose feed is cut off is split into four tiles one zoom level
+deeper. Places found again near tile borders are skipped by the shared PlaceIndex.
+"""
+import logging
+import math
+from collections import deque
+
+import config
+from place_index import PlaceIndex
+
+# Map area (pixels) a tile is sized for; smaller than the browser window minus the results
+# panel, so neighbouring tiles overlap a little instead of leaving gaps
+VIEWPORT = (1024, 640)
+
+
+class Tile:
+    """Map viewport (south, west, north, east) searched at a zoom level"""
+
+    def __init__(self, south, west, north, east, zoom):
+        self.south = south
+        self.west = west
+        self.north = north
+        self.east = east
+        self.zoom = zoom
+
+    @property
+    def center(self):
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def key(self):
+        """Stable name of the tile, e.g. 'z14/52.51234,13.40521'"""
+        lat, lng = self.center
+        return f'z{self.zoom}/{lat:.5f},{lng:.5f}'
+
+    def search_url(self, maps_url, query):
+        """Search URL anchored on the tile: the feed lists places in this viewport"""
+        lat, lng = self.center
+        return f"{maps_url}/search/{query.replace(' ', '+')}/@{lat:.6f},{lng:.6f},{self.zoom}z"
+
+    def split(self):
+        """The four quarter tiles, one zoom level deeper (north-west first)"""
+        lat, lng = self.center
+        return [Tile(lat, self.west, self.north, lng, self.zoom + 1),
+                Tile(lat, lng, self.north, self.east, self.zoom + 1),
+                Tile(self.south, self.west, lat, lng, self.zoom + 1),
+                Tile(self.south, lng, lat, self.east, self.zoom + 1)]
+
+    def to_dict(self):
+        return {'south': self.south, 'west': self.west, 'north': self.north, 'east': self.east, 'zoom': self.zoom}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['south'], data['west'], data['north'], data['east'], data['zoom'])
+
+    def __repr__(self):
+        return f'Tile({self.key})'
+
+
+def tile_span(zoom, latitude):
+    """(latitude, longitude) degrees covered by VIEWPORT at a zoom level (Web Mercator)"""
+    degrees_per_pixel = 360 / (256 * 2 ** zoom)
+    width, height = VIEWPORT
+    return height * degrees_per_pixel * math.cos(math.radians(latitude)), width * degrees_per_pixel
+
+
+def plan_tiles(bounds, zoom):
+    """Cover a (south, west, north, east) box with an even grid of tiles, north-west first"""
+    south, west, north, east = bounds
+    lat_span, lng_span = tile_span(zoom, (south + north) / 2)
+    rows = max(1, math.ceil((north - south) / lat_span))
+    cols = max(1, math.ceil((east - west) / lng_span))
+    lat_step = (north - south) / rows
+    lng_step = (east - west) / cols
+    return [Tile(north - (row + 1) * lat_step, west + col * lng_step, north - row * lat_step,
+                 west + (col + 1) * lng_step, zoom)
+            for row in range(rows) for col in range(cols)]
+
+
+def city_bounds(city):
+    """Bounding box of a city from config.CITY_BOUNDS"""
+    for name, bounds in config.CITY_BOUNDS.items():
+        if name.lower() == city.strip().lower():
+            return bounds
+    raise ValueError(f"No bounding box for '{city}' in config.CITY_BOUNDS (needed for tiling)")
+
+
+def city_tiles(city, zoom):
+    return plan_tiles(city_bounds(city), zoom)
+
+
+def tile_units(units, zoom):
+    """(city, query) units -> (city, query, tile) units covering each city at zoom"""
+    tiles = {}
+    tiled = []
+    for city, query in units:
+        if city not in tiles:
+            tiles[city] = city_tiles(city, zoom)
+            logging.info(f"{city}: {len(tiles[city])} tiles at zoom {zoom}")
+        tiled.extend((city, query, tile) for tile in tiles[city])
+    return tiled
+
+
+def is_dense(feed_size, max_results, tile, max_zoom=None):
+    """A tile whose feed reached max_results probably has more places and is split further"""
+    max_zoom = config.TILE_MAX_ZOOM if max_zoom is None else max_zoom
+    return feed_size >= max_results and tile.zoom < max_zoom
+
+
+def scrape_tiles(scraper, city, query, tiles, max_results=20, max_zoom=None, place_index=None, **scrape_kwargs):
+    """Scrape a query tile by tile, splitting dense tiles until max_zoom
+
+    scrape_kwargs are passed on to scrape_city (journal, sink, fast_list, ...). Returns the records,
+    or with a sink the number written, like scrape_city.
+    """
+    place_index = place_index if place_index is not None else PlaceIndex()
+    pending = deque(tiles)
+    records = []
+    written = 0
+    searched = 0
+
+    while pending:
+        tile = pending.popleft()
+        result = scraper.scrape_city(city, [query], max_results=max_results, place_index=place_index,
+                                     tile=tile, **scrape_kwargs)
+        if scrape_kwargs.get('sink'):
+            written += result
+        else:
+            records.extend(result)
+        searched += 1
+        if is_dense(scraper.feed_size, max_results, tile, max_zoom):
+            logging.info(f"Tile {tile.key} is dense ({scraper.feed_size} places), splitting it")
+            pending.extend(tile.split())
+
+    total = written if scrape_kwargs.get('sink') else len(records)
+    logging.info(f"'{query}' in {city}: {searched} tiles searched, {total} records")
+    return written if scrape_kwargs.get('sink') else records
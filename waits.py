@@ -0,0 +1,180 @@
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Title and URL of the open detail panel; the title node is marked, so a re-rendered panel is recognized
+DETAIL_STATE_SCRIPT = r"""
+const title = document.querySelector('h1.DUwDvf');
+if (title) {
+    title.setAttribute('data-scraper-seen', '1');
+}
+return [title ? title.innerText : null, window.location.href];
+"""
+
+# Resolves once no new resource entries were recorded for idleMs
+NETWORK_IDLE_SCRIPT = r"""
+const idleMs = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const started = Date.now();
+let lastCount = performance.getEntriesByType('resource').length;
+let lastChange = Date.now();
+
+(function poll() {
+    const count = performance.getEntriesByType('resource').length;
+    if (count !== lastCount) {
+        lastCount = count;
+        lastChange = Date.now();
+    }
+    if (Date.now() - lastChange >= idleMs) {
+        done(true);
+    } else if (Date.now() - started > timeoutMs) {
+        done(false);
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
+
+class TimeAccounting:
+    """Tracks how much wall time went to sleeping, waiting for readiness and working"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.totals = {'sleep': 0.0, 'wait': 0.0}
+
+    def add(self, kind, seconds):
+        with self.lock:
+            self.totals[kind] = self.totals.get(kind, 0.0) + seconds
+
+    def report(self):
+        """Return {'wall', 'sleep', 'wait', 'work'} in seconds"""
+        with self.lock:
+            wall = time.time() - self.started
+            sleep = self.totals.get('sleep', 0.0)
+            wait = self.totals.get('wait', 0.0)
+        return {'wall': wall, 'sleep': sleep, 'wait': wait, 'work': max(0.0, wall - sleep - wait)}
+
+    def summary(self):
+        report = self.report()
+        wall = report['wall'] or 1.0
+        return (f"wall {report['wall']:.1f}s | sleeping {report['sleep']:.1f}s ({report['sleep'] / wall:.0%}) | "
+                f"waiting {report['wait']:.1f}s ({report['wait'] / wall:.0%}) | "
+                f"working {report['work']:.1f}s ({report['work'] / wall:.0%})")
+
+
+class PolitenessBudget:
+    """Minimum interval between actions against the same host"""
+
+    def __init__(self, min_interval=1.5, per_host=None, jitter=0.5):
+        self.min_interval = min_interval
+        self.per_host = dict(per_host or {})  # host -> minimum interval override
+        self.jitter = jitter  # random extra seconds so the rhythm is not perfectly regular
+        self.lock = threading.Lock()
+        self.next_allowed = {}
+
+    def interval_for(self, host):
+        return self.per_host.get(host, self.min_interval)
+
+    def wait(self, host_or_url):
+        """Sleep only as long as needed since the last action against this host; returns seconds slept"""
+        host = urlparse(host_or_url).netloc or host_or_url
+
+        with self.lock:
+            now = time.time()
+            slot = max(now, self.next_allowed.get(host, 0.0))
+            self.next_allowed[host] = slot + self.interval_for(host) + random.uniform(0, self.jitter)
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class ReadinessWaiter:
+    """Waits for concrete page signals instead of fixed sleeps"""
+
+    def __init__(self, driver, timing=None, timeout=10, metrics=None):
+        self.driver = driver
+        self.timing = timing or TimeAccounting()
+        self.timeout = timeout
+        self.metrics = metrics  # Optional Metrics: wait time and timeouts per signal
+
+    def _record(self, signal, seconds, timed_out=False):
+        self.timing.add('wait', seconds)
+        if self.metrics:
+            self.metrics.observe('wait_seconds', seconds, signal=signal)
+            if timed_out:
+                self.metrics.inc('wait_timeouts_total', signal=signal)
+
+    def _until(self, condition, timeout=None, signal='element'):
+        started = time.time()
+        timed_out = False
+        try:
+            return WebDriverWait(
+                self.driver, timeout or self.timeout, poll_frequency=0.1,
+                ignored_exceptions=(StaleElementReferenceException,)
+            ).until(condition)
+        except TimeoutException:
+            timed_out = True
+            return None
+        finally:
+            self._record(signal, time.time() - started, timed_out)
+
+    def any_present(self, selectors, timeout=None):
+        """Wait until any of the CSS selectors matches"""
+        def present(driver):
+            for selector in selectors:
+                elements = driver.find_elements(By.CSS_SELECTOR, selector)
+                if elements:
+                    return elements[0]
+            return False
+        return self._until(present, timeout)
+
+    def detail_state(self):
+        """(title, URL) of the open detail panel; the title is None when no panel is open"""
+        title, url = self.driver.execute_script(DETAIL_STATE_SCRIPT)
+        return title, url
+
+    def detail_changed(self, previous, expected_name=None, timeout=None):
+        """Wait until the detail panel shows a place other than previous (a detail_state)
+
+        Maps changes the URL before it swaps the panel, so the title has to change. Only when the
+        clicked place (expected_name) has the previous title too, a re-rendered title node or a
+        changed URL counts as the new panel. Returns None on timeout.
+        """
+        previous_name, previous_url = previous
+
+        def changed(driver):
+            elements = driver.find_elements(By.CSS_SELECTOR, 'h1.DUwDvf')
+            if not elements or not elements[0].text:
+                return False
+            if previous_name is None or elements[0].text.strip() != previous_name.strip():
+                return True
+            if expected_name is not None and expected_name.strip() != previous_name.strip():
+                return False
+            return not elements[0].get_attribute('data-scraper-seen') or driver.current_url != previous_url
+        return self._until(changed, timeout, signal='detail_panel')
+
+    def network_idle(self, idle_ms=500, timeout=None):
+        """Wait until the page stopped loading new resources for idle_ms"""
+        started = time.time()
+        idle = False
+        try:
+            idle = self.driver.execute_async_script(
+                NETWORK_IDLE_SCRIPT, idle_ms, int((timeout or self.timeout) * 1000)
+            )
+            return idle
+        except Exception as e:
+            logging.debug(f"Network idle wait failed: {e}")
+            return False
+        finally:
+            self._record('network_idle', time.time() - started, timed_out=not idle)
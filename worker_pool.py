@@ -0,0 +1,238 @@
+import logging
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+import config
+from place_index import PlaceIndex
+from task_queue import POLL_SECONDS, worker_name
+from tiling import Tile, is_dense, scrape_tiles
+
+
+def chrome_user_agents():
+    """User agents from config.USER_AGENTS that match the browser the workers run (Chrome)
+
+    A Firefox or Safari user agent on Chrome is easy to spot (its JS features and headers differ).
+    """
+    return [agent for agent in config.USER_AGENTS
+            if 'Chrome/' in agent and not any(other in agent for other in ('Edg/', 'OPR/', 'Firefox/'))]
+
+
+class ScraperWorkerPool:
+    """Spreads the city x query grid (or its map tiles) across several isolated browser workers"""
+
+    def __init__(self, scraper_cls, workers=2, scraper_kwargs=None, proxies=None, scrape_kwargs=None):
+        """Configure the pool (proxies are assigned round-robin to workers)"""
+        self.scraper_cls = scraper_cls
+        self.scrape_kwargs = dict(scrape_kwargs or {})  # Extra scrape_city arguments, e.g. fast_list
+        self.workers = max(1, workers)
+        self.scraper_kwargs = dict(scraper_kwargs or {})
+        self.proxies = list(proxies or [])
+        self.place_indexes = {}  # city -> PlaceIndex shared by all workers
+        self.index_lock = threading.Lock()
+
+    def worker_kwargs(self, worker_id, profile_dir):
+        """Build the scraper arguments for a single worker"""
+        kwargs = dict(self.scraper_kwargs)
+        kwargs['profile_dir'] = profile_dir
+        agents = chrome_user_agents()
+        if agents:
+            kwargs.setdefault('user_agent', agents[worker_id % len(agents)])
+        if self.proxies:
+            kwargs['proxy'] = self.proxies[worker_id % len(self.proxies)]
+        return kwargs
+
+    def place_index(self, city):
+        """Cross-query dedupe index for a city, shared by every worker"""
+        with self.index_lock:
+            return self.place_indexes.setdefault(city, PlaceIndex())
+
+    def merged_categories(self):
+        """{place id: categories} of places found by several queries, over every city"""
+        with self.index_lock:
+            indexes = list(self.place_indexes.values())
+        categories = {}
+        for index in indexes:
+            categories.update(index.merged_categories())
+        return categories
+
+    def _work(self, worker_id, units, results, max_results, journal, sink):
+        """Worker loop: start one browser and process units until the queue is empty"""
+        profile_dir = tempfile.mkdtemp(prefix=f'gmaps_worker_{worker_id}_')
+        scraper = None
+
+        try:
+            scraper = self.scraper_cls(**self.worker_kwargs(worker_id, profile_dir))
+            logging.info(f"[worker {worker_id}] Browser started")
+
+            while True:
+                try:
+                    index, city, query, *tile = units.get_nowait()
+                except queue.Empty:
+                    break
+
+                try:
+                    logging.info(f"[worker {worker_id}] Scraping '{query}' in {city}"
+                                 + (f" (tile {tile[0].key})" if tile else ''))
+                    if tile:
+                        # Dense tiles are split and searched by this worker
+                        result = scrape_tiles(scraper, city, query, tile, max_results=max_results, journal=journal,
+                                              sink=sink, place_index=self.place_index(city), **self.scrape_kwargs)
+                    else:
+                        result = scraper.scrape_city(city, [query], max_results=max_results, journal=journal,
+                                                     sink=sink, place_index=self.place_index(city),
+                                                     **self.scrape_kwargs)
+                    # With a sink the records are already written and only their count comes back
+                    results[index] = result
+                except Exception as e:
+                    logging.error(f"[worker {worker_id}] Error scraping {query} in {city}: {str(e)}")
+                    results[index] = 0 if sink else []
+                finally:
+                    units.task_done()
+
+        except Exception as e:
+            logging.error(f"[worker {worker_id}] Could not start browser: {str(e)}")
+
+        finally:
+            if scraper:
+                scraper.close()
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def _queue_work(self, worker_id, task_queue, counts, max_results, sink):
+        """Worker loop for a shared TaskQueue: claim units until none is pending or leased anywhere"""
+        profile_dir = tempfile.mkdtemp(prefix=f'gmaps_worker_{worker_id}_')
+        name = f'{worker_name()}-{worker_id}'
+        scraper = None
+
+        try:
+            scraper = self.scraper_cls(**self.worker_kwargs(worker_id, profile_dir))
+            logging.info(f"[worker {worker_id}] Browser started")
+
+            while True:
+                task = task_queue.claim('maps', name)
+                if task is None:
+                    if task_queue.is_drained('maps'):
+                        break
+                    # Units leased by other workers come back if their lease expires
+                    time.sleep(POLL_SECONDS)
+                    continue
+
+                city, query = task['payload']['city'], task['payload']['query']
+                tile = Tile.from_dict(task['payload']['tile']) if 'tile' in task['payload'] else None
+                try:
+                    logging.info(f"[worker {worker_id}] Scraping '{query}' in {city} (attempt {task['attempts']})"
+                                 + (f" (tile {tile.key})" if tile else ''))
+                    with task_queue.keep_alive(task):
+                        result = scraper.scrape_city(city, [query], max_results=max_results, sink=sink,
+                                                     place_index=self.place_index(city), raise_errors=True,
+                                                     tile=tile, **self.scrape_kwargs)
+                    if tile and is_dense(scraper.feed_size, max_results, tile):
+                        # The quarter tiles become new tasks, so any worker can take them
+                        logging.info(f"[worker {worker_id}] Tile {tile.key} is dense, queueing its quarters")
+                        task_queue.add_units((city, query, quarter) for quarter in tile.split())
+                    written = result if sink else len(result)
+                    task_queue.complete(task, {'records': written})
+                    counts[worker_id] = counts.get(worker_id, 0) + written
+                except Exception as e:
+                    logging.error(f"[worker {worker_id}] Error scraping {query} in {city}: {str(e)}")
+                    task_queue.fail(task, e)
+                    # Repeated failures are often a banned proxy
+                    if getattr(scraper, 'use_proxy', False):
+                        scraper.rotate_proxy()
+
+        except Exception as e:
+            logging.error(f"[worker {worker_id}] Could not start browser: {str(e)}")
+
+        finally:
+            if scraper:
+                scraper.close()
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def run_queue(self, task_queue, max_results=20, sink=None):
+        """Work on the 'maps' units of a shared TaskQueue until it is drained; returns the number of records
+
+        Other processes (on this or other machines) can work on the same queue at the same time;
+        records are streamed to sink.
+        """
+        counts = {}
+        logging.info(f"Starting {self.workers} queue workers ({task_queue.stats('maps')})")
+        started = time.time()
+
+        threads = [
+            threading.Thread(
+                target=self._queue_work,
+                args=(worker_id, task_queue, counts, max_results, sink),
+                name=f'scraper-worker-{worker_id}',
+                daemon=True
+            )
+            for worker_id in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = sum(counts.values())
+        logging.info(f"Queue drained in {time.time() - started:.1f}s ({total} records from this process, "
+                     f"queue: {task_queue.stats('maps')})")
+        return total
+
+    def run(self, cities, queries, max_results=20, journal=None, sink=None):
+        """Scrape every (city, query) pair and merge the results in grid order
+
+        With a sink, records are streamed to it instead of being kept in memory
+        and the number of records written is returned.
+        """
+        grid = [(city, query) for city in cities for query in queries]
+        return self.run_grid(grid, max_results=max_results, journal=journal, sink=sink)
+
+    def run_grid(self, grid, max_results=20, journal=None, sink=None):
+        """Like run(), for an explicit list of (city, query) units (e.g. one shard of the grid)
+
+        Units can also be (city, query, tile) map tiles (see tiling.tile_units).
+        """
+        grid = list(grid)
+        units = queue.Queue()
+        for index, unit in enumerate(grid):
+            units.put((index,) + tuple(unit))
+
+        results = {}
+        workers = min(self.workers, len(grid)) or 1
+        logging.info(f"Starting {workers} workers for {len(grid)} work units")
+        started = time.time()
+
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(worker_id, units, results, max_results, journal, sink),
+                name=f'scraper-worker-{worker_id}',
+                daemon=True
+            )
+            for worker_id in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for city, index in self.place_indexes.items():
+            logging.info(f"{city}: {index.overlap_summary()}")
+
+        if len(results) < len(grid):
+            logging.warning(f"{len(grid) - len(results)} work units were not processed")
+
+        if sink:
+            total = sum(results.values())
+            logging.info(f"Worker pool finished {len(grid)} units in {time.time() - started:.1f}s "
+                         f"({total} records)")
+            return total
+
+        merged = []
+        for index in range(len(grid)):
+            merged.extend(results.get(index, []))
+
+        logging.info(f"Worker pool finished {len(grid)} units in {time.time() - started:.1f}s "
+                     f"({len(merged)} records)")
+        return merged